@@ -0,0 +1,98 @@
+"""
+Bytes per variant for the transcoding stage against fixed-quality JPEG.
+
+Encodes every image of the corpus into the hackathon card and avatar
+variants, once as JPEG q85 (the previous pipeline) and once per supported
+output format with SSIM-targeted quality. Without `--corpus` a synthetic
+corpus of photo-like images is generated.
+
+    python benchmarks/image_formats.py [--corpus DIR] [--threshold 0.97]
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageOps
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.test")
+
+VARIANTS = {
+    "hackathon card 400x400": (400, 400),
+    "avatar 192x192": (192, 192),
+}
+
+
+def synthetic_corpus(count=12, size=(1600, 1600)):
+    rng = np.random.default_rng(0)
+    x, y = np.meshgrid(np.linspace(0, 1, size[0]), np.linspace(0, 1, size[1]))
+    for _ in range(count):
+        # плавні градієнти, кілька кіл і шум сенсора
+        channels = [
+            rng.uniform(40, 220)
+            + rng.uniform(-80, 80) * np.sin(x * rng.uniform(1, 6))
+            + rng.uniform(-80, 80) * np.cos(y * rng.uniform(1, 6))
+            for _ in range(3)
+        ]
+        pixels = np.dstack(channels)
+        for _ in range(6):
+            cx, cy, r = rng.uniform(0, 1), rng.uniform(0, 1), rng.uniform(0.05, 0.3)
+            mask = (x - cx) ** 2 + (y - cy) ** 2 < r**2
+            pixels[mask] = rng.uniform(0, 255, 3)
+        pixels += rng.normal(0, 6, pixels.shape)
+        yield Image.fromarray(pixels.clip(0, 255).astype(np.uint8))
+
+
+def load_corpus(directory):
+    for path in sorted(Path(directory).iterdir()):
+        try:
+            with Image.open(path) as image:
+                yield ImageOps.exif_transpose(image).convert("RGB")
+        except OSError:
+            continue
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--corpus", help="directory with source images")
+    parser.add_argument("--threshold", type=float, default=None)
+    args = parser.parse_args()
+
+    import django
+
+    django.setup()
+    from django.conf import settings
+
+    from leethack.core.images import (
+        OUTPUT_FORMATS,
+        encode,
+        encode_with_target,
+        get_output_formats,
+        render_variant,
+    )
+
+    threshold = args.threshold or settings.IMAGE_VARIANT_SSIM_THRESHOLD
+    jpeg = next(output for output in OUTPUT_FORMATS if output.name == "jpeg")
+    outputs = get_output_formats()
+    corpus = list(load_corpus(args.corpus) if args.corpus else synthetic_corpus())
+
+    print(f"{len(corpus)} images, SSIM threshold {threshold}")
+    print(f"{'variant':<26}{'format':<12}{'total KB':>10}{'vs jpeg q85':>14}")
+    for label, size in VARIANTS.items():
+        variants = [render_variant(image, size) for image in corpus]
+        baseline = sum(len(encode(variant, jpeg, 85)) for variant in variants)
+        print(f"{label:<26}{'jpeg q85':<12}{baseline / 1024:>10.1f}{'':>14}")
+        for output in outputs:
+            total = sum(
+                len(encode_with_target(variant, output, threshold))
+                for variant in variants
+            )
+            saving = (1 - total / baseline) * 100
+            print(f"{'':<26}{output.name:<12}{total / 1024:>10.1f}{saving:>13.1f}%")
+
+
+if __name__ == "__main__":
+    main()
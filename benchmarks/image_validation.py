@@ -0,0 +1,110 @@
+"""
+Per-upload CPU time and peak memory of the image validator chain.
+
+Compares the old chain, where every validator opened, verified, reopened
+and fully decoded the image, with the current one that reads a single
+cached header parse.
+Each variant runs in its own process so peak RSS is not shared between them.
+
+    python benchmarks/image_validation.py [--runs 20]
+"""
+
+import argparse
+import io
+import multiprocessing
+import os
+import resource
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.test")
+
+SIZES = {
+    "profile picture 512x512": (512, 512),
+    "profile background 1920x1080": (1920, 1080),
+    "profile background 3840x2160": (3840, 2160),
+}
+
+
+def make_jpeg(size):
+    import numpy as np
+    from PIL import Image
+
+    # шум, щоб JPEG мав реалістичний розмір і час декодування
+    pixels = np.random.default_rng(0).integers(0, 256, (*size[::-1], 3), np.uint8)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, "JPEG", quality=90)
+    return buffer.getvalue()
+
+
+def legacy_open_image(file):
+    from PIL import Image
+
+    # BaseImageValidator.open_image до кешованого розбору заголовка
+    image = Image.open(file)
+    image.verify()
+    file.seek(0)
+    image = Image.open(file)
+    image.load()
+    file.seek(0)
+    return image
+
+
+def legacy_chain(file):
+    # ImageFormatValidator, ImageRatioValidator, MinResolutionValidator
+    for _ in range(3):
+        legacy_open_image(file)
+
+
+def current_chain(file):
+    from leethack.core.validators import IMAGE_INFO_ATTR, inspect_image
+
+    # кожне завантаження - новий файл без кешу
+    file.__dict__.pop(IMAGE_INFO_ATTR, None)
+    for _ in range(3):
+        inspect_image(file)
+
+
+def run(variant, content, runs, queue):
+    import django
+    from django.core.files.uploadedfile import SimpleUploadedFile
+
+    django.setup()
+    chain = {"legacy": legacy_chain, "current": current_chain}[variant]
+    file = SimpleUploadedFile("bench.jpg", content, "image/jpeg")
+
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.process_time()
+    for _ in range(runs):
+        chain(file)
+    cpu_ms = (time.process_time() - start) / runs * 1000
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+    queue.put((cpu_ms, peak_kb))
+
+
+def measure(variant, content, runs):
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=run, args=(variant, content, runs, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'image':<32}{'variant':<10}{'cpu ms/upload':>15}{'peak rss MB':>14}")
+    for label, size in SIZES.items():
+        content = make_jpeg(size)
+        for variant in ("legacy", "current"):
+            cpu_ms, peak_kb = measure(variant, content, args.runs)
+            print(f"{label:<32}{variant:<10}{cpu_ms:>15.2f}{peak_kb / 1024:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+CPU time and allocations of a 200-row list page: DRF, compiled serializer
+and JSON rendered in the database.
+
+For every read list serializer the page is rendered by the regular
+serializer over model instances from the planned queryset, by its compiled
+form over `values_list()` tuples and, where supported, as JSON text built
+by Postgres. Time covers fetching the rows and producing the response body
+(`JSONRenderer` for the first two); memory is the tracemalloc peak of one
+pass. Needs the test database server
+from `.env`; a throwaway test database is created and dropped.
+
+    python benchmarks/list_serialization.py [--rows 200] [--repeat 10]
+"""
+
+import argparse
+import datetime
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.test")
+
+
+def seed(rows):
+    from django.utils import timezone
+
+    from leethack.hackathons.tests.factories import HackathonFactory
+    from leethack.participations.tests.factories import (
+        ParticipantFactory,
+        ParticipationRequestFactory,
+    )
+
+    past = timezone.now() - datetime.timedelta(days=30)
+    # завершені хакатони з переможцями - найширші рядки списку
+    hackathons = HackathonFactory.create_batch(
+        rows, start_datetime=past, end_datetime=past + datetime.timedelta(days=1)
+    )
+    hackathon = hackathons[0]
+    ParticipantFactory.create_batch(rows, hackathon=hackathon)
+    ParticipationRequestFactory.create_batch(rows, hackathon=hackathon)
+
+
+def drf_pass(serializer_class, queryset, context):
+    from rest_framework.renderers import JSONRenderer
+
+    # .all(): без клону queryset віддав би закешовані екземпляри
+    data = serializer_class(list(queryset.all()), many=True, context=context).data
+    return JSONRenderer().render(data)
+
+
+def compiled_pass(compiled, queryset, context):
+    from rest_framework.renderers import JSONRenderer
+
+    rows = list(compiled.get_rows(queryset))
+    return JSONRenderer().render(compiled.render_rows(rows, context))
+
+
+def sql_pass(compiled, queryset, context):
+    from leethack.core.api.sqljson import render_rows
+
+    expression = compiled.get_expression(context)
+    return render_rows(
+        queryset.annotate(row_json=expression).values_list("row_json", named=True)
+    )
+
+
+def measure(func, repeat):
+    func()  # прогрів: кеш URL, скомпільовані запити
+    timings = []
+    for _ in range(repeat):
+        start = time.process_time()
+        func()
+        timings.append(time.process_time() - start)
+
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(timings), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    import django
+
+    django.setup()
+    from django.conf import settings
+    from django.db import connection
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    from leethack.core.api.compiler import compile_serializer
+    from leethack.core.api.planner import plan_queryset
+    from leethack.core.api.sqljson import compile_sql_json
+    from leethack.hackathons.api.v1.serializers import HackathonListSerializer
+    from leethack.hackathons.models import Hackathon
+    from leethack.participations.api.v1.serializers import (
+        HackathonParticipantListSerializer,
+        HackathonParticipationRequestListSerializer,
+    )
+    from leethack.participations.models import Participant, ParticipationRequest
+
+    settings.ALLOWED_HOSTS = ["testserver"]
+    context = {"request": Request(APIRequestFactory().get("/"))}
+    cases = [
+        (HackathonListSerializer, Hackathon),
+        (HackathonParticipantListSerializer, Participant),
+        (HackathonParticipationRequestListSerializer, ParticipationRequest),
+    ]
+
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        seed(args.rows)
+        print(f"{args.rows} rows per page")
+        print(f"{'serializer':<56}{'CPU ms':>9}{'peak KiB':>10}")
+        for serializer_class, model in cases:
+            queryset = model.objects.order_by("id")[: args.rows]
+            planned = plan_queryset(model.objects.order_by("id"), serializer_class)
+            planned = planned[: args.rows]
+            compiled = compile_serializer(serializer_class, model)
+            sql_compiled = compile_sql_json(serializer_class, model)
+            passes = [
+                ("DRF", lambda: drf_pass(serializer_class, planned, context)),
+                ("compiled", lambda: compiled_pass(compiled, queryset, context)),
+            ]
+            if sql_compiled is not None:
+                passes.append(
+                    ("SQL JSON", lambda: sql_pass(sql_compiled, queryset, context))
+                )
+            for label, func in passes:
+                cpu, peak = measure(func, args.repeat)
+                name = f"{serializer_class.__name__}, {label}"
+                print(f"{name:<56}{cpu * 1000:>9.1f}{peak / 1024:>10.0f}")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Throughput of the API renderers on a 200-row hackathon list page.
+
+The page data is built once by `HackathonListSerializer` and then rendered
+by DRF's `JSONRenderer`, `ORJSONRenderer` and, when msgpack is installed,
+`MessagePackRenderer`. Reports pages and megabytes rendered per second of
+CPU time and the body size. Needs the test database server from `.env`; a
+throwaway test database is created and dropped.
+
+    python benchmarks/renderers.py [--rows 200] [--repeat 200]
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.test")
+
+from list_serialization import seed  # noqa: E402
+
+
+def measure(render, data, repeat):
+    content = render(data)  # прогрів
+    start = time.process_time()
+    for _ in range(repeat):
+        render(data)
+    elapsed = time.process_time() - start
+    return repeat / elapsed, len(content) * repeat / elapsed, len(content)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    import django
+
+    django.setup()
+    from django.conf import settings
+    from django.db import connection
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    from leethack.core.api.planner import plan_queryset
+    from leethack.core.api.renderers import (
+        MessagePackRenderer,
+        ORJSONRenderer,
+        msgpack,
+    )
+    from leethack.hackathons.api.v1.serializers import HackathonListSerializer
+    from leethack.hackathons.models import Hackathon
+
+    settings.ALLOWED_HOSTS = ["testserver"]
+    context = {"request": Request(APIRequestFactory().get("/"))}
+    renderers = [JSONRenderer(), ORJSONRenderer()]
+    if msgpack is not None:
+        renderers.append(MessagePackRenderer())
+
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        seed(args.rows)
+        queryset = plan_queryset(
+            Hackathon.objects.order_by("id"), HackathonListSerializer
+        )
+        results = HackathonListSerializer(
+            queryset[: args.rows], many=True, context=context
+        ).data
+        data = {"count": args.rows, "next": None, "previous": None, "results": results}
+
+        print(f"{args.rows} rows per page")
+        print(f"{'renderer':<24}{'pages/s':>10}{'MB/s':>8}{'KiB':>8}")
+        for renderer in renderers:
+            pages, size_rate, size = measure(renderer.render, data, args.repeat)
+            name = type(renderer).__name__
+            print(
+                f"{name:<24}{pages:>10.0f}{size_rate / 2**20:>8.1f}{size / 1024:>8.0f}"
+            )
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
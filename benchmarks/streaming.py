@@ -0,0 +1,93 @@
+"""
+Memory of the streamed NDJSON participant list as the list grows.
+
+The participant list of one hackathon is requested with
+`Accept: application/x-ndjson` for growing numbers of participants and the
+body is read chunk by chunk, the way a WSGI server writes it. Reports the
+body size, wall time and the tracemalloc peak of the request, which should
+stay flat; a regular 200-row JSON page is measured for comparison. Needs
+the test database server from `.env`; a throwaway test database is created
+and dropped.
+
+    python benchmarks/streaming.py [--rows 1000 4000 16000]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.test")
+
+
+def measure(view, request, hackathon_id):
+    tracemalloc.start()
+    start = time.perf_counter()
+    response = view(request, hackathon_id=hackathon_id)
+    if response.streaming:
+        size = sum(len(chunk) for chunk in response.streaming_content)
+    else:
+        size = len(response.render().content)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    response.close()
+    return size, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 4000, 16000])
+    args = parser.parse_args()
+
+    import django
+
+    django.setup()
+    from django.conf import settings
+    from django.db import connection
+    from rest_framework.test import APIRequestFactory, force_authenticate
+
+    from leethack.hackathons.tests.factories import HackathonFactory
+    from leethack.participations.api.v1.views.participant import (
+        HackathonParticipantListAPIView,
+    )
+    from leethack.participations.tests.factories import ParticipantFactory
+    from leethack.users.tests.factories import UserFactory
+
+    settings.ALLOWED_HOSTS = ["testserver"]
+    settings.SQL_JSON_RENDERING = True
+    view = HackathonParticipantListAPIView.as_view()
+    factory = APIRequestFactory()
+
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        admin = UserFactory(is_staff=True)
+        hackathon = HackathonFactory()
+        url = f"/api/v1/hackathons/{hackathon.pk}/participants/"
+
+        print(f"{'request':<18}{'rows':>8}{'MiB':>8}{'s':>8}{'peak KiB':>10}")
+        seeded = 0
+        for rows in sorted(args.rows):
+            ParticipantFactory.create_batch(rows - seeded, hackathon=hackathon)
+            seeded = rows
+            for name, request in (
+                ("JSON page", factory.get(url, {"page_size": 200})),
+                ("NDJSON stream", factory.get(url, HTTP_ACCEPT="application/x-ndjson")),
+            ):
+                force_authenticate(request, admin)
+                size, elapsed, peak = measure(view, request, hackathon.pk)
+                shown = min(rows, 200) if name == "JSON page" else rows
+                print(
+                    f"{name:<18}{shown:>8}{size / 2**20:>8.2f}"
+                    f"{elapsed:>8.2f}{peak / 1024:>10.0f}"
+                )
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
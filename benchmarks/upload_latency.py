@@ -0,0 +1,148 @@
+"""
+Latency of an unrelated endpoint while profile background uploads run.
+
+A probe thread keeps requesting hackathon detail while upload threads
+PATCH /api/v1/me/ with a 1920x1080 background, all in one process like the
+threads of a gunicorn worker. Image work runs either on the request and
+variant threads (IMAGE_POOL_WORKERS=0) or in the image process pool.
+Needs the test database server from `.env`; a throwaway test database is
+created and dropped.
+
+    python benchmarks/upload_latency.py [--duration 10] [--uploaders 4]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.test")
+
+
+def make_background():
+    # фото-подібний шум, щоб декодування та кодування були реалістичними
+    rng = np.random.default_rng(0)
+    pixels = rng.normal(128, 40, (1080, 1920, 3)).clip(0, 255).astype(np.uint8)
+    buffer = BytesIO()
+    Image.fromarray(pixels).save(buffer, "JPEG", quality=92)
+    return buffer.getvalue()
+
+
+def percentile(values, q):
+    return float(np.percentile(values, q)) * 1000 if values else float("nan")
+
+
+def run_scenario(users, duration, detail_url, background):
+    from django.core.files.uploadedfile import SimpleUploadedFile
+    from django.db import connection
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+
+    stop = threading.Event()
+    uploads = []
+
+    def upload(user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        while not stop.is_set():
+            file = SimpleUploadedFile("background.jpg", background, "image/jpeg")
+            response = client.patch(
+                reverse("api:v1:me_detail"),
+                {"profile_background": file},
+                format="multipart",
+            )
+            uploads.append(response.status_code)
+        connection.close()
+
+    # у кожного потоку свій користувач: request.user спільний для запитів
+    # одного клієнта, а серіалізатор змінює його поля
+    threads = [threading.Thread(target=upload, args=(user,)) for user in users]
+    for thread in threads:
+        thread.start()
+
+    client = APIClient()
+    latencies = []
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        start = time.perf_counter()
+        client.get(detail_url)
+        latencies.append(time.perf_counter() - start)
+
+    stop.set()
+    for thread in threads:
+        thread.join()
+    stop_variants()
+    return latencies, uploads
+
+
+def stop_variants():
+    from leethack.core import images
+
+    # генерація варіантів продовжується після запитів: чекаю поточні задачі,
+    # а чергові скасовую, щоб не впливали на наступний сценарій
+    if images._executor is not None:
+        images._executor.shutdown(wait=True, cancel_futures=True)
+        images._executor = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--uploaders", type=int, default=4)
+    parser.add_argument("--pool-workers", type=int, default=2)
+    args = parser.parse_args()
+
+    import django
+
+    django.setup()
+    from django.conf import settings
+    from django.db import connection
+    from django.urls import reverse
+
+    from leethack.hackathons.tests.factories import HackathonFactory
+    from leethack.users.tests.factories import UserFactory
+
+    settings.ALLOWED_HOSTS = ["testserver"]
+    settings.MEDIA_ROOT = tempfile.mkdtemp()
+    settings.IMAGE_PROCESSING_WORKERS = 2
+    settings.PROFILE_BACKGROUND_CONFIG["max_size_mb"] = 7
+
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        users = UserFactory.create_batch(args.uploaders)
+        hackathon = HackathonFactory()
+        detail_url = reverse("api:v1:hackathon_detail", kwargs={"pk": hackathon.pk})
+        background = make_background()
+
+        scenarios = [
+            ("no uploads", 0, 0),
+            ("uploads, inline", args.uploaders, 0),
+            ("uploads, process pool", args.uploaders, args.pool_workers),
+        ]
+        print(
+            f"{'scenario':<24}{'requests':>10}{'uploads':>9}{'p50 ms':>9}{'p99 ms':>9}"
+        )
+        for label, uploaders, pool_workers in scenarios:
+            settings.IMAGE_POOL_WORKERS = pool_workers
+            latencies, uploads = run_scenario(
+                users[:uploaders], args.duration, detail_url, background
+            )
+            print(
+                f"{label:<24}{len(latencies):>10}{len(uploads):>9}"
+                f"{percentile(latencies, 50):>9.1f}{percentile(latencies, 99):>9.1f}"
+            )
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Hackathon list serialization time with and without the signed-URL cache.
+
+Serializes an in-memory page of hackathons with HackathonListSerializer.
+Every row has its image, the host's and the winner's profile pictures and
+generated variants, about 20 URLs per row. Storage is S3 with fake
+credentials: URLs are signed locally and nothing is sent over the network.
+
+    python benchmarks/url_signing.py [--rows 200] [--hosts 20] [--repeat 5]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.test")
+
+STORAGE_OPTIONS = {
+    "access_key": "key",
+    "secret_key": "secret",
+    "bucket_name": "bucket",
+    "endpoint_url": "https://storage.example.com",
+    "location": "media",
+    "signature_version": "s3v4",
+}
+
+
+def image(prefix):
+    name = f"{prefix}/{uuid.uuid4().hex}.png"
+    stem = name.rsplit(".", 1)[0]
+    variants = {"source": name}
+    for variant in ("thumbnail", "card", "full"):
+        variants[variant] = {
+            "webp": f"{stem}_{variant}.webp",
+            "jpeg": f"{stem}_{variant}.jpg",
+        }
+    return name, variants
+
+
+def build_page(rows, hosts):
+    from django.utils import timezone
+
+    from leethack.hackathons.models import Category, Hackathon
+    from leethack.participations.models import Participant
+    from leethack.users.models import User
+
+    def user(i):
+        picture, variants = image("profile_pictures")
+        return User(
+            id=uuid.uuid4(),
+            username=f"user{i}",
+            email=f"user{i}@example.com",
+            profile_picture=picture,
+            profile_picture_variants=variants,
+        )
+
+    # у списку одні й ті самі хости повторюються
+    host_users = [user(i) for i in range(hosts)]
+    category = Category(id=uuid.uuid4(), title="AI", slug="ai")
+    now = timezone.now()
+
+    page = []
+    for i in range(rows):
+        picture, variants = image("hackathons")
+        page.append(
+            Hackathon(
+                id=uuid.uuid4(),
+                host=host_users[i % hosts],
+                title=f"Hackathon {i}",
+                category=category,
+                prize=1000,
+                start_datetime=now,
+                end_datetime=now,
+                winner=Participant(id=uuid.uuid4(), user=user(hosts + i)),
+                image=picture,
+                image_variants=variants,
+            )
+        )
+    return page
+
+
+def use_storage(storage):
+    from leethack.hackathons.models import Hackathon
+    from leethack.users.models import User
+
+    Hackathon._meta.get_field("image").storage = storage
+    User._meta.get_field("profile_picture").storage = storage
+
+
+def measure(page, repeat):
+    from leethack.hackathons.api.v1.serializers import HackathonListSerializer
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        HackathonListSerializer(page, many=True).data
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--hosts", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    import django
+
+    django.setup()
+    from storages.backends.s3 import S3Storage
+
+    from leethack.core.storage import CachedURLS3Storage
+
+    cached = CachedURLS3Storage(**STORAGE_OPTIONS)
+    scenarios = [
+        ("S3Storage, signing every URL", S3Storage(**STORAGE_OPTIONS)),
+        ("CachedURLS3Storage, cold", cached),
+        ("CachedURLS3Storage, warm", cached),
+        (
+            "public custom domain",
+            S3Storage(
+                **STORAGE_OPTIONS,
+                custom_domain="media.example.com",
+                querystring_auth=False,
+            ),
+        ),
+    ]
+
+    print(f"{args.rows} rows, {args.hosts} distinct hosts")
+    print(f"{'scenario':<32}{'median ms':>10}{'max ms':>9}")
+    pages = {}
+    for label, storage in scenarios:
+        use_storage(storage)
+        # FieldFile запам'ятовує сховище при першому доступі, тож кожне
+        # сховище отримує свою сторінку (тепла - ту саму, що й холодна)
+        if storage not in pages:
+            pages[storage] = build_page(args.rows, args.hosts)
+        page = pages[storage]
+        # холодний кеш вимірюється одним проходом
+        repeat = 1 if label.endswith("cold") else args.repeat
+        timings = measure(page, repeat)
+        print(
+            f"{label:<32}{statistics.median(timings) * 1000:>10.1f}"
+            f"{max(timings) * 1000:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+from importlib.util import find_spec
 from pathlib import Path
 
 import environ
@@ -31,6 +32,9 @@ DATABASES = {
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 
+CACHES = {"default": env.cache("CACHE_URL", default="locmemcache://")}
+
+
 DJANGO_APPS = [
     "django.contrib.admin",
     "django.contrib.auth",
@@ -38,6 +42,7 @@ DJANGO_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 ]
 
 THIRD_PARTY_APPS = [
@@ -52,6 +57,7 @@ LOCAL_APPS = [
     "leethack.users",
     "leethack.hackathons",
     "leethack.participations",
+    "leethack.uploads",
 ]
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
@@ -104,9 +110,27 @@ TEMPLATES = [
 STATIC_URL = "static/"
 
 
+# MessagePack для мобільних клієнтів, якщо встановлено msgpack
+API_MESSAGEPACK = env.bool("API_MESSAGEPACK", default=find_spec("msgpack") is not None)
+
+API_RENDERER_CLASSES = [
+    "leethack.core.api.renderers.ORJSONRenderer",
+    "rest_framework.renderers.BrowsableAPIRenderer",
+]
+API_PARSER_CLASSES = [
+    "leethack.core.api.parsers.ORJSONParser",
+    "rest_framework.parsers.FormParser",
+    "rest_framework.parsers.MultiPartParser",
+]
+if API_MESSAGEPACK:
+    API_RENDERER_CLASSES.append("leethack.core.api.renderers.MessagePackRenderer")
+    API_PARSER_CLASSES.append("leethack.core.api.parsers.MessagePackParser")
+
 REST_FRAMEWORK = {
     "EXCEPTION_HANDLER": "leethack.api.exceptions.custom_exception_handler",
-    "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_SCHEMA_CLASS": "leethack.core.api.schema.AutoSchema",
+    "DEFAULT_RENDERER_CLASSES": API_RENDERER_CLASSES,
+    "DEFAULT_PARSER_CLASSES": API_PARSER_CLASSES,
 }
 
 
@@ -119,6 +143,8 @@ PROFILE_PICTURE_CONFIG = {
     "min_width": 192,
     "min_height": 192,
     "max_size_mb": 2,
+    "max_pixels": 4096 * 4096,
+    "variants": {"thumbnail": (64, 64), "card": (192, 192), "full": (512, 512)},
 }
 
 PROFILE_BACKGROUND_CONFIG = {
@@ -127,6 +153,12 @@ PROFILE_BACKGROUND_CONFIG = {
     "min_width": 1920,
     "min_height": 1080,
     "max_size_mb": 7,
+    "max_pixels": 7680 * 4320,
+    "variants": {
+        "thumbnail": (320, 180),
+        "card": (960, 540),
+        "full": (1920, 1080),
+    },
 }
 
 HACKATHON_IMAGE_CONFIG = {
@@ -135,18 +167,61 @@ HACKATHON_IMAGE_CONFIG = {
     "min_width": 192,
     "min_height": 192,
     "max_size_mb": 2,
+    "max_pixels": 4096 * 4096,
+    "variants": {"thumbnail": (128, 128), "card": (400, 400), "full": (1024, 1024)},
 }
 
+# кількість потоків, які генерують варіанти зображень після коміту;
+# 0 - генерувати одразу в тому ж потоці
+IMAGE_PROCESSING_WORKERS = env.int("IMAGE_PROCESSING_WORKERS", default=2)
+# процеси для CPU-роботи з Pillow (leethack.core.imagepool); 0 - в тому ж потоці
+IMAGE_POOL_WORKERS = env.int("IMAGE_POOL_WORKERS", default=2)
+# скільки задач може одночасно виконуватись або чекати в черзі пулу
+IMAGE_POOL_MAX_PENDING = env.int("IMAGE_POOL_MAX_PENDING", default=8)
+# секунди, які запит чекає вільного місця в черзі до відповіді 503
+IMAGE_POOL_QUEUE_TIMEOUT = 5
+IMAGE_POOL_JOB_TIMEOUT = 60
+# потоки, які паралельно завантажують файли кількох полів одного запиту
+# (ConcurrentFileUploadMixin); 0 - по черзі в потоці запиту
+FILE_UPLOAD_WORKERS = env.int("FILE_UPLOAD_WORKERS", default=4)
+# потоки, які видаляють файли зі сховища після коміту; 0 - в тому ж потоці
+STORAGE_DELETE_WORKERS = env.int("STORAGE_DELETE_WORKERS", default=1)
+# імена медіафайлів за sha256 вмісту: однакові файли зберігаються один раз
+MEDIA_CONTENT_ADDRESSED = env.bool("MEDIA_CONTENT_ADDRESSED", default=True)
+# гарячі списки рендеряться в JSON одним SQL запитом (SQLJSONListMixin)
+SQL_JSON_RENDERING = env.bool("SQL_JSON_RENDERING", default=True)
+# рядки, які потік NDJSON читає з курсора сервера за раз
+API_STREAM_CHUNK_SIZE = env.int("API_STREAM_CHUNK_SIZE", default=500)
+# префікси, які переглядає collect_orphaned_media
+ORPHANED_MEDIA_PREFIXES = ("hackathons/", "profile_pictures/", "profile_backgrounds/")
+# секунди, протягом яких файл без посилань не видаляється: незавершені
+# прямі завантаження і варіанти, які ще генеруються
+ORPHANED_MEDIA_GRACE_PERIOD = 24 * 60 * 60
+# бекенд прямих завантажень у сховище (leethack.uploads)
+DIRECT_UPLOAD_BACKEND = "leethack.uploads.backends.S3DirectUploadBackend"
+# секунди, протягом яких діє presigned запит і можна завершити завантаження
+DIRECT_UPLOAD_EXPIRES = 15 * 60
+# скільки байтів початку файлу читається для перевірки заголовка
+DIRECT_UPLOAD_HEADER_BYTES = 64 * 1024
+# мінімальна SSIM варіанту відносно незжатого зображення при пошуку якості
+IMAGE_VARIANT_SSIM_THRESHOLD = 0.97
+
+# файли більші за це значення пишуться у тимчасовий файл, а не в пам'ять
+FILE_UPLOAD_MAX_MEMORY_SIZE = 1024 * 1024
+
 AWS_ACCOUNT_ID = env("AWS_ACCOUNT_ID")
 AWS_ACCESS_KEY_ID = env("AWS_ACCESS_KEY_ID")
 AWS_SECRET_ACCESS_KEY = env("AWS_SECRET_ACCESS_KEY")
 AWS_STORAGE_BUCKET_NAME = env("AWS_STORAGE_BUCKET_NAME")
 AWS_S3_ENDPOINT_URL = f"https://{AWS_ACCOUNT_ID}.r2.cloudflarestorage.com"
+# публічний домен бакета (R2 custom domain); з ним URL медіа не підписуються,
+# бо імена об'єктів - незмінні uuid
+AWS_S3_CUSTOM_DOMAIN = env("AWS_S3_CUSTOM_DOMAIN", default=None)
 
 
 STORAGES = {
     "default": {
-        "BACKEND": "storages.backends.s3.S3Storage",
+        "BACKEND": "leethack.core.storage.MediaS3Storage",
         "OPTIONS": {
             "access_key": AWS_ACCESS_KEY_ID,
             "secret_key": AWS_SECRET_ACCESS_KEY,
@@ -154,6 +229,8 @@ STORAGES = {
             "endpoint_url": AWS_S3_ENDPOINT_URL,
             "location": "media",
             "signature_version": "s3v4",
+            "custom_domain": AWS_S3_CUSTOM_DOMAIN,
+            "querystring_auth": AWS_S3_CUSTOM_DOMAIN is None,
         },
     },
     "staticfiles": {
@@ -18,8 +18,18 @@ EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
 
 STORAGES = {
     "default": {
-        "BACKEND": "django.core.files.storage.FileSystemStorage",
+        "BACKEND": "leethack.core.storage.ContentAddressedFileSystemStorage",
         "OPTIONS": {},
     },
     "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
 }
+
+IMAGE_PROCESSING_WORKERS = 0
+IMAGE_POOL_WORKERS = 0
+STORAGE_DELETE_WORKERS = 0
+# тести режиму вмикають його самі
+MEDIA_CONTENT_ADDRESSED = False
+# як у продакшні: списки API проходять шляхом SQL, а відповідність
+# серіалізатору DRF перевіряє test_sqljson
+SQL_JSON_RENDERING = True
+DIRECT_UPLOAD_BACKEND = "leethack.uploads.backends.LocalDirectUploadBackend"
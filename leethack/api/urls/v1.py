@@ -11,6 +11,12 @@ from leethack.participations.api.v1.views import (
     HackathonParticipantListAPIView,
     HackathonParticipantDetailAPIView,
 )
+from leethack.uploads.api.v1.views import (
+    LocalUploadAPIView,
+    UploadSessionCompleteAPIView,
+    UploadSessionCreateAPIView,
+)
+from leethack.uploads.backends import uses_local_upload_backend
 from leethack.users.api.v1.views import (
     MyParticipationRequestListAPIView,
     MyParticipationRequestDetailAPIView,
@@ -22,7 +28,6 @@ from leethack.users.api.v1.views import (
     MyParticipationDetailAPIView,
 )
 
-
 hackathon_urlpatterns = [
     path("", HackathonListCreateAPIView.as_view(), name="hackathon_list"),
     path(
@@ -98,10 +103,25 @@ user_urlpatterns = [
     ),
 ]
 
+upload_urlpatterns = [
+    path("", UploadSessionCreateAPIView.as_view(), name="upload_session_create"),
+    path(
+        "complete/",
+        UploadSessionCompleteAPIView.as_view(),
+        name="upload_session_complete",
+    ),
+]
+# з S3 файл приймає бакет; локальний PUT потрібен лише без нього
+if uses_local_upload_backend():
+    upload_urlpatterns.append(
+        path("local/<str:token>/", LocalUploadAPIView.as_view(), name="local_upload")
+    )
+
 app_name = "v1"
 urlpatterns = [
     path("hackathons/", include(hackathon_urlpatterns)),
     path("categories/", include(category_patterns)),
     path("me/", include(me_urlpatterns)),
     path("users/", include(user_urlpatterns)),
+    path("uploads/", include(upload_urlpatterns)),
 ]
@@ -0,0 +1,66 @@
+import hashlib
+import time
+
+from django.core.cache import cache
+from rest_framework.response import Response
+
+from leethack.core.cache import get_listing_version
+
+
+class AnonymousListCacheMixin:
+    """
+    Caches list responses for anonymous users.
+
+    Entries are keyed by normalized query params and tagged with the global
+    listing version, which model signals bump on every relevant write. An
+    outdated or expired entry is still served for `list_cache_stale_timeout`
+    seconds while a single request (holding a short lock) recomputes it.
+    """
+
+    list_cache_timeout = 60
+    list_cache_stale_timeout = 300
+    list_cache_lock_timeout = 30
+
+    def get_list_cache_key(self, request):
+        params = sorted(
+            (key, tuple(sorted(v for v in values if v)))
+            for key, values in request.query_params.lists()
+        )
+        params = [(key, values) for key, values in params if values]
+        # абсолютні посилання (next, image) залежать від хоста
+        raw = repr((request.scheme, request.get_host(), params))
+        digest = hashlib.sha256(raw.encode()).hexdigest()
+        return f"listing:{self.__class__.__name__}:{digest}"
+
+    def list(self, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return super().list(request, *args, **kwargs)
+
+        key = self.get_list_cache_key(request)
+        lock_key = f"{key}:lock"
+        version = get_listing_version()
+        entry = cache.get(key)
+        now = time.time()
+
+        if entry is not None:
+            age = now - entry["created_at"]
+            if entry["version"] == version and age < self.list_cache_timeout:
+                return Response(entry["data"], headers={"X-Cache": "HIT"})
+
+            # хтось уже оновлює запис - віддаю застарілий
+            if not cache.add(lock_key, 1, timeout=self.list_cache_lock_timeout):
+                return Response(entry["data"], headers={"X-Cache": "STALE"})
+        else:
+            cache.add(lock_key, 1, timeout=self.list_cache_lock_timeout)
+
+        try:
+            response = super().list(request, *args, **kwargs)
+            if response.status_code == 200:
+                entry = {"version": version, "created_at": now, "data": response.data}
+                timeout = self.list_cache_timeout + self.list_cache_stale_timeout
+                cache.set(key, entry, timeout=timeout)
+        finally:
+            cache.delete(lock_key)
+
+        response["X-Cache"] = "MISS"
+        return response
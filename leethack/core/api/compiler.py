@@ -0,0 +1,289 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from types import SimpleNamespace
+
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from leethack.core.api.planner import DISPLAY_RE, get_model_field
+
+
+class NotCompilable(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class Converter:
+    """How one compiled field turns its column values into output."""
+
+    # шлях імен полів від кореневого серіалізатора до поля
+    path: tuple
+    # зв'язане поле -> функція від значень колонок
+    factory: object
+
+
+def is_identity(field):
+    # CharField і IntegerField повертають str(value) / int(value), а колонки
+    # вже мають такий тип
+    to_representation = type(field).to_representation
+    return to_representation in (
+        serializers.CharField.to_representation,
+        serializers.IntegerField.to_representation,
+    )
+
+
+def is_pk_only(field, model_field):
+    # pk-only поле forward FK читає лише колонку FK
+    return (
+        type(field) is serializers.PrimaryKeyRelatedField
+        and field.pk_field is None
+        and (model_field.many_to_one or model_field.one_to_one)
+        and model_field.concrete
+    )
+
+
+def make_file(model_field, name):
+    # FieldFile без екземпляра: url і storage беруться з поля моделі
+    return model_field.attr_class(None, model_field, name)
+
+
+class SerializerCompiler:
+    """
+    Turns a read serializer class into Python source of a row-to-dict function.
+
+    Every concrete field of the serializer tree becomes a column of a
+    `values_list()` query and every output key an expression over the row
+    tuple, so a page is rendered without model instances and without DRF's
+    per-field `get_attribute` / `to_representation` dispatch. Fields that
+    can't be expressed this way raise `NotCompilable`.
+    """
+
+    def __init__(self, serializer_class, model):
+        self.serializer_class = serializer_class
+        self.model = model
+        self.columns = []
+        self.converters = []
+
+    def compile(self):
+        body = self.compile_serializer(self.serializer_class(), self.model, (), "")
+        source = f"def render(row, c):\n    return {body}\n"
+        namespace = {}
+        exec(
+            compile(source, f"<compiled {self.serializer_class.__name__}>", "exec"),
+            namespace,
+        )
+        return CompiledSerializer(
+            self.serializer_class,
+            tuple(self.columns),
+            tuple(self.converters),
+            namespace["render"],
+            source,
+        )
+
+    def add_column(self, column):
+        if column not in self.columns:
+            self.columns.append(column)
+        return f"row[{self.columns.index(column)}]"
+
+    def add_converter(self, path, factory):
+        self.converters.append(Converter(path, factory))
+        return f"c[{len(self.converters) - 1}]"
+
+    def compile_serializer(self, serializer, model, path, prefix):
+        if isinstance(serializer, serializers.ListSerializer):
+            raise NotCompilable("many=True serializers are not compiled")
+        if (
+            type(serializer).to_representation
+            is not serializers.Serializer.to_representation
+        ):
+            raise NotCompilable(
+                f"{type(serializer).__name__} overrides to_representation"
+            )
+
+        items = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            expression = self.compile_field(field, model, path + (name,), prefix)
+            items.append(f"{name!r}: {expression}")
+        return "{" + ", ".join(items) + "}"
+
+    def compile_field(self, field, model, path, prefix):
+        model_fields = getattr(field, "model_fields", None)
+        if model_fields is not None:
+            return self.compile_row_field(field, model, path, prefix, model_fields)
+
+        if field.source == "*" or len(field.source_attrs) != 1:
+            raise NotCompilable(f"Unsupported source of {'.'.join(path)}")
+
+        attr = field.source_attrs[0]
+        model_field = get_model_field(model, attr)
+        if model_field is None:
+            raise NotCompilable(f"{model.__name__}.{attr} is not a model field")
+
+        column = prefix + model_field.name
+        if model_field.primary_key and prefix:
+            # pk пов'язаного об'єкта - це значення FK, колонка вже є
+            column = prefix.removesuffix("__")
+        if isinstance(field, serializers.BaseSerializer):
+            if (
+                not (model_field.many_to_one or model_field.one_to_one)
+                or not model_field.concrete
+            ):
+                raise NotCompilable(f"{column} is not a forward relation")
+            # null FK - це null вкладений об'єкт, як у DRF
+            value = self.add_column(column)
+            body = self.compile_serializer(
+                field, model_field.related_model, path, f"{column}__"
+            )
+            return f"None if {value} is None else {body}"
+
+        if model_field.is_relation:
+            if not is_pk_only(field, model_field):
+                raise NotCompilable(f"{column} is a relation")
+            # PrimaryKeyRelatedField віддає значення FK як є
+            return self.add_column(column)
+
+        value = self.add_column(column)
+        if DISPLAY_RE.fullmatch(attr):
+            choices = dict(model_field.flatchoices)
+            converter = self.add_converter(
+                path,
+                lambda bound: lambda value: bound.to_representation(
+                    str(choices.get(value, value))
+                ),
+            )
+            return f"None if {value} is None else {converter}({value})"
+        if attr != model_field.name:
+            raise NotCompilable(f"Unsupported source of {'.'.join(path)}")
+
+        if hasattr(model_field, "attr_class"):
+            converter = self.add_converter(
+                path,
+                lambda bound: lambda value: bound.to_representation(
+                    make_file(model_field, value)
+                ),
+            )
+        elif is_identity(field):
+            return value
+        else:
+            converter = self.add_converter(path, lambda bound: bound.to_representation)
+        return f"None if {value} is None else {converter}({value})"
+
+    def compile_row_field(self, field, model, path, prefix, model_fields):
+        # поле з source="*" отримує об'єкт лише з тими атрибутами, які читає
+        names = []
+        values = []
+        for name in model_fields:
+            model_field = model._meta.get_field(name)
+            names.append((name, model_field))
+            values.append(self.add_column(prefix + name))
+
+        def factory(bound):
+            def convert(*values):
+                attrs = {
+                    name: (
+                        make_file(model_field, value)
+                        if hasattr(model_field, "attr_class")
+                        else value
+                    )
+                    for (name, model_field), value in zip(names, values)
+                }
+                return bound.to_representation(SimpleNamespace(**attrs))
+
+            return convert
+
+        converter = self.add_converter(path, factory)
+        return f"{converter}({', '.join(values)})"
+
+
+@dataclass(frozen=True)
+class CompiledSerializer:
+    serializer_class: type
+    columns: tuple
+    converters: tuple
+    render: object
+    source: str
+
+    def get_rows(self, queryset, extra=()):
+        """`values_list()` of `queryset` with the compiled columns, then `extra`."""
+        columns = self.columns + tuple(c for c in extra if c not in self.columns)
+        return queryset.prefetch_related(None).values_list(*columns, named=True)
+
+    def bind(self, context):
+        # поля з контекстом (request для абсолютних URL) беруться з одного
+        # екземпляра серіалізатора на сторінку
+        serializer = self.serializer_class(context=context)
+        converters = []
+        for converter in self.converters:
+            field = serializer
+            for name in converter.path:
+                field = field.fields[name]
+            converters.append(converter.factory(field))
+        return converters
+
+    def render_rows(self, rows, context):
+        converters = self.bind(context)
+        render = self.render
+        return [render(row, converters) for row in rows]
+
+
+def get_cursor_columns(queryset):
+    """Columns the keyset cursor reads from a row, besides the rendered ones."""
+    # значення сортування останнього рядка, включно з анотаціями
+    # (релевантність пошуку), і pk як тай-брейкер
+    ordering = [
+        order.lstrip("-") for order in queryset.query.order_by if isinstance(order, str)
+    ]
+    ordering.append(queryset.model._meta.pk.name)
+    return ordering
+
+
+@lru_cache(maxsize=1024)
+def compile_serializer(serializer_class, model):
+    """
+    Compiled form of `serializer_class` for rows of `model`, or None if some
+    field can't be compiled and the serializer has to run as usual.
+    """
+    try:
+        return SerializerCompiler(serializer_class, model).compile()
+    except NotCompilable:
+        return None
+
+
+class CompiledListMixin:
+    """
+    Renders list pages with the compiled form of the read serializer.
+
+    The page is fetched as `values_list()` tuples with only the columns the
+    serializer reads. Serializers the compiler doesn't support are
+    rendered by the regular serializer, as in `ListModelMixin.list`. Expects `PlannedQuerySetMixin` for
+    `get_read_serializer_class`.
+    """
+
+    def get_compiled_serializer(self, queryset):
+        if self.request.method != "GET":
+            return None
+        return compile_serializer(self.get_read_serializer_class(), queryset.model)
+
+    def list(self, request, *args, **kwargs):
+        return self.list_queryset(self.filter_queryset(self.get_queryset()))
+
+    def list_queryset(self, queryset):
+        """List response for the already filtered `queryset`."""
+        compiled = self.get_compiled_serializer(queryset)
+        if compiled is None:
+            # як ListModelMixin.list, але без повторного filter_queryset
+            page = self.paginate_queryset(queryset)
+            if page is not None:
+                serializer = self.get_serializer(page, many=True)
+                return self.get_paginated_response(serializer.data)
+            return Response(self.get_serializer(queryset, many=True).data)
+
+        rows = compiled.get_rows(queryset, extra=get_cursor_columns(queryset))
+
+        context = self.get_serializer_context()
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(compiled.render_rows(page, context))
+        return Response(compiled.render_rows(rows, context))
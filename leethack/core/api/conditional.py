@@ -0,0 +1,159 @@
+import hashlib
+
+from django.db import transaction
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+
+# поля, які не потрапляють у жодне представлення
+UNVERSIONED_FIELDS = {"password", "last_login"}
+
+
+class PreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = _("Resource has been modified since it was fetched.")
+    default_code = "precondition_failed"
+
+
+def get_object_version(obj):
+    updated_at = getattr(obj, "updated_at", None)
+    if updated_at is not None:
+        return updated_at.isoformat()
+
+    # моделі без updated_at (User) версіонуються за значеннями полів
+    values = [
+        field.value_to_string(obj)
+        for field in obj._meta.concrete_fields
+        if field.name not in UNVERSIONED_FIELDS
+    ]
+    return hashlib.sha256(repr(values).encode()).hexdigest()
+
+
+class ConditionalRequestMixin:
+    """
+    ETag / Last-Modified support for detail views.
+
+    The ETag is derived from the version of the object and of every related
+    object listed in `etag_related`, so a change to e.g. a hackathon's host
+    changes the hackathon's ETag too. GET answers `If-None-Match` and
+    `If-Modified-Since` with 304 before serialization. PATCH/PUT require a
+    matching `If-Match` when the header is sent and fail with 412 otherwise;
+    the row is locked from the check until the update commits.
+
+    Objects are versioned by all their columns, so a planned queryset
+    loads them whole (`plan_only = False`) together with `etag_related`.
+    """
+
+    etag_related = ()
+    plan_only = False
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.etag_related:
+            queryset = queryset.select_related(*self.etag_related)
+        return queryset
+
+    def get_etag_objects(self, instance):
+        objects = [instance]
+        for path in self.etag_related:
+            obj = instance
+            for attr in path.split("__"):
+                obj = getattr(obj, attr, None)
+                if obj is None:
+                    break
+            objects.append(obj)
+        return objects
+
+    def get_etag(self, instance):
+        parts = [
+            (
+                "-"
+                if obj is None
+                else f"{obj._meta.label_lower}:{obj.pk}:{get_object_version(obj)}"
+            )
+            for obj in self.get_etag_objects(instance)
+        ]
+        digest = hashlib.sha256("|".join(parts).encode()).hexdigest()
+        return quote_etag(digest[:32])
+
+    def get_last_modified(self, instance):
+        timestamps = []
+        for obj in self.get_etag_objects(instance):
+            if obj is None:
+                continue
+            updated_at = getattr(obj, "updated_at", None)
+            # без updated_at у когось з об'єктів дата змін невідома
+            if updated_at is None:
+                return None
+            timestamps.append(updated_at)
+        return max(timestamps)
+
+    def set_conditional_headers(self, response, instance):
+        response["ETag"] = self.get_etag(instance)
+        last_modified = self.get_last_modified(instance)
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified.timestamp())
+        return response
+
+    def is_not_modified(self, request, instance):
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match:
+            etags = parse_etags(if_none_match)
+            # слабке порівняння, W/ префікс ігнорується
+            etags = [etag.removeprefix("W/") for etag in etags]
+            return "*" in etags or self.get_etag(instance) in etags
+
+        if_modified_since = parse_http_date_safe(
+            request.headers.get("If-Modified-Since", "")
+        )
+        last_modified = self.get_last_modified(instance)
+        if if_modified_since is None or last_modified is None:
+            return False
+        return int(last_modified.timestamp()) <= if_modified_since
+
+    def check_if_match(self, request, instance):
+        if_match = request.headers.get("If-Match")
+        if not if_match:
+            return
+        etags = parse_etags(if_match)
+        if "*" not in etags and self.get_etag(instance) not in etags:
+            raise PreconditionFailed()
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        if self.is_not_modified(request, instance):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            return self.set_conditional_headers(response, instance)
+
+        serializer = self.get_serializer(instance)
+        response = Response(serializer.data)
+        return self.set_conditional_headers(response, instance)
+
+    def update(self, request, *args, **kwargs):
+        if not request.headers.get("If-Match"):
+            return self.perform_conditional_update(request, *args, **kwargs)
+        # перевірка ETag і запис під блокуванням рядка, інакше два PATCH з
+        # тим самим ETag обидва пройдуть перевірку і другий затре перший
+        with transaction.atomic():
+            instance = self.get_object()
+            type(instance)._default_manager.select_for_update().filter(
+                pk=instance.pk
+            ).values_list("pk").get()
+            return self.perform_conditional_update(request, *args, **kwargs)
+
+    def perform_conditional_update(self, request, *args, **kwargs):
+        partial = kwargs.pop("partial", False)
+        instance = self.get_object()
+        self.check_if_match(request, instance)
+
+        serializer = self.get_serializer(instance, data=request.data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+        self.perform_update(serializer)
+
+        if getattr(instance, "_prefetched_objects_cache", None):
+            instance._prefetched_objects_cache = {}
+
+        response = Response(serializer.data)
+        return self.set_conditional_headers(response, serializer.instance)
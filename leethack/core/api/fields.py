@@ -0,0 +1,151 @@
+import os
+
+from PIL import Image
+from drf_spectacular.utils import extend_schema_field
+from rest_framework import serializers
+
+from leethack.core.images import (
+    OUTPUT_FORMATS,
+    VARIANT_NAMES,
+    get_metadata_field_name,
+    get_variants_field_name,
+)
+from leethack.core.validators import inspect_image
+
+# jsonb не зберігає порядок ключів, тому порядок форматів задаю явно
+FORMAT_ORDER = {output.name: i for i, output in enumerate(OUTPUT_FORMATS)}
+
+FORMAT_URLS_SCHEMA = {
+    "type": "object",
+    "description": (
+        "URLs of the variant keyed by format (avif, webp, jpeg). Until variants "
+        "are generated, the only key is the format of the original upload."
+    ),
+    "additionalProperties": {"type": "string", "format": "uri"},
+}
+
+
+@extend_schema_field(
+    {
+        "type": "object",
+        "nullable": True,
+        "properties": {name: FORMAT_URLS_SCHEMA for name in VARIANT_NAMES},
+    }
+)
+class ImageVariantsField(serializers.Field):
+    """
+    URLs of resized variants of an image field, keyed by format.
+
+    Formats are listed from the most to the least efficient, so clients can
+    pick the first one they support; generated variants always include JPEG.
+    Until variants of the current image are generated, every variant points
+    to the original upload, keyed by the original's own format (e.g. `png`),
+    so JPEG may be missing.
+    """
+
+    def __init__(self, image_field, **kwargs):
+        self.image_field = image_field
+        # колонки, які читає поле, для планувальника queryset
+        self.model_fields = (image_field, get_variants_field_name(image_field))
+        kwargs["source"] = "*"
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, instance):
+        fieldfile = getattr(instance, self.image_field)
+        if not fieldfile:
+            return None
+
+        variants = getattr(instance, get_variants_field_name(self.image_field))
+        if not variants or variants.get("source") != fieldfile.name:
+            original = {self.get_format(fieldfile.name): self.build_url(fieldfile.url)}
+            return {name: original for name in VARIANT_NAMES}
+
+        storage = fieldfile.storage
+        urls = {}
+        for name in VARIANT_NAMES:
+            formats = sorted(
+                variants.get(name, {}).items(),
+                key=lambda item: FORMAT_ORDER.get(item[0], len(FORMAT_ORDER)),
+            )
+            urls[name] = {
+                output: self.build_url(storage.url(path)) for output, path in formats
+            }
+        return urls
+
+    @staticmethod
+    def get_format(name):
+        extension = os.path.splitext(name)[1].lstrip(".").lower()
+        return "jpeg" if extension == "jpg" else extension
+
+    def build_url(self, url):
+        request = self.context.get("request")
+        if request is None:
+            return url
+        return request.build_absolute_uri(url)
+
+
+@extend_schema_field(
+    {
+        "type": "object",
+        "nullable": True,
+        "properties": {
+            "width": {"type": "integer"},
+            "height": {"type": "integer"},
+            "size": {"type": "integer", "description": "File size in bytes."},
+            "format": {"type": "string", "example": "jpeg"},
+            "color": {
+                "type": "string",
+                "description": "Dominant colour.",
+                "example": "#1f2a44",
+            },
+            "placeholder": {
+                "type": "string",
+                "description": "BlurHash of the image.",
+                "example": "LEHV6nWB2yk8pyo0adR*.7kCMdnj",
+            },
+        },
+    }
+)
+class ImageMetadataField(serializers.Field):
+    """
+    Dimensions, size, format, dominant colour and BlurHash placeholder of an
+    image field, read from the row without touching storage.
+
+    Null until the metadata of the current image is computed.
+    """
+
+    def __init__(self, image_field, **kwargs):
+        self.image_field = image_field
+        self.model_fields = (image_field, get_metadata_field_name(image_field))
+        kwargs["source"] = "*"
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, instance):
+        fieldfile = getattr(instance, self.image_field)
+        metadata = getattr(instance, get_metadata_field_name(self.image_field))
+        if not fieldfile or not metadata or metadata.get("source") != fieldfile.name:
+            return None
+        return {key: value for key, value in metadata.items() if key != "source"}
+
+
+class ImageUploadField(serializers.ImageField):
+    """
+    ImageField that checks the upload in the image process pool.
+
+    DRF's ImageField opens and verifies the image on the request thread via
+    Django's form field. This one runs the same check through `inspect_image`,
+    whose cached result is then reused by the image validators.
+    """
+
+    def to_internal_value(self, data):
+        file = serializers.FileField.to_internal_value(self, data)
+        try:
+            info = inspect_image(file)
+        except serializers.ValidationError:
+            self.fail("invalid_image")
+
+        if info.format:
+            file.content_type = Image.MIME.get(info.format)
+        return file
@@ -0,0 +1,58 @@
+from functools import reduce
+from operator import or_
+
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db.models import Q
+from django.db.models.functions import Greatest, Upper
+from rest_framework import filters
+
+
+class TrigramSearchFilter(filters.SearchFilter):
+    """
+    Drop-in replacement for SearchFilter backed by pg_trgm.
+
+    Each term matches a field by substring or by trigram word similarity,
+    so small typos still find the row. Both conditions are written against
+    UPPER(field), which is what the GIN gin_trgm_ops indexes are built on.
+    Results are ordered by similarity unless client requests explicit ordering.
+    """
+
+    similarity_annotation = "search_similarity"
+
+    def get_field_names(self, view, request):
+        # префікси SearchFilter (^, =, @, $) не мають сенсу для триграм
+        return [field.lstrip("^=@$") for field in self.get_search_fields(view, request)]
+
+    def filter_queryset(self, request, queryset, view):
+        search_fields = self.get_search_fields(view, request)
+        search_terms = self.get_search_terms(request)
+        if not search_fields or not search_terms:
+            return queryset
+
+        aliases = {
+            name: f"_trgm_{name.replace('__', '_')}"
+            for name in self.get_field_names(view, request)
+        }
+        queryset = queryset.alias(
+            **{alias: Upper(name) for name, alias in aliases.items()}
+        )
+        similarities = []
+
+        for term in search_terms:
+            conditions = []
+            for name, alias in aliases.items():
+                conditions.append(Q(**{f"{name}__icontains": term}))
+                conditions.append(Q(**{f"{alias}__trigram_word_similar": term}))
+                similarities.append(TrigramWordSimilarity(term, Upper(name)))
+            queryset = queryset.filter(reduce(or_, conditions))
+
+        similarity = (
+            Greatest(*similarities) if len(similarities) > 1 else similarities[0]
+        )
+        queryset = queryset.annotate(**{self.similarity_annotation: similarity})
+
+        if filters.OrderingFilter.ordering_param not in request.query_params:
+            queryset = queryset.order_by(
+                f"-{self.similarity_annotation}", *queryset.query.order_by
+            )
+        return queryset
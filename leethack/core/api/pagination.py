@@ -0,0 +1,247 @@
+import base64
+import binascii
+import datetime
+import decimal
+import json
+import uuid
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def _encode_value(value):
+    # DjangoJSONEncoder обрізає мікросекунди, а для keyset потрібне точне значення
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, (uuid.UUID, decimal.Decimal)):
+        return str(value)
+    return value
+
+
+class KeysetPageNumberPagination(PageNumberPagination):
+    """
+    Page number pagination with opt-in keyset (cursor) mode.
+
+    Clients opt in with `?pagination=cursor` and then follow `next`/`previous`
+    links carrying an opaque `cursor` parameter. Keyset pages filter by the
+    position of the last seen row instead of using OFFSET and skip COUNT(*),
+    so every page costs the same regardless of depth. The primary key is
+    appended to the ordering as a tie-breaker to keep the ordering total.
+    """
+
+    page_size = 30
+    page_size_query_param = "page_size"
+    max_page_size = 200
+
+    mode_query_param = "pagination"
+    mode_query_description = _("Set to `cursor` to use keyset pagination.")
+    cursor_query_param = "cursor"
+    cursor_query_description = _("Opaque cursor returned in `next`/`previous`.")
+    keyset_mode = "cursor"
+    tie_breaker = "id"
+
+    invalid_cursor_message = _("Invalid cursor.")
+
+    keyset = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = self.use_keyset(request)
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        self.model = queryset.model
+        self.annotations = queryset.query.annotations
+        self.ordering = self.get_ordering(queryset)
+        position, self.reverse = self.decode_cursor(request)
+
+        ordering = self.ordering
+        if self.reverse:
+            ordering = [self.invert(order) for order in ordering]
+
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self.build_position_filter(ordering, position))
+
+        rows = list(queryset[: page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+
+        if self.reverse:
+            rows.reverse()
+            self.has_previous = has_more
+            self.has_next = position is not None
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        self.page_rows = rows
+        return rows
+
+    def use_keyset(self, request):
+        params = request.query_params
+        return (
+            params.get(self.mode_query_param) == self.keyset_mode
+            or self.cursor_query_param in params
+        )
+
+    def get_ordering(self, queryset):
+        ordering = list(queryset.query.order_by) or list(queryset.model._meta.ordering)
+        for order in ordering:
+            if not isinstance(order, str):
+                raise TypeError(
+                    "Keyset pagination supports only field name orderings, "
+                    f"got {order!r}."
+                )
+
+        ordering = [o for o in ordering if o.lstrip("-") not in ("pk", "id")]
+        # тай-брейкер має той самий напрям, що й останнє поле сортування,
+        # інакше (field, id) не зможе використати один індекс
+        descending = bool(ordering) and ordering[-1].startswith("-")
+        ordering.append(f"-{self.tie_breaker}" if descending else self.tie_breaker)
+        return ordering
+
+    @staticmethod
+    def invert(order):
+        return order[1:] if order.startswith("-") else f"-{order}"
+
+    def build_position_filter(self, ordering, position):
+        # (a, b) > (x, y) розгортається в a >= x AND (a > x OR (a = x AND b > y));
+        # перша умова дає планувальнику діапазон по індексу
+        first = ordering[0]
+        bound = "lte" if first.startswith("-") else "gte"
+        condition = Q(**{f"{first.lstrip('-')}__{bound}": position[0]})
+
+        after = Q()
+        for i, order in enumerate(ordering):
+            lookup = "lt" if order.startswith("-") else "gt"
+            q = Q(**{f"{order.lstrip('-')}__{lookup}": position[i]})
+            for prev_order, prev_value in zip(ordering[:i], position[:i]):
+                q &= Q(**{prev_order.lstrip("-"): prev_value})
+            after |= q
+
+        return condition & after
+
+    def get_position(self, row):
+        return [getattr(row, order.lstrip("-")) for order in self.ordering]
+
+    def encode_cursor(self, position, reverse):
+        payload = {
+            "o": self.ordering,
+            "p": [_encode_value(value) for value in position],
+            "r": reverse,
+        }
+        data = json.dumps(payload, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+
+        try:
+            padding = "=" * (-len(encoded) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(encoded + padding))
+            ordering, position, reverse = payload["o"], payload["p"], payload["r"]
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+        # курсор видано для іншого сортування
+        if (
+            ordering != self.ordering
+            or not isinstance(position, list)
+            or len(position) != len(ordering)
+        ):
+            raise NotFound(self.invalid_cursor_message)
+
+        try:
+            position = [
+                self.to_python(order.lstrip("-"), value)
+                for order, value in zip(ordering, position)
+            ]
+        except (ValidationError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        # з NULL порівняння позиції не має сенсу
+        if None in position:
+            raise NotFound(self.invalid_cursor_message)
+
+        return position, bool(reverse)
+
+    def to_python(self, name, value):
+        try:
+            field = self.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            # анотації (наприклад, релевантність пошуку) перевіряються за
+            # типом їх виразу
+            annotation = self.annotations.get(name)
+            if annotation is None:
+                return value
+            field = annotation.output_field
+        return field.to_python(value)
+
+    def get_cursor_link(self, row, reverse):
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.page_query_param)
+        url = remove_query_param(url, self.mode_query_param)
+        cursor = self.encode_cursor(self.get_position(row), reverse)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if not self.has_next or not self.page_rows:
+            return None
+        return self.get_cursor_link(self.page_rows[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.keyset:
+            return super().get_previous_link()
+        if not self.has_previous or not self.page_rows:
+            return None
+        return self.get_cursor_link(self.page_rows[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        schema = super().get_paginated_response_schema(schema)
+        # у keyset режимі count не повертається
+        schema["required"] = ["results"]
+        return schema
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        parameters += [
+            {
+                "name": self.mode_query_param,
+                "required": False,
+                "in": "query",
+                "description": str(self.mode_query_description),
+                "schema": {"type": "string", "enum": [self.keyset_mode]},
+            },
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": str(self.cursor_query_description),
+                "schema": {"type": "string"},
+            },
+        ]
+        return parameters
@@ -0,0 +1,45 @@
+import codecs
+
+import orjson
+from django.conf import settings
+from rest_framework import parsers
+from rest_framework.exceptions import ParseError
+
+from leethack.core.api.renderers import msgpack
+
+
+class ORJSONParser(parsers.JSONParser):
+    """
+    JSONParser on orjson.
+
+    Like DRF's parser, rejects NaN and Infinity. Bodies in a charset other
+    than UTF-8 go through DRF's parser.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if codecs.lookup(encoding).name != "utf-8":
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
+
+
+class MessagePackParser(parsers.BaseParser):
+    """
+    MessagePack request bodies (`Content-Type: application/msgpack`).
+
+    Timestamps are decoded to aware datetimes. Needs the optional
+    `msgpack` package.
+    """
+
+    media_type = "application/msgpack"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False, timestamp=3)
+        except (ValueError, TypeError, msgpack.UnpackException) as exc:
+            raise ParseError(f"MessagePack parse error - {exc}")
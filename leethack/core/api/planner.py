@@ -0,0 +1,175 @@
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.serializers import BaseSerializer, ListSerializer
+
+from leethack.core.api.sparse import SparseFieldsetMixin
+
+# source="get_status_display" читає поле status
+DISPLAY_RE = re.compile(r"get_(\w+)_display")
+
+
+@dataclass
+class ModelPlan:
+    """Fields of one model a serializer reads, and how to fetch its relations."""
+
+    model: type
+    fields: set = field(default_factory=set)
+    # False, якщо серіалізатор читає щось, крім полів моделі (property,
+    # SerializerMethodField), і тоді вантажаться всі колонки
+    restricted: bool = True
+    select: dict = field(default_factory=dict)
+    prefetch: dict = field(default_factory=dict)
+
+    def get_select_related(self, prefix=""):
+        paths = []
+        for name, plan in self.select.items():
+            paths.append(prefix + name)
+            paths += plan.get_select_related(f"{prefix}{name}__")
+        return paths
+
+    def get_only(self, prefix=""):
+        if self.restricted:
+            names = self.fields | set(self.select) | {self.model._meta.pk.name}
+        else:
+            names = {f.name for f in self.model._meta.concrete_fields}
+        only = [prefix + name for name in sorted(names)]
+        for name, plan in self.select.items():
+            only += plan.get_only(f"{prefix}{name}__")
+        return only
+
+    def get_prefetches(self, only, prefix=""):
+        prefetches = []
+        for name, (plan, remote_field) in self.prefetch.items():
+            if remote_field:
+                # prefetch зіставляє рядки за FK, тож він має бути завантажений
+                plan.fields.add(remote_field)
+            queryset = plan.apply(plan.model._default_manager.all(), only)
+            prefetches.append(Prefetch(prefix + name, queryset=queryset))
+        for name, plan in self.select.items():
+            prefetches += plan.get_prefetches(only, f"{prefix}{name}__")
+        return prefetches
+
+    def apply(self, queryset, only=True):
+        select_related = self.get_select_related()
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        prefetches = self.get_prefetches(only)
+        if prefetches:
+            queryset = queryset.prefetch_related(*prefetches)
+        if only:
+            queryset = queryset.only(*self.get_only())
+        return queryset
+
+
+def get_model_field(model, attr):
+    try:
+        return model._meta.get_field(attr)
+    except FieldDoesNotExist:
+        pass
+    match = DISPLAY_RE.fullmatch(attr)
+    if match:
+        try:
+            return model._meta.get_field(match[1])
+        except FieldDoesNotExist:
+            pass
+    return None
+
+
+def walk_serializer(serializer, plan):
+    for serializer_field in serializer.fields.values():
+        if serializer_field.write_only:
+            continue
+
+        # поля, які самі знають, які колонки читають (ImageVariantsField)
+        model_fields = getattr(serializer_field, "model_fields", None)
+        if model_fields is not None:
+            plan.fields.update(model_fields)
+            continue
+
+        if serializer_field.source == "*":
+            if isinstance(serializer_field, BaseSerializer):
+                walk_serializer(serializer_field, plan)
+            else:
+                plan.restricted = False
+            continue
+
+        walk_source(serializer_field, serializer_field.source_attrs, plan)
+
+
+def walk_source(serializer_field, attrs, plan):
+    model_field = get_model_field(plan.model, attrs[0])
+    if model_field is None:
+        plan.restricted = False
+        return
+
+    if not model_field.is_relation:
+        plan.fields.add(model_field.name)
+        return
+
+    name = model_field.name
+    related_model = model_field.related_model
+    if model_field.many_to_one or (model_field.one_to_one and model_field.concrete):
+        is_nested = isinstance(serializer_field, BaseSerializer)
+        if len(attrs) == 1 and not is_nested:
+            # PrimaryKeyRelatedField читає лише FK
+            plan.fields.add(name)
+            return
+        related = plan.select.setdefault(name, ModelPlan(related_model))
+    else:
+        # зворотні зв'язки і many-to-many вантажаться окремим запитом
+        accessor = model_field.get_accessor_name() if model_field.auto_created else name
+        remote_field = model_field.field.name if model_field.one_to_many else None
+        related, _ = plan.prefetch.setdefault(
+            accessor, (ModelPlan(related_model), remote_field)
+        )
+
+    if len(attrs) > 1:
+        walk_source(serializer_field, attrs[1:], related)
+    elif isinstance(serializer_field, ListSerializer):
+        walk_serializer(serializer_field.child, related)
+    elif isinstance(serializer_field, BaseSerializer):
+        walk_serializer(serializer_field, related)
+    else:
+        related.restricted = False
+
+
+@lru_cache(maxsize=1024)
+def get_queryset_plan(serializer_class, model):
+    """Plan for `model` rows rendered by `serializer_class`, built once per pair."""
+    plan = ModelPlan(model)
+    walk_serializer(serializer_class(), plan)
+    return plan
+
+
+def plan_queryset(queryset, serializer_class, only=True):
+    """
+    Add the joins and column list `serializer_class` needs to `queryset`.
+
+    Forward foreign keys rendered by nested serializers become
+    `select_related`, reverse and many-to-many relations `prefetch_related`,
+    and with `only` every model loads just the columns its serializer reads.
+    """
+    plan = get_queryset_plan(serializer_class, queryset.model)
+    return plan.apply(queryset, only)
+
+
+class PlannedQuerySetMixin(SparseFieldsetMixin):
+    """
+    Plans `get_queryset()` for the view's serializer with `plan_queryset`.
+
+    Columns are restricted only for safe methods: a write serializer may
+    save or read any field of the instance. With `?fields=` / `?expand=`
+    the plan follows the pruned serializer.
+    """
+
+    plan_only = True
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        only = self.plan_only and self.request.method in SAFE_METHODS
+        return plan_queryset(queryset, self.get_read_serializer_class(), only)
@@ -0,0 +1,116 @@
+import json
+
+import orjson
+from rest_framework import renderers
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# типи, яких orjson і msgpack не знають (Decimal, лінива локалізація,
+# QuerySet, ...), перетворюються так само, як у JSONRenderer DRF
+encode_default = JSONEncoder().default
+
+
+class RawJSON(bytes):
+    """Response data that is already rendered JSON."""
+
+
+class PrerenderedJSONRenderer(renderers.JSONRenderer):
+    """
+    JSONRenderer that writes `RawJSON` data as is.
+
+    Lets a view build the body itself (e.g. in the database) and still go
+    through content negotiation, headers and the list cache as usual.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, RawJSON):
+            if self.get_indent(accepted_media_type, renderer_context or {}) is None:
+                return bytes(data)
+            # browsable API та ?indent отримують відформатований JSON
+            data = json.loads(data)
+        return super().render(data, accepted_media_type, renderer_context)
+
+
+class ORJSONRenderer(PrerenderedJSONRenderer):
+    """
+    JSONRenderer on orjson.
+
+    UUIDs, datetimes and dict/str subclasses (ReturnDict, ErrorDetail) are
+    serialized natively instead of through a Python `default` call per
+    value. Output is the same as DRF's: compact UTF-8 with U+2028/U+2029
+    escaped, UTC datetimes ending in "Z". Indented output and values orjson
+    can't represent (integers wider than 64 bits) go through DRF's renderer.
+    """
+
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if isinstance(data, RawJSON) or (
+            self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            content = orjson.dumps(data, default=encode_default, option=self.options)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # як у DRF: JSON має бути валідним JavaScript
+        return content.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
+
+
+class MessagePackRenderer(renderers.BaseRenderer):
+    """
+    MessagePack responses for clients that send `Accept: application/msgpack`.
+
+    Values are the ones the JSON renderer would write: datetimes, UUIDs and
+    decimals become strings and numbers, not msgpack extension types.
+    Needs the optional `msgpack` package.
+    """
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if isinstance(data, RawJSON):
+            data = orjson.loads(bytes(data))
+        return msgpack.packb(data, default=encode_default, datetime=False)
+
+
+class NDJSONRenderer(renderers.BaseRenderer):
+    """
+    Newline-delimited JSON, one compact JSON value per line.
+
+    Negotiated with `Accept: application/x-ndjson` on views that stream
+    their lists (`NDJSONStreamingListMixin`); anything else a view returns
+    (errors, a single object) is written as one line, a list as a line per
+    item.
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = None
+
+    line_renderer = ORJSONRenderer()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if isinstance(data, RawJSON):
+            data = orjson.loads(bytes(data))
+        items = data if isinstance(data, list) else [data]
+        return b"".join(self.render_line(item) for item in items)
+
+    def render_line(self, item):
+        return self.line_renderer.render(item) + b"\n"
@@ -0,0 +1,66 @@
+from drf_spectacular import openapi
+from drf_spectacular.plumbing import force_instance, is_serializer
+from drf_spectacular.utils import OpenApiParameter
+
+from leethack.core.api.renderers import NDJSONRenderer
+
+from leethack.core.api.sideload import (
+    SIDELOAD_QUERY_DESCRIPTION,
+    SIDELOAD_QUERY_PARAM,
+    SideloadListMixin,
+)
+from leethack.core.api.sparse import (
+    EXPAND_QUERY_DESCRIPTION,
+    EXPAND_QUERY_PARAM,
+    FIELDS_QUERY_DESCRIPTION,
+    FIELDS_QUERY_PARAM,
+    SparseFieldsetMixin,
+)
+from leethack.core.api.streaming import NDJSONStreamingListMixin
+
+
+class AutoSchema(openapi.AutoSchema):
+    """
+    AutoSchema that documents `?fields=` / `?expand=` of sparse views and
+    `?sideload=` of lists. Streamed NDJSON lists are documented by the
+    schema of one line, a single object.
+    """
+
+    def get_override_parameters(self):
+        parameters = super().get_override_parameters()
+        if self.method == "GET" and isinstance(self.view, SparseFieldsetMixin):
+            parameters = [
+                *parameters,
+                OpenApiParameter(
+                    FIELDS_QUERY_PARAM, str, description=FIELDS_QUERY_DESCRIPTION
+                ),
+                OpenApiParameter(
+                    EXPAND_QUERY_PARAM, str, description=EXPAND_QUERY_DESCRIPTION
+                ),
+            ]
+        if self.method == "GET" and isinstance(self.view, SideloadListMixin):
+            parameters = [
+                *parameters,
+                OpenApiParameter(
+                    SIDELOAD_QUERY_PARAM, bool, description=SIDELOAD_QUERY_DESCRIPTION
+                ),
+            ]
+        return parameters
+
+    def _get_response_for_code(
+        self, serializer, status_code, media_types=None, direction="response"
+    ):
+        response = super()._get_response_for_code(
+            serializer, status_code, media_types, direction
+        )
+        content = response.get("content", {})
+        if (
+            NDJSONRenderer.media_type in content
+            and isinstance(self.view, NDJSONStreamingListMixin)
+            and is_serializer(serializer)
+            and self._is_list_view(serializer)
+        ):
+            # потік без пагінації, кожен рядок - один об'єкт
+            component = self.resolve_serializer(force_instance(serializer), direction)
+            content[NDJSONRenderer.media_type]["schema"] = component.ref
+        return response
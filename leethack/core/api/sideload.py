@@ -0,0 +1,196 @@
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+
+import orjson
+
+from leethack.core.api.compiler import compile_serializer
+from leethack.core.api.planner import get_model_field, plan_queryset
+from leethack.core.api.renderers import RawJSON
+from leethack.core.api.sparse import get_sparse_serializer, is_nested
+
+SIDELOAD_QUERY_PARAM = "sideload"
+SIDELOAD_QUERY_DESCRIPTION = (
+    "Set to `true` to replace nested objects with their identifiers and list "
+    "each object once in `included`, keyed by type and identifier."
+)
+
+
+@dataclass(frozen=True)
+class Relation:
+    # поле рендереного об'єкта з ідентифікатором пов'язаного
+    name: str
+    # ключ в `included`
+    type: str
+
+
+@dataclass(frozen=True)
+class IncludedType:
+    model: type
+    serializer_class: type
+    relations: tuple
+
+
+@dataclass(frozen=True)
+class SideloadPlan:
+    """Row serializer with nested objects collapsed and how to load them."""
+
+    row_class: type
+    relations: tuple
+    types: dict
+
+
+class SideloadPlanner:
+    def __init__(self):
+        self.types = {}
+        self.serializers = {}
+
+    def get_relations(self, serializer_class, model):
+        relations = []
+        for name, field in serializer_class._declared_fields.items():
+            if not is_nested(field):
+                continue
+            related_model = self.get_related_model(
+                model, field._kwargs.get("source", name)
+            )
+            if related_model is None:
+                continue
+            relations.append(Relation(name, self.add_type(type(field), related_model)))
+        return tuple(relations)
+
+    @staticmethod
+    def get_related_model(model, source):
+        for attr in source.split("."):
+            model_field = get_model_field(model, attr)
+            if model_field is None or not model_field.is_relation:
+                return None
+            model = model_field.related_model
+        return model
+
+    def add_type(self, serializer_class, model):
+        type_name = model._meta.model_name
+        if (
+            self.serializers.setdefault(type_name, serializer_class)
+            is not serializer_class
+        ):
+            # ту ж модель інший серіалізатор рендерить інакше
+            type_name = f"{type_name}.{serializer_class.__name__}"
+            self.serializers[type_name] = serializer_class
+        if type_name not in self.types:
+            self.types[type_name] = None  # захист від циклів
+            relations = self.get_relations(serializer_class, model)
+            collapsed = get_sparse_serializer(serializer_class, None, frozenset())
+            self.types[type_name] = IncludedType(model, collapsed, relations)
+        return type_name
+
+
+@lru_cache(maxsize=1024)
+def get_sideload_plan(serializer_class, model):
+    planner = SideloadPlanner()
+    relations = planner.get_relations(serializer_class, model)
+    row_class = get_sparse_serializer(serializer_class, None, frozenset())
+    return SideloadPlan(row_class, relations, planner.types)
+
+
+def render_included(included_type, ids, context):
+    """Rendered objects of `included_type` with primary keys `ids`, by pk."""
+    model = included_type.model
+    queryset = model._default_manager.filter(pk__in=ids).order_by("pk")
+    compiled = compile_serializer(included_type.serializer_class, model)
+    if compiled is not None:
+        pk_name = model._meta.pk.name
+        rows = list(compiled.get_rows(queryset, extra=(pk_name,)))
+        data = compiled.render_rows(rows, context)
+        return {str(getattr(row, pk_name)): obj for row, obj in zip(rows, data)}
+
+    instances = list(plan_queryset(queryset, included_type.serializer_class))
+    data = included_type.serializer_class(instances, many=True, context=context).data
+    return {str(instance.pk): obj for instance, obj in zip(instances, data)}
+
+
+def load_included(plan, objects, context):
+    """`included` map for rendered rows `objects`, one query per type and level."""
+    included = {}
+    pending = defaultdict(set)
+
+    def collect(relations, objects):
+        for relation in relations:
+            for obj in objects:
+                value = obj.get(relation.name)
+                if value is not None:
+                    pending[relation.type].add(str(value))
+
+    collect(plan.relations, objects)
+    while pending:
+        type_name, ids = pending.popitem()
+        loaded = included.setdefault(type_name, {})
+        ids -= loaded.keys()
+        if not ids:
+            continue
+        included_type = plan.types[type_name]
+        rendered = render_included(included_type, ids, context)
+        loaded.update(rendered)
+        collect(included_type.relations, rendered.values())
+    return included
+
+
+class SideloadListMixin:
+    """
+    Opt-in compound list responses with `?sideload=true`.
+
+    Nested objects of every row become their identifiers (so the page
+    query has no joins for them) and each related object is rendered once
+    into `included`, e.g. `{"user": {"<id>": {...}}, "category": {...}}`.
+    Objects in `included` reference their own relations the same way.
+    Works with the compiled and SQL list paths; expects
+    `PlannedQuerySetMixin` (or `SparseFieldsetMixin`) for the read
+    serializer class.
+    """
+
+    def is_sideloading(self):
+        request = self.request
+        if request is None or request.method != "GET":
+            return False
+        value = request.query_params.get(SIDELOAD_QUERY_PARAM, "")
+        return value.lower() in ("1", "true", "yes")
+
+    def get_sideload_plan(self):
+        serializer_class = super().get_read_serializer_class()
+        return get_sideload_plan(serializer_class, self.queryset.model)
+
+    def get_read_serializer_class(self):
+        if self.is_sideloading():
+            return self.get_sideload_plan().row_class
+        return super().get_read_serializer_class()
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        if not self.is_sideloading() or response.status_code != 200:
+            return response
+
+        data = response.data
+        raw = isinstance(data, RawJSON)
+        if raw:
+            data = orjson.loads(bytes(data))
+        results = data["results"] if isinstance(data, dict) else data
+        included = load_included(
+            self.get_sideload_plan(), results, self.get_serializer_context()
+        )
+
+        if not raw:
+            if isinstance(data, dict):
+                data["included"] = included
+            else:
+                response.data = {"results": data, "included": included}
+            return response
+
+        # сторінка вже відрендерена в SQL: included дописується до байтів
+        content = request.accepted_renderer.render(
+            included, request.accepted_media_type, self.get_renderer_context()
+        )
+        if isinstance(data, dict):
+            body = response.data[:-1] + b',"included":' + content + b"}"
+        else:
+            body = b'{"results":' + response.data + b',"included":' + content + b"}"
+        response.data = RawJSON(body)
+        return response
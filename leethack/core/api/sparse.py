@@ -0,0 +1,141 @@
+from functools import lru_cache
+
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_QUERY_PARAM = "fields"
+EXPAND_QUERY_PARAM = "expand"
+FIELDS_QUERY_DESCRIPTION = (
+    "Comma-separated fields to include, e.g. `id,title,host.username`. "
+    "Nested fields are selected with dots."
+)
+EXPAND_QUERY_DESCRIPTION = (
+    "Comma-separated nested objects to render in full, e.g. `host,winner.user`. "
+    "When given, other nested objects are replaced by their identifiers."
+)
+
+
+def parse_paths(value):
+    """`"id, host.username"` -> {("id",), ("host", "username")}"""
+    paths = set()
+    for item in value.split(","):
+        path = tuple(part.strip() for part in item.split("."))
+        if any(path):
+            paths.add(path)
+    return frozenset(paths)
+
+
+def get_subpaths(paths, name):
+    return frozenset(path[1:] for path in paths if path[0] == name and len(path) > 1)
+
+
+def is_nested(field):
+    # many=True - це ListSerializer, його не звужую і не згортаю
+    return isinstance(field, serializers.Serializer) and field.source != "*"
+
+
+def collapse(name, field):
+    """Field rendering only the primary key of the object `field` renders."""
+    return serializers.PrimaryKeyRelatedField(
+        read_only=True,
+        source=field._kwargs.get("source"),
+        allow_null=field.allow_null,
+        help_text=f"Identifier of {name}, see `expand`.",
+    )
+
+
+def prune(serializer_class, fields, expand, prefix):
+    declared = serializer_class._declared_fields
+    errors = {}
+    for param, paths in ((FIELDS_QUERY_PARAM, fields), (EXPAND_QUERY_PARAM, expand)):
+        for path in paths or ():
+            field = declared.get(path[0])
+            if field is None or field.write_only:
+                errors.setdefault(param, []).append(
+                    f"Unknown field '{prefix}{'.'.join(path)}'."
+                )
+            elif not is_nested(field) and (
+                len(path) > 1 or param == EXPAND_QUERY_PARAM
+            ):
+                errors.setdefault(param, []).append(
+                    f"Field '{prefix}{path[0]}' is not a nested object."
+                )
+    if errors:
+        raise ValidationError(errors)
+
+    attrs = {}
+    selected = None if fields is None else {path[0] for path in fields}
+    for name, field in declared.items():
+        if selected is not None and name not in selected:
+            # None прибирає оголошене поле в підкласі серіалізатора
+            attrs[name] = None
+            continue
+        if not is_nested(field):
+            continue
+
+        subfields = None if fields is None else get_subpaths(fields, name) or None
+        subexpand = None if expand is None else get_subpaths(expand, name)
+        # шлях у fields чи expand всередину поля теж його розгортає
+        if expand is not None and not (subfields or subexpand or (name,) in expand):
+            attrs[name] = collapse(name, field)
+            continue
+        if subfields is None and subexpand is None:
+            continue
+        nested_class = prune(type(field), subfields, subexpand, f"{prefix}{name}.")
+        if nested_class is not type(field):
+            attrs[name] = nested_class(*field._args, **field._kwargs)
+
+    if not attrs:
+        return serializer_class
+    attrs["__module__"] = serializer_class.__module__
+    attrs["__doc__"] = serializer_class.__doc__
+    return type(serializer_class)(serializer_class.__name__, (serializer_class,), attrs)
+
+
+# ключ - нормалізовані шляхи, тож однакові запити отримують той самий клас,
+# а з ним і закешовані план, скомпільований і SQL серіалізатор
+@lru_cache(maxsize=1024)
+def get_sparse_serializer(serializer_class, fields=None, expand=None):
+    """
+    Subclass of `serializer_class` with only `fields` and with nested
+    serializers outside `expand` replaced by primary keys.
+
+    Both are sets of field paths (tuples of names); None keeps all fields /
+    expands all nested serializers. Unknown paths raise `ValidationError`.
+    """
+    return prune(serializer_class, fields, expand, "")
+
+
+class SparseFieldsetMixin:
+    """
+    Supports `?fields=` and `?expand=` on safe methods.
+
+    The view's serializer class is replaced by a pruned subclass, so the
+    queryset planner and the list compilers see only the fields that are
+    rendered: a dropped or collapsed nested object drops its join and
+    columns from the query as well.
+    """
+
+    def get_read_serializer_class(self):
+        serializer_class = self.get_serializer_class()
+        request = self.request
+        if request is None or request.method not in SAFE_METHODS:
+            return serializer_class
+
+        params = request.query_params
+        fields = expand = None
+        if params.get(FIELDS_QUERY_PARAM):
+            fields = parse_paths(params[FIELDS_QUERY_PARAM])
+        if EXPAND_QUERY_PARAM in params:
+            expand = parse_paths(params[EXPAND_QUERY_PARAM])
+        if fields is None and expand is None:
+            return serializer_class
+        return get_sparse_serializer(serializer_class, fields, expand)
+
+    def get_serializer(self, *args, **kwargs):
+        serializer_class = self.get_read_serializer_class()
+        # drf-spectacular передає свій контекст, без kwargs запиту
+        if "context" not in kwargs:
+            kwargs["context"] = self.get_serializer_context()
+        return serializer_class(*args, **kwargs)
@@ -0,0 +1,463 @@
+import json
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+from django.conf import settings
+from django.db.models import F, Func, TextField, Value
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from leethack.core.api.compiler import (
+    NotCompilable,
+    get_cursor_columns,
+    is_identity,
+    is_pk_only,
+)
+from leethack.core.api.fields import (
+    FORMAT_ORDER,
+    ImageMetadataField,
+    ImageVariantsField,
+)
+from leethack.core.api.planner import DISPLAY_RE, get_model_field
+from leethack.core.api.renderers import PrerenderedJSONRenderer, RawJSON
+from leethack.core.images import (
+    VARIANT_NAMES,
+    get_metadata_field_name,
+    get_variants_field_name,
+)
+from leethack.core.storage import get_url_prefix
+
+PLACEHOLDER_RE = re.compile(r"\$(\d+)")
+# символи, які filepath_to_uri (urllib quote) не кодує; '' - лапка в SQL
+URI_SAFE = "A-Za-z0-9_.~/!*()''-"
+
+INTEGER_TYPES = (
+    "AutoField",
+    "BigAutoField",
+    "SmallAutoField",
+    "IntegerField",
+    "BigIntegerField",
+    "SmallIntegerField",
+    "PositiveIntegerField",
+    "PositiveBigIntegerField",
+    "PositiveSmallIntegerField",
+)
+
+JSON_SQL = "COALESCE(to_json($0)::text, 'null')"
+
+# DateTimeField DRF: локальний час, мікросекунди лише ненульові, +00:00 -> Z
+DATETIME_SQL = """
+CASE WHEN $0 IS NULL THEN 'null' ELSE
+'"' || to_char($0 AT TIME ZONE $1, 'YYYY-MM-DD"T"HH24:MI:SS')
+|| CASE WHEN extract(microseconds FROM $0)::bigint %% 1000000 = 0 THEN ''
+   ELSE to_char($0 AT TIME ZONE $1, '.US') END
+|| CASE
+   WHEN ($0 AT TIME ZONE $1) = ($0 AT TIME ZONE 'UTC') THEN 'Z'
+   WHEN ($0 AT TIME ZONE $1) > ($0 AT TIME ZONE 'UTC')
+   THEN '+' || to_char(($0 AT TIME ZONE $1) - ($0 AT TIME ZONE 'UTC'), 'HH24:MI')
+   ELSE '-' || to_char(($0 AT TIME ZONE 'UTC') - ($0 AT TIME ZONE $1), 'HH24:MI')
+   END
+|| '"' END
+"""
+
+# os.path.splitext(name)[1] без крапки, у нижньому регістрі, jpg -> jpeg
+FORMAT_SQL = """
+CASE lower(COALESCE(substring(ltrim(regexp_replace($0, '^.*/', ''), '.')
+                              FROM '\\.([^.]*)$'), ''))
+WHEN 'jpg' THEN 'jpeg'
+ELSE lower(COALESCE(substring(ltrim(regexp_replace($0, '^.*/', ''), '.')
+                              FROM '\\.([^.]*)$'), ''))
+END
+"""
+
+STALE_JSON_SQL = (
+    "$1 IS NULL OR $1 IN ('{}'::jsonb, 'null'::jsonb)"
+    " OR ($1 ->> 'source') IS DISTINCT FROM $0"
+)
+
+METADATA_SQL = f"""
+CASE WHEN $0 IS NULL OR $0 = '' OR {STALE_JSON_SQL} THEN 'null'
+ELSE '{{' || COALESCE((
+    SELECT string_agg(to_json(meta.key)::text || ':' || meta.value::text, ','
+                      ORDER BY meta.ord)
+    FROM jsonb_each($1) WITH ORDINALITY AS meta(key, value, ord)
+    WHERE meta.key <> 'source'
+), '') || '}}' END
+"""
+
+
+def quote_literal(text):
+    return "'" + text.replace("'", "''").replace("%", "%%") + "'"
+
+
+def encode_uri_sql(value):
+    """SQL of `filepath_to_uri(value)`: percent-encodes all but safe characters."""
+    name = f"replace({value}, '\\', '/')"
+    # імена з upload_to зазвичай уже безпечні, посимвольне кодування - рідко.
+    # unnest масиву, а не regexp_split_to_table: на 1000 рядків, які
+    # планувальник закладає на set-returning функцію без оцінки, вартість
+    # рядка затьмарює вибір join-ів
+    return f"""
+CASE WHEN {name} ~ '^[{URI_SAFE}]*$' THEN {name} ELSE (
+    SELECT string_agg(
+        CASE WHEN uri.c ~ '^[{URI_SAFE}]$' THEN uri.c
+        ELSE regexp_replace(
+            upper(encode(convert_to(uri.c, getdatabaseencoding()), 'hex')),
+            '(..)', '%%\\1', 'g')
+        END, '' ORDER BY uri.i)
+    FROM unnest(string_to_array({name}, NULL)) WITH ORDINALITY AS uri(c, i)
+) END
+"""
+
+
+def url_sql(name, prefix):
+    return f"to_json({prefix} || {encode_uri_sql(name)})::text"
+
+
+class SQLTemplate(Func):
+    """SQL fragment with `$n` placeholders for its source expressions."""
+
+    output_field = TextField()
+
+    def __init__(self, sql_template, *expressions):
+        super().__init__(*expressions, output_field=TextField())
+        self.sql_template = sql_template
+
+    def as_sql(self, compiler, connection, **extra_context):
+        compiled = [compiler.compile(e) for e in self.get_source_expressions()]
+        params = []
+
+        def replace(match):
+            sql, expression_params = compiled[int(match[1])]
+            params.extend(expression_params)
+            return f"({sql})"
+
+        return PLACEHOLDER_RE.sub(replace, self.sql_template), params
+
+
+def concat(parts):
+    """Text concatenation of JSON literals (str) and SQL expressions."""
+    merged = []
+    for part in parts:
+        if isinstance(part, str) and merged and isinstance(merged[-1], str):
+            merged[-1] += part
+        else:
+            merged.append(part)
+
+    expressions = []
+    sql = []
+    for part in merged:
+        if isinstance(part, str):
+            sql.append(quote_literal(part))
+        else:
+            sql.append(f"${len(expressions)}")
+            expressions.append(part)
+    return SQLTemplate(" || ".join(sql), *expressions)
+
+
+@dataclass(frozen=True)
+class Node:
+    # object, json, datetime, display, file, variants, metadata
+    kind: str
+    columns: tuple = ()
+    items: tuple = ()
+    model_field: object = None
+
+
+class SQLJSONCompiler:
+    """
+    Turns a read serializer class into a tree of nodes renderable in SQL.
+
+    Supports the same serializers as `SerializerCompiler`, limited to field
+    types whose DRF output Postgres can reproduce byte for byte.
+    """
+
+    def __init__(self, serializer_class, model):
+        self.serializer_class = serializer_class
+        self.model = model
+
+    def compile(self):
+        return self.compile_serializer(self.serializer_class(), self.model, "", None)
+
+    def compile_serializer(self, serializer, model, prefix, null_column):
+        if (
+            isinstance(serializer, serializers.ListSerializer)
+            or type(serializer).to_representation
+            is not serializers.Serializer.to_representation
+        ):
+            raise NotCompilable(f"{type(serializer).__name__} is not supported")
+
+        items = []
+        for name, field in serializer.fields.items():
+            if not field.write_only:
+                items.append((name, self.compile_field(field, model, prefix)))
+        columns = (null_column,) if null_column else ()
+        return Node("object", columns, tuple(items))
+
+    def compile_field(self, field, model, prefix):
+        if type(field) in (ImageVariantsField, ImageMetadataField):
+            name = field.image_field
+            if isinstance(field, ImageVariantsField):
+                kind, json_field = "variants", get_variants_field_name(name)
+            else:
+                kind, json_field = "metadata", get_metadata_field_name(name)
+            return Node(
+                kind,
+                (prefix + name, prefix + json_field),
+                model_field=model._meta.get_field(name),
+            )
+
+        if field.source == "*" or len(field.source_attrs) != 1:
+            raise NotCompilable(f"Unsupported source {field.source}")
+        attr = field.source_attrs[0]
+        model_field = get_model_field(model, attr)
+        if model_field is None:
+            raise NotCompilable(f"{model.__name__}.{attr} is not a model field")
+
+        column = prefix + model_field.name
+        if model_field.primary_key and prefix:
+            column = prefix.removesuffix("__")
+
+        if isinstance(field, serializers.BaseSerializer):
+            if not (model_field.many_to_one or model_field.one_to_one):
+                raise NotCompilable(f"{column} is not a forward relation")
+            return self.compile_serializer(
+                field, model_field.related_model, f"{column}__", column
+            )
+        if model_field.is_relation:
+            if not is_pk_only(field, model_field):
+                raise NotCompilable(f"{column} is a relation")
+            return Node("json", (column,))
+
+        if DISPLAY_RE.fullmatch(attr):
+            if not isinstance(field, serializers.CharField) or not is_identity(field):
+                raise NotCompilable(f"{attr} needs a plain CharField")
+            return Node("display", (column,), model_field=model_field)
+        if attr != model_field.name:
+            raise NotCompilable(f"Unsupported source {attr}")
+        return Node(
+            self.get_kind(field, model_field), (column,), model_field=model_field
+        )
+
+    def get_kind(self, field, model_field):
+        internal_type = model_field.get_internal_type()
+        field_type = type(field)
+        if field_type in (serializers.ImageField, serializers.FileField):
+            if not getattr(field, "use_url", api_settings.UPLOADED_FILES_USE_URL):
+                raise NotCompilable("Files are rendered as names")
+            return "file"
+        if field_type is serializers.DateTimeField:
+            output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+            if internal_type != "DateTimeField" or output_format != ISO_8601:
+                raise NotCompilable("Only ISO 8601 datetimes are rendered in SQL")
+            return "datetime"
+        if field_type is serializers.UUIDField:
+            if internal_type != "UUIDField" or field.uuid_format != "hex_verbose":
+                raise NotCompilable("Only hex_verbose UUIDs are rendered in SQL")
+            return "json"
+        if is_identity(field):
+            if isinstance(field, serializers.CharField):
+                column_types = ("CharField", "TextField", "EmailField", "SlugField")
+            else:
+                column_types = INTEGER_TYPES
+            if internal_type in column_types:
+                return "json"
+        raise NotCompilable(f"{field_type.__name__} is not rendered in SQL")
+
+
+class SQLJSONSerializer:
+    """Compiled serializer tree, turned into an SQL expression per request."""
+
+    def __init__(self, root):
+        self.root = root
+
+    def get_expression(self, context):
+        """
+        Text expression rendering one row, or None if some file storage
+        signs its URLs and they can't be built in the database.
+        """
+        self.context = context
+        self.prefixes = {}
+        try:
+            return self.build(self.root)
+        except NotCompilable:
+            return None
+        finally:
+            del self.context, self.prefixes
+
+    def get_prefix(self, model_field):
+        storage = model_field.storage
+        if storage not in self.prefixes:
+            prefix = get_url_prefix(storage)
+            if prefix is None:
+                raise NotCompilable("Storage URLs are signed")
+            request = self.context.get("request")
+            if request is not None:
+                prefix = request.build_absolute_uri(prefix)
+            self.prefixes[storage] = Value(prefix)
+        return self.prefixes[storage]
+
+    def build(self, node):
+        return getattr(self, f"build_{node.kind}")(node)
+
+    def build_object(self, node):
+        parts = ["{"]
+        for i, (name, child) in enumerate(node.items):
+            parts.append(("," if i else "") + json.dumps(name) + ":")
+            parts.append(self.build(child))
+        parts.append("}")
+        expression = concat(parts)
+        if not node.columns:
+            return expression
+        # null FK - це null вкладений об'єкт, як у DRF
+        return SQLTemplate(
+            "CASE WHEN $0 IS NULL THEN 'null' ELSE $1 END",
+            F(node.columns[0]),
+            expression,
+        )
+
+    def build_json(self, node):
+        return SQLTemplate(JSON_SQL, F(node.columns[0]))
+
+    def build_datetime(self, node):
+        tz = Value(timezone.get_current_timezone_name())
+        return SQLTemplate(DATETIME_SQL, F(node.columns[0]), tz)
+
+    def build_display(self, node):
+        cases = []
+        values = [F(node.columns[0])]
+        for value, label in node.model_field.flatchoices:
+            cases.append(f"WHEN ${len(values)} THEN ${len(values) + 1}")
+            values += [Value(value), Value(json.dumps(str(label), ensure_ascii=False))]
+        sql = f"COALESCE(CASE $0 {' '.join(cases)} ELSE to_json($0::text)::text END, 'null')"
+        return SQLTemplate(sql, *values)
+
+    def build_file(self, node):
+        prefix = self.get_prefix(node.model_field)
+        sql = f"CASE WHEN $0 IS NULL OR $0 = '' THEN 'null' ELSE {url_sql('$0', '$1')} END"
+        return SQLTemplate(sql, F(node.columns[0]), prefix)
+
+    def build_variants(self, node):
+        name, variants = F(node.columns[0]), F(node.columns[1])
+        prefix = self.get_prefix(node.model_field)
+        order = Value(list(FORMAT_ORDER))
+        original = (
+            f"'{{' || to_json({FORMAT_SQL})::text || ':' || {url_sql('$0', '$2')}"
+            " || '}'"
+        )
+        originals = []
+        generated = []
+        for i, variant in enumerate(VARIANT_NAMES):
+            key = quote_literal(("," if i else "") + json.dumps(variant) + ":")
+            originals.append(f"{key} || {original}")
+            generated.append(f"""{key} || COALESCE((
+    SELECT '{{' || string_agg(
+        to_json(formats.key)::text || ':' || {url_sql('formats.value', '$2')}, ','
+        ORDER BY COALESCE(array_position($3::text[], formats.key), $4), formats.ord
+    ) || '}}'
+    FROM jsonb_each_text($1 -> {quote_literal(variant)})
+        WITH ORDINALITY AS formats(key, value, ord)
+), '{{}}')""")
+        sql = f"""
+CASE WHEN $0 IS NULL OR $0 = '' THEN 'null'
+WHEN {STALE_JSON_SQL} THEN '{{' || {' || '.join(originals)} || '}}'
+ELSE '{{' || {' || '.join(generated)} || '}}' END
+"""
+        # невідомі формати - після відомих, як у ImageVariantsField
+        return SQLTemplate(
+            sql, name, variants, prefix, order, Value(len(FORMAT_ORDER) + 1)
+        )
+
+    def build_metadata(self, node):
+        return SQLTemplate(METADATA_SQL, F(node.columns[0]), F(node.columns[1]))
+
+
+@lru_cache(maxsize=1024)
+def compile_sql_json(serializer_class, model):
+    """SQL form of `serializer_class` for rows of `model`, or None if unsupported."""
+    try:
+        root = SQLJSONCompiler(serializer_class, model).compile()
+    except NotCompilable:
+        return None
+    return SQLJSONSerializer(root)
+
+
+def render_rows(rows):
+    text = ",".join(row.row_json for row in rows)
+    # як JSONRenderer DRF: U+2028/U+2029 екрануються для вбудовування в JS
+    text = text.replace("\u2028", "\\u2028").replace("\u2029", "\\u2029")
+    return b"[" + text.encode() + b"]"
+
+
+def render_object(renderer, data, accepted_media_type, renderer_context):
+    """
+    Render dict `data` key by key, so `RawJSON` values go in as they are.
+    """
+
+    def render(value):
+        # JSONRenderer рендерить None як порожнє тіло
+        if value is None:
+            return b"null"
+        return renderer.render(value, accepted_media_type, renderer_context)
+
+    items = b",".join(
+        render(str(key)) + b":" + render(value) for key, value in data.items()
+    )
+    return RawJSON(b"{" + items + b"}")
+
+
+class SQLJSONListMixin:
+    """
+    Renders list pages to JSON in the database.
+
+    Each row of the page query carries its serialized JSON, built from the
+    serializer's fields with Postgres string functions, and the page goes
+    into the response as bytes, without model instances, Python dicts or
+    `json.dumps`. Media URLs are the storage's URL prefix plus the encoded
+    name, so storages with signed URLs fall back to the regular list, as do
+    other renderers (browsable API, `indent`) and unsupported serializers.
+    Goes before `CompiledListMixin`, which renders those.
+    """
+
+    def get_sql_json_serializer(self, queryset):
+        request = self.request
+        renderer = getattr(request, "accepted_renderer", None)
+        if (
+            not settings.SQL_JSON_RENDERING
+            or request.method != "GET"
+            or not isinstance(renderer, PrerenderedJSONRenderer)
+            or renderer.get_indent(
+                request.accepted_media_type, self.get_renderer_context()
+            )
+            is not None
+        ):
+            return None
+        return compile_sql_json(self.get_read_serializer_class(), queryset.model)
+
+    def list_queryset(self, queryset):
+        compiled = self.get_sql_json_serializer(queryset)
+        expression = compiled and compiled.get_expression(self.get_serializer_context())
+        if expression is None:
+            return super().list_queryset(queryset)
+
+        rows = (
+            queryset.prefetch_related(None)
+            .annotate(row_json=expression)
+            .values_list("row_json", *get_cursor_columns(queryset), named=True)
+        )
+        page = self.paginate_queryset(rows)
+        if page is None:
+            return Response(RawJSON(render_rows(rows)))
+
+        request = self.request
+        response = self.get_paginated_response(RawJSON(render_rows(page)))
+        response.data = render_object(
+            request.accepted_renderer,
+            response.data,
+            request.accepted_media_type,
+            self.get_renderer_context(),
+        )
+        return response
@@ -0,0 +1,107 @@
+from itertools import islice
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+
+from leethack.core.api.compiler import compile_serializer
+from leethack.core.api.renderers import NDJSONRenderer
+from leethack.core.api.sqljson import compile_sql_json
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def stream_sql_json(rows, chunk_size):
+    for batch in batched(rows.iterator(chunk_size=chunk_size), chunk_size):
+        text = "\n".join(batch) + "\n"
+        # як JSONRenderer DRF: U+2028/U+2029 екрануються
+        text = text.replace("\u2028", "\\u2028").replace("\u2029", "\\u2029")
+        yield text.encode()
+
+
+def stream_compiled(compiled, rows, context, renderer, chunk_size):
+    converters = compiled.bind(context)
+    render = compiled.render
+    for batch in batched(rows.iterator(chunk_size=chunk_size), chunk_size):
+        yield b"".join(renderer.render_line(render(row, converters)) for row in batch)
+
+
+def stream_serialized(serializer_class, queryset, context, renderer, chunk_size):
+    # prefetch_related з iterator() виконується по chunk_size об'єктів
+    for batch in batched(queryset.iterator(chunk_size=chunk_size), chunk_size):
+        yield renderer.render(serializer_class(batch, many=True, context=context).data)
+
+
+class NDJSONStreamingListMixin:
+    """
+    Streams the whole filtered list as NDJSON for
+    `Accept: application/x-ndjson` (or `?format=ndjson`).
+
+    Rows are read through a server-side cursor (`iterator(chunk_size=...)`)
+    and written to a `StreamingHttpResponse` a chunk at a time, one
+    serialized row per line, so memory stays flat however many rows there
+    are. There is no pagination and no `COUNT(*)`. Rows are rendered the
+    same way as list pages: in SQL when `SQL_JSON_RENDERING` allows it,
+    else by the compiled or the regular read serializer. Nested objects
+    stay embedded, `?sideload` is ignored. Expects `PlannedQuerySetMixin`
+    for `get_read_serializer_class`.
+    """
+
+    def get_renderers(self):
+        renderers = super().get_renderers()
+        # NDJSON тільки для списку, а не для відповідей на запис
+        if getattr(self.request, "method", None) == "GET":
+            renderers.append(NDJSONRenderer())
+        return renderers
+
+    def is_streaming(self):
+        renderer = getattr(self.request, "accepted_renderer", None)
+        return self.request.method == "GET" and isinstance(renderer, NDJSONRenderer)
+
+    def is_sideloading(self):
+        # рядок потоку самодостатній, `included` нікуди додати
+        return not self.is_streaming() and super().is_sideloading()
+
+    def list(self, request, *args, **kwargs):
+        if not self.is_streaming():
+            return super().list(request, *args, **kwargs)
+
+        # помилки фільтрів і ?fields= мають стати відповіддю 400 до того,
+        # як почнеться потік
+        queryset = self.filter_queryset(self.get_queryset())
+        response = StreamingHttpResponse(
+            self.get_stream(queryset, request.accepted_renderer),
+            content_type=NDJSONRenderer.media_type,
+        )
+        patch_vary_headers(response, ("Accept",))
+        return response
+
+    def get_stream(self, queryset, renderer):
+        """Iterator of NDJSON chunks with the rows of `queryset`."""
+        chunk_size = settings.API_STREAM_CHUNK_SIZE
+        serializer_class = self.get_read_serializer_class()
+        context = self.get_serializer_context()
+        model = queryset.model
+
+        if settings.SQL_JSON_RENDERING:
+            compiled = compile_sql_json(serializer_class, model)
+            expression = compiled and compiled.get_expression(context)
+            if expression is not None:
+                rows = (
+                    queryset.prefetch_related(None)
+                    .annotate(row_json=expression)
+                    .values_list("row_json", flat=True)
+                )
+                return stream_sql_json(rows, chunk_size)
+
+        compiled = compile_serializer(serializer_class, model)
+        if compiled is not None:
+            rows = compiled.get_rows(queryset)
+            return stream_compiled(compiled, rows, context, renderer, chunk_size)
+        return stream_serialized(
+            serializer_class, queryset, context, renderer, chunk_size
+        )
@@ -0,0 +1,181 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.core.files import File
+from django.db import models
+from django.db.models.fields.files import FieldFile
+from rest_framework.utils import model_meta
+
+from leethack.core.deletes import submit_deletes
+from leethack.core.images import build_image_metadata, get_metadata_field_name
+from leethack.core.storage import is_content_addressed
+from leethack.core.uploadhandler import LimitedUploadHandler, get_max_upload_bytes
+from leethack.core.validators import get_image_source
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.FILE_UPLOAD_WORKERS,
+            thread_name_prefix="file-uploads",
+        )
+    return _executor
+
+
+class UploadLimitMixin:
+    """
+    Enforces per-field upload size limits while the request body is parsed.
+
+    `upload_limits` maps file field names to image configs from settings
+    (the same ones passed to `build_image_validators`).
+    """
+
+    upload_limits = {}
+
+    def initialize_request(self, request, *args, **kwargs):
+        limits = {
+            field: get_max_upload_bytes(config)
+            for field, config in self.upload_limits.items()
+        }
+        request.upload_handlers.insert(0, LimitedUploadHandler(request, limits))
+        return super().initialize_request(request, *args, **kwargs)
+
+
+class ConcurrentFileUploadMixin:
+    """
+    ModelSerializer mixin that stores uploaded files of all file fields
+    concurrently before the row is saved.
+
+    `ModelSerializer` uploads each file from `pre_save` one after another,
+    so a request with two images waits for two storage round-trips. Here
+    every file is stored in a thread of its own, and the row is written only
+    after all uploads succeeded. If an upload or the save fails, the files
+    that were already stored are deleted.
+    """
+
+    def create(self, validated_data):
+        return self.save_with_files(super().create, validated_data)
+
+    def update(self, instance, validated_data):
+        return self.save_with_files(partial(super().update, instance), validated_data)
+
+    def save_with_files(self, save, validated_data):
+        files = self.get_uploaded_files(validated_data)
+        stored, extra = self.store_files(validated_data, files)
+        # далі поля отримують імена вже збережених файлів
+        validated_data.update(stored)
+        validated_data.update(extra)
+        try:
+            return save(validated_data)
+        except Exception:
+            self.delete_stored(stored)
+            raise
+
+    def get_uploaded_files(self, validated_data):
+        return {
+            field.name: validated_data[field.name]
+            for field in self.Meta.model._meta.concrete_fields
+            if isinstance(field, models.FileField)
+            and isinstance(validated_data.get(field.name), File)
+            # FieldFile уже лежить у сховищі
+            and not isinstance(validated_data[field.name], FieldFile)
+        }
+
+    def get_upload_instance(self, validated_data):
+        """Instance passed to `upload_to`; an unsaved one is built for create."""
+        if self.instance is not None:
+            return self.instance
+        info = model_meta.get_field_info(self.Meta.model)
+        return self.Meta.model(
+            **{
+                name: value
+                for name, value in validated_data.items()
+                if not isinstance(value, File)
+                and not (name in info.relations and info.relations[name].to_many)
+            }
+        )
+
+    def store_files(self, validated_data, files):
+        """
+        Store `files` and return their stored names together with extra
+        model values from `get_stored_file_data`.
+        """
+        if not files:
+            return {}, {}
+        instance = self.get_upload_instance(validated_data)
+
+        def store(name):
+            field = self.Meta.model._meta.get_field(name)
+            file = files[name]
+            filename = field.generate_filename(instance, file.name)
+            stored_name = field.storage.save(
+                filename, file, max_length=field.max_length
+            )
+            return stored_name, self.get_stored_file_data(field, file, stored_name)
+
+        stored, extra = {}, {}
+        # один файл немає сенсу передавати в інший потік
+        if len(files) == 1 or settings.FILE_UPLOAD_WORKERS == 0:
+            for name in files:
+                try:
+                    stored[name], data = store(name)
+                except Exception:
+                    self.delete_stored(stored)
+                    raise
+                extra.update(data)
+            return stored, extra
+
+        futures = {name: get_executor().submit(store, name) for name in files}
+        error = None
+        for name, future in futures.items():
+            try:
+                stored[name], data = future.result()
+            except Exception as exc:
+                # решта завантажень доробляється, щоб їх можна було прибрати
+                error = error or exc
+            else:
+                extra.update(data)
+        if error:
+            self.delete_stored(stored)
+            raise error
+        return stored, extra
+
+    def get_stored_file_data(self, field, file, name):
+        """
+        Model values derived from an uploaded file: `<field>_metadata` of
+        image fields, computed from the upload still at hand, so reading it
+        never needs the stored object.
+        """
+        metadata_field = get_metadata_field_name(field.name)
+        try:
+            self.Meta.model._meta.get_field(metadata_field)
+        except FieldDoesNotExist:
+            return {}
+
+        try:
+            metadata = build_image_metadata(get_image_source(file), name, file.size)
+        except Exception:
+            # метадані дорахує фонова обробка (process_variants)
+            logger.warning("Failed to read metadata of %s", name, exc_info=True)
+            return {}
+        finally:
+            file.seek(0)
+        return {metadata_field: metadata}
+
+    def delete_stored(self, stored):
+        for name, stored_name in stored.items():
+            storage = self.Meta.model._meta.get_field(name).storage
+            # content-addressed об'єкт міг уже належати іншому рядку, його
+            # прибирає collect_orphaned_media
+            if is_content_addressed(stored_name):
+                continue
+            # файли не належать жодному рядку, тож коміту не чекаємо
+            submit_deletes(storage, [stored_name])
@@ -0,0 +1,25 @@
+from django.core.cache import cache
+from django.db import transaction
+
+LISTING_VERSION_KEY = "listing:version"
+
+
+def get_listing_version():
+    version = cache.get(LISTING_VERSION_KEY)
+    if version is None:
+        cache.add(LISTING_VERSION_KEY, 1, timeout=None)
+        version = cache.get(LISTING_VERSION_KEY, 1)
+    return version
+
+
+def _bump_listing_version():
+    try:
+        cache.incr(LISTING_VERSION_KEY)
+    except ValueError:
+        cache.add(LISTING_VERSION_KEY, 1, timeout=None)
+
+
+def bump_listing_version():
+    # після коміту, щоб паралельний запит не закешував старі дані
+    # під новою версією
+    transaction.on_commit(_bump_listing_version, robust=True)
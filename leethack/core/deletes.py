@@ -0,0 +1,149 @@
+import logging
+import time
+import weakref
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections, transaction
+
+from leethack.core.storage import delete_files, is_content_addressed
+
+logger = logging.getLogger(__name__)
+
+DELETE_ATTEMPTS = 3
+# секунди до першого повтору, далі подвоюється
+RETRY_DELAY = 1
+
+_executor = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.STORAGE_DELETE_WORKERS,
+            thread_name_prefix="storage-deletes",
+        )
+    return _executor
+
+
+class PendingDeletes:
+    """
+    Files to delete once the transaction commits, grouped by storage.
+
+    Registered with `on_commit` once per transaction, so a cascade over
+    hundreds of rows ends in a few bulk requests instead of a synchronous
+    request per file.
+    """
+
+    def __init__(self):
+        # storage -> [(names, marker)]
+        self.groups = defaultdict(list)
+        self.submitted = False
+
+    def add(self, storage, names, marker):
+        self.groups[storage].append((list(names), marker))
+
+    def __call__(self):
+        self.submitted = True
+        for storage, groups in self.groups.items():
+            # маркер мертвий, якщо savepoint, у якому додали файли, відкотили
+            names = [
+                name
+                for names, marker in groups
+                if marker() is not None
+                for name in names
+            ]
+            if names:
+                submit_deletes(storage, names)
+
+
+# з'єднання -> PendingDeletes, поки його колбек чекає на коміт; запис
+# зникає разом з колбеком, якщо django його відкине
+_pending = weakref.WeakValueDictionary()
+
+
+def get_pending_deletes(connection):
+    pending = _pending.get(connection)
+    if pending is None or pending.submitted:
+        pending = PendingDeletes()
+        transaction.on_commit(pending, using=connection.alias, robust=True)
+        _pending[connection] = pending
+    return pending
+
+
+def add_pending_deletes(connection, storage, names):
+    """
+    Add `names` to the connection's batch, valid only if the current
+    savepoint commits.
+
+    Each call registers its own no-op `on_commit` marker, referenced
+    elsewhere only weakly. On a savepoint rollback Django discards the
+    marker with the rest of that savepoint's callbacks, and the batch
+    skips the names.
+    """
+
+    def marker():
+        pass
+
+    # batch реєструється раніше за маркер і читає його, поки той ще в черзі
+    pending = get_pending_deletes(connection)
+    transaction.on_commit(marker, using=connection.alias)
+    pending.add(storage, names, weakref.ref(marker))
+
+
+def delete_on_commit(storage, names, source=None, using=None):
+    """
+    Delete `names` from `storage` in the background after the current
+    transaction commits.
+
+    Nothing is deleted if `source` is content-addressed: the object and its
+    variants may be shared with rows saved concurrently, which no reference
+    check can see before they commit. Such files are left to
+    collect_orphaned_media, whose grace period covers them.
+    """
+    if is_content_addressed(source):
+        return
+    names = [name for name in names if name]
+    if not names:
+        return
+
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        submit_deletes(storage, names)
+        return
+    add_pending_deletes(connection, storage, names)
+
+
+def submit_deletes(storage, names):
+    if settings.STORAGE_DELETE_WORKERS == 0:
+        delete_with_retries(storage, names)
+        return
+    get_executor().submit(_delete_in_worker, storage, names)
+
+
+def _delete_in_worker(storage, names):
+    try:
+        delete_with_retries(storage, names)
+    except Exception:
+        logger.exception("Failed to delete files from storage")
+    finally:
+        # у потоці пулу з'єднання з БД не закриваються самі
+        connections.close_all()
+
+
+def delete_with_retries(storage, names):
+    for attempt in range(DELETE_ATTEMPTS):
+        if attempt:
+            time.sleep(RETRY_DELAY * 2 ** (attempt - 1))
+        try:
+            names = delete_files(storage, names)
+        except Exception:
+            # мережева помилка: повторюється вся партія, видалення
+            # відсутнього об'єкта не є помилкою
+            logger.warning("Storage delete failed, attempt %d", attempt + 1)
+        if not names:
+            return
+    # решту прибере collect_orphaned_media
+    logger.error("Failed to delete %d files, e.g. %s", len(names), names[:10])
@@ -0,0 +1,160 @@
+import multiprocessing
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+# скільки батьківський процес чекає понад таймаут задачі, поки воркер
+# сам перерве її сигналом; далі процеси пулу вбиваються
+TIMEOUT_GRACE = 5
+DEFAULT_QUEUE_TIMEOUT = object()
+
+
+class ImagePoolBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = _("Image processing is busy, try again later.")
+    default_code = "image_pool_busy"
+
+
+class ImageJobTimeout(Exception):
+    pass
+
+
+def _raise_timeout(signum, frame):
+    raise ImageJobTimeout()
+
+
+def _run_with_timeout(timeout, func, args):
+    # виконується у процесі пулу: задача переривається сама, тож воркер
+    # не зависає і не потребує перезапуску пулу
+    previous = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return func(*args)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+class ImagePool:
+    """
+    Process pool for CPU-bound Pillow work.
+
+    Pillow and numpy hold the GIL for a good part of decoding, resizing and
+    encoding, so running them on a request thread stalls every other request
+    of the worker. Jobs here run in separate processes instead. At most
+    `max_pending` jobs are running or queued; a caller that can't get a slot
+    within `queue_timeout` gets `ImagePoolBusy`. Each job is interrupted
+    after `timeout` seconds with `ImageJobTimeout`. A job stuck in C code,
+    which the signal can't interrupt, gets its pool's processes killed
+    `TIMEOUT_GRACE` seconds later; jobs running next to it fail with
+    `BrokenProcessPool`.
+    """
+
+    def __init__(self, workers, max_pending):
+        self.workers = workers
+        self.slots = threading.BoundedSemaphore(max_pending)
+        self.lock = threading.Lock()
+        self.executor = None
+
+    def get_executor(self):
+        with self.lock:
+            if self.executor is None:
+                # forkserver не успадковує потоки та з'єднання gunicorn воркера
+                self.executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("forkserver"),
+                )
+            return self.executor
+
+    def reset(self, executor):
+        with self.lock:
+            if self.executor is executor:
+                self.executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def kill(self, executor):
+        # список процесів береться до shutdown, який його очищає
+        processes = list((executor._processes or {}).values())
+        self.reset(executor)
+        for process in processes:
+            process.kill()
+
+    def run(self, func, *args, timeout, queue_timeout):
+        if not self.slots.acquire(timeout=queue_timeout):
+            raise ImagePoolBusy()
+
+        released = threading.Lock()
+
+        def release(_=None):
+            # слот звільняється один раз: по завершенню задачі або по таймауту
+            if released.acquire(blocking=False):
+                self.slots.release()
+
+        executor = self.get_executor()
+        try:
+            future = executor.submit(_run_with_timeout, timeout, func, args)
+        except BaseException:
+            release()
+            raise
+        future.add_done_callback(release)
+
+        try:
+            return future.result(timeout=timeout + TIMEOUT_GRACE)
+        except FutureTimeoutError:
+            # SIGALRM обробляється лише між інструкціями Python, тож задача
+            # в C коді (декодер, zlib) тримала б воркер і слот далі
+            self.kill(executor)
+            release()
+            raise ImageJobTimeout()
+        except BrokenProcessPool:
+            # воркер вбили (наприклад, OOM), наступна задача створить новий пул
+            self.reset(executor)
+            raise
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_image_pool(background=False):
+    # фонові задачі (генерація варіантів) мають окремий пул, щоб перевірка
+    # завантаження в запиті не стояла в черзі за перекодуванням на секунди
+    with _pools_lock:
+        if background not in _pools:
+            _pools[background] = ImagePool(
+                settings.IMAGE_POOL_WORKERS, settings.IMAGE_POOL_MAX_PENDING
+            )
+        return _pools[background]
+
+
+def run_in_image_pool(
+    func,
+    *args,
+    timeout=None,
+    queue_timeout=DEFAULT_QUEUE_TIMEOUT,
+    background=False,
+):
+    """
+    Run `func(*args)` in the image process pool and wait for the result.
+
+    `func` and its arguments must be picklable. With `IMAGE_POOL_WORKERS = 0`
+    the call runs inline. Background jobs run in a separate pool and wait
+    for a free slot without a limit unless `queue_timeout` is given.
+    """
+    if timeout is None:
+        timeout = settings.IMAGE_POOL_JOB_TIMEOUT
+    if queue_timeout is DEFAULT_QUEUE_TIMEOUT:
+        queue_timeout = None if background else settings.IMAGE_POOL_QUEUE_TIMEOUT
+
+    if settings.IMAGE_POOL_WORKERS == 0:
+        return func(*args)
+    return get_image_pool(background).run(
+        func, *args, timeout=timeout, queue_timeout=queue_timeout
+    )
@@ -0,0 +1,348 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from io import BytesIO
+
+import numpy as np
+from PIL import ExifTags, Image, ImageOps, features
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connections, transaction
+from django.utils import timezone
+
+from leethack.core.cache import bump_listing_version
+from leethack.core.deletes import delete_on_commit
+from leethack.core.imagepool import run_in_image_pool
+from leethack.core.placeholders import encode_blurhash, get_dominant_color
+from leethack.core.ssim import ssim
+from leethack.core.storage import delete_files, is_content_addressed
+
+logger = logging.getLogger(__name__)
+
+VARIANT_NAMES = ("thumbnail", "card", "full")
+# довша сторона зображення, з якого рахується placeholder
+PLACEHOLDER_SIZE = 32
+METADATA_TIMEOUT = 10
+
+
+@dataclass(frozen=True)
+class OutputFormat:
+    name: str
+    pil_format: str
+    extension: str
+    # межі пошуку якості, верхня використовується, якщо поріг не досягнуто
+    quality_range: tuple[int, int]
+    options: dict = field(default_factory=dict)
+
+    def is_supported(self):
+        if self.name == "jpeg":
+            return True
+        if self.name == "webp":
+            return features.check("webp")
+        Image.init()
+        return self.pil_format in Image.SAVE
+
+
+# у порядку переваги; JPEG завжди генерується як запасний формат
+OUTPUT_FORMATS = (
+    OutputFormat("avif", "AVIF", "avif", (30, 85), {"speed": 6}),
+    OutputFormat("webp", "WEBP", "webp", (40, 90), {"method": 4}),
+    OutputFormat(
+        "jpeg", "JPEG", "jpg", (50, 90), {"optimize": True, "progressive": True}
+    ),
+)
+
+_executor = None
+
+
+def get_variants_field_name(field_name):
+    return f"{field_name}_variants"
+
+
+def get_metadata_field_name(field_name):
+    return f"{field_name}_metadata"
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.IMAGE_PROCESSING_WORKERS,
+            thread_name_prefix="image-variants",
+        )
+    return _executor
+
+
+def needs_variants(instance, field_name):
+    fieldfile = getattr(instance, field_name)
+    if not fieldfile.name:
+        return False
+    # дефолтні картинки спільні для всіх користувачів, їх не обробляємо
+    if fieldfile.name == fieldfile.field.default:
+        return False
+    variants = getattr(instance, get_variants_field_name(field_name)) or {}
+    return variants.get("source") != fieldfile.name
+
+
+def needs_metadata(instance, field_name):
+    fieldfile = getattr(instance, field_name)
+    if not fieldfile.name or fieldfile.name == fieldfile.field.default:
+        return False
+    metadata = getattr(instance, get_metadata_field_name(field_name)) or {}
+    return metadata.get("source") != fieldfile.name
+
+
+def schedule_variants(instance, field_name, config):
+    """
+    Generate variants and metadata of an image field after the current
+    transaction commits.
+    """
+    if not (
+        needs_variants(instance, field_name) or needs_metadata(instance, field_name)
+    ):
+        return
+
+    args = (instance._meta.label, instance.pk, field_name, config["variants"])
+    transaction.on_commit(lambda: submit_variants(*args), robust=True)
+
+
+def submit_variants(*args):
+    if settings.IMAGE_PROCESSING_WORKERS == 0:
+        process_variants(*args)
+        return
+    get_executor().submit(_process_variants_in_worker, *args)
+
+
+def _process_variants_in_worker(*args):
+    try:
+        process_variants(*args)
+    except Exception:
+        logger.exception("Failed to generate image variants for %s", args[:3])
+    finally:
+        # у потоці пулу з'єднання з БД не закриваються самі
+        connections.close_all()
+
+
+def fit_size(size, source_size):
+    # не збільшуємо зображення, менше за варіант
+    scale = min(1, source_size[0] / size[0], source_size[1] / size[1])
+    return max(1, round(size[0] * scale)), max(1, round(size[1] * scale))
+
+
+def open_source(data, max_size):
+    image = Image.open(BytesIO(data))
+    # JPEG декодується одразу зі зменшенням, якщо варіанти менші
+    image.draft("RGB", max_size)
+    image = ImageOps.exif_transpose(image)
+    return image.convert("RGB")
+
+
+def read_image_metadata(source):
+    """
+    Dimensions, format, dominant colour and BlurHash placeholder of an image.
+
+    Runs in the image process pool. `source` is a path or the file content.
+    JPEGs are decoded straight at a reduced scale, so even a large upload
+    costs a few milliseconds.
+    """
+    if isinstance(source, bytes):
+        source = BytesIO(source)
+    with Image.open(source) as image:
+        image_format = image.format
+        width, height = image.size
+        # EXIF-поворот міняє сторони місцями, як і у варіантів
+        if image.getexif().get(ExifTags.Base.Orientation, 1) in (5, 6, 7, 8):
+            width, height = height, width
+        image.draft("RGB", (PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+        small = ImageOps.exif_transpose(image).convert("RGB")
+    small.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+    return {
+        "width": width,
+        "height": height,
+        "format": image_format.lower(),
+        "color": get_dominant_color(small),
+        "placeholder": encode_blurhash(np.asarray(small)),
+    }
+
+
+def build_image_metadata(source, name, size, background=False):
+    """Metadata of stored image `name` as saved in `<field>_metadata`."""
+    metadata = run_in_image_pool(
+        read_image_metadata, source, timeout=METADATA_TIMEOUT, background=background
+    )
+    return {"source": name, "size": size, **metadata}
+
+
+def generate_metadata(fieldfile):
+    with fieldfile.open("rb") as file:
+        data = file.read()
+    return build_image_metadata(data, fieldfile.name, len(data), background=True)
+
+
+def get_output_formats():
+    return [output for output in OUTPUT_FORMATS if output.is_supported()]
+
+
+def encode(image, output, quality):
+    buffer = BytesIO()
+    image.save(buffer, output.pil_format, quality=quality, **output.options)
+    return buffer.getvalue()
+
+
+def encode_with_target(image, output, threshold):
+    """
+    Encode `image` with the lowest quality whose SSIM reaches `threshold`.
+
+    Binary search over `output.quality_range`, so each format costs about
+    log2(range) encodes instead of one per quality step.
+    """
+    low, high = output.quality_range
+    best = None
+    while low <= high:
+        quality = (low + high) // 2
+        data = encode(image, output, quality)
+        with Image.open(BytesIO(data)) as decoded:
+            score = ssim(image, decoded)
+        if score >= threshold:
+            best = data
+            high = quality - 1
+        else:
+            low = quality + 1
+    return best or encode(image, output, output.quality_range[1])
+
+
+def render_variant(image, size):
+    return ImageOps.fit(image, fit_size(size, image.size), Image.Resampling.LANCZOS)
+
+
+def transcode_image(data, sizes, outputs, threshold):
+    """
+    Resize, crop and encode image `data` into every size from `sizes`.
+
+    Runs in the image process pool and returns `{variant: {format: bytes}}`.
+    """
+    max_size = tuple(map(max, zip(*sizes.values())))
+    image = open_source(data, max_size)
+
+    encoded = {}
+    for name, size in sizes.items():
+        variant = render_variant(image, size)
+        encoded[name] = {
+            output.name: encode_with_target(variant, output, threshold)
+            for output in outputs
+        }
+    return encoded
+
+
+def generate_variants(fieldfile, sizes):
+    """
+    Resize, crop and transcode `fieldfile` into every size from `sizes`.
+
+    Every variant is stored in each supported output format next to the
+    original and described as `{"source": name, variant: {format: name}}`.
+    """
+    outputs = get_output_formats()
+    extensions = {output.name: output.extension for output in outputs}
+    stem = os.path.splitext(fieldfile.name)[0]
+    storage = fieldfile.storage
+
+    # імена варіантів content-addressed оригіналу похідні від його вмісту:
+    # якщо їх уже згенеровано для іншого рядка, перекодування не потрібне
+    if is_content_addressed(fieldfile.name):
+        names = {
+            name: {
+                output: f"{stem}_{name}.{extension}"
+                for output, extension in extensions.items()
+            }
+            for name in sizes
+        }
+        paths = [path for formats in names.values() for path in formats.values()]
+        if all(storage.exists(path) for path in paths):
+            return {"source": fieldfile.name, **names}
+
+    with fieldfile.open("rb") as file:
+        data = file.read()
+
+    encoded = run_in_image_pool(
+        transcode_image,
+        data,
+        sizes,
+        outputs,
+        settings.IMAGE_VARIANT_SSIM_THRESHOLD,
+        background=True,
+    )
+
+    variants = {"source": fieldfile.name}
+    for name, formats in encoded.items():
+        variants[name] = {
+            output: storage.save(
+                f"{stem}_{name}.{extensions[output]}", ContentFile(content)
+            )
+            for output, content in formats.items()
+        }
+    return variants
+
+
+def get_variant_paths(variants):
+    return [
+        path
+        for name, formats in (variants or {}).items()
+        if name != "source"
+        for path in formats.values()
+    ]
+
+
+def delete_variants(storage, variants):
+    variants = variants or {}
+    # варіанти content-addressed оригіналу названі за його вмістом, тож
+    # спільні для всіх рядків, які на нього посилаються; їх прибирає
+    # collect_orphaned_media
+    if is_content_addressed(variants.get("source")):
+        return
+    delete_files(storage, get_variant_paths(variants))
+
+
+def delete_image_on_commit(fieldfile, variants):
+    """Delete an image and its variants after the row deletion commits."""
+    storage = fieldfile.storage
+    variants = variants or {}
+    delete_on_commit(storage, get_variant_paths(variants), variants.get("source"))
+    # дефолтні картинки спільні для всіх користувачів
+    if fieldfile.name != fieldfile.field.default:
+        delete_on_commit(storage, [fieldfile.name], fieldfile.name)
+
+
+def process_variants(model_label, pk, field_name, sizes):
+    model = apps.get_model(model_label)
+    instance = model._default_manager.filter(pk=pk).first()
+    if instance is None:
+        return
+
+    fieldfile = getattr(instance, field_name)
+    variants_field = get_variants_field_name(field_name)
+    updates = {}
+    # метадані зазвичай збережені ще при завантаженні, тут - для файлів,
+    # які потрапили в поле іншим шляхом (пряме завантаження, адмінка)
+    if needs_metadata(instance, field_name):
+        updates[get_metadata_field_name(field_name)] = generate_metadata(fieldfile)
+    variants = None
+    if needs_variants(instance, field_name):
+        variants = updates[variants_field] = generate_variants(fieldfile, sizes)
+    if not updates:
+        return
+
+    if hasattr(instance, "updated_at"):
+        updates["updated_at"] = timezone.now()
+    # поки генерувались варіанти, картинку могли замінити
+    updated = model._default_manager.filter(
+        pk=pk, **{field_name: fieldfile.name}
+    ).update(**updates)
+
+    if updated:
+        if variants is not None:
+            delete_variants(fieldfile.storage, getattr(instance, variants_field))
+        bump_listing_version()
+    elif variants is not None:
+        delete_variants(fieldfile.storage, variants)
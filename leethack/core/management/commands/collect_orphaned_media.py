@@ -0,0 +1,84 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+
+from leethack.core.orphans import DELETE_BATCH_SIZE, collect_orphans
+
+
+class Command(BaseCommand):
+    help = "Delete stored media files that no row references anymore."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--prefix",
+            action="append",
+            dest="prefixes",
+            help="Prefix to scan, can be repeated. Defaults to "
+            "ORPHANED_MEDIA_PREFIXES.",
+        )
+        parser.add_argument(
+            "--grace-period",
+            type=int,
+            default=settings.ORPHANED_MEDIA_GRACE_PERIOD,
+            help="Keep orphans modified less than this many seconds ago.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DELETE_BATCH_SIZE,
+            help="Orphans checked and deleted per request (at most 1000).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report what would be deleted.",
+        )
+
+    def handle(self, *args, prefixes, grace_period, batch_size, dry_run, **options):
+        if not 0 < batch_size <= DELETE_BATCH_SIZE:
+            raise CommandError(f"--batch-size must be in 1..{DELETE_BATCH_SIZE}.")
+        self.verbosity = options["verbosity"]
+
+        totals = {}
+        for prefix in prefixes or settings.ORPHANED_MEDIA_PREFIXES:
+            self.stdout.write(f"Scanning {prefix}")
+            stats = collect_orphans(
+                default_storage,
+                prefix,
+                timedelta(seconds=grace_period),
+                dry_run=dry_run,
+                batch_size=batch_size,
+                progress=self.report_progress,
+            )
+            self.report(prefix, stats, dry_run)
+            for key, value in vars(stats).items():
+                totals[key] = totals.get(key, 0) + value
+
+        if dry_run:
+            self.stdout.write(
+                f"Dry run: {totals.get('orphaned', 0)} orphaned files would be deleted."
+            )
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Deleted {totals.get('deleted', 0)} orphaned files."
+                )
+            )
+
+    def report_progress(self, stats):
+        if self.verbosity >= 2:
+            self.stdout.write(
+                f"  listed {stats.listed}, orphaned {stats.orphaned}, "
+                f"deleted {stats.deleted}"
+            )
+
+    def report(self, prefix, stats, dry_run):
+        action = "would delete" if dry_run else "deleted"
+        self.stdout.write(
+            f"  {stats.listed} listed, {stats.referenced} referenced, "
+            f"{stats.recent} within grace period, {stats.orphaned} orphaned "
+            f"({stats.orphaned_bytes / 1024 / 1024:.1f} MB), "
+            f"{action} {stats.orphaned if dry_run else stats.deleted}"
+        )
@@ -0,0 +1,174 @@
+import logging
+import os
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone as dt_timezone
+
+from django.core.files.storage import FileSystemStorage
+from django.db.models import Q
+from django.utils import timezone
+
+from leethack.core.images import VARIANT_NAMES
+from leethack.core.storage import DELETE_BATCH_SIZE, delete_files, get_file_fields
+
+logger = logging.getLogger(__name__)
+
+# як часто викликати progress, у переглянутих ключах
+PROGRESS_EVERY = 10_000
+VARIANT_SUFFIX_RE = re.compile(rf"_(?:{'|'.join(VARIANT_NAMES)})$")
+
+
+@dataclass(frozen=True)
+class StoredFile:
+    name: str
+    modified: datetime
+    size: int
+
+
+@dataclass
+class CollectStats:
+    listed: int = 0
+    referenced: int = 0
+    recent: int = 0
+    orphaned: int = 0
+    orphaned_bytes: int = 0
+    deleted: int = 0
+
+
+def get_stem(name):
+    """Source name without extension; variants map to the stem of their source."""
+    stem = os.path.splitext(name)[0]
+    return VARIANT_SUFFIX_RE.sub("", stem)
+
+
+def iter_stored_files(storage, prefix):
+    """Stream files under `prefix` without loading the whole listing."""
+    if isinstance(storage, FileSystemStorage):
+        yield from _iter_local_files(storage, prefix)
+        return
+
+    # boto3 тягне список сторінками по 1000 ключів
+    location = storage.location.strip("/")
+    key_prefix = storage._normalize_name(prefix).rstrip("/") + "/"
+    for summary in storage.bucket.objects.filter(Prefix=key_prefix):
+        name = summary.key[len(location) + 1 :] if location else summary.key
+        yield StoredFile(name, summary.last_modified, summary.size)
+
+
+def _iter_local_files(storage, prefix):
+    root = storage.path(prefix)
+    if not os.path.isdir(root):
+        return
+    directories = [root]
+    while directories:
+        with os.scandir(directories.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    directories.append(entry.path)
+                    continue
+                stat = entry.stat()
+                name = os.path.relpath(entry.path, storage.location)
+                yield StoredFile(
+                    name.replace(os.sep, "/"),
+                    datetime.fromtimestamp(stat.st_mtime, tz=dt_timezone.utc),
+                    stat.st_size,
+                )
+
+
+def get_referenced_stems(prefix):
+    """
+    Stems of every file under `prefix` that a row points to.
+
+    One streamed query per file field. Only stems are kept (a single entry
+    covers the original and all its variants), so memory grows with the
+    number of referencing rows, not with the number of stored objects.
+    """
+    stems = set()
+    for model, field in get_file_fields():
+        # дефолтні картинки лежать серед завантажених, але не видаляються
+        if isinstance(field.default, str) and field.default.startswith(prefix):
+            stems.add(get_stem(field.default))
+    names = _iter_referenced_names(lambda name: Q(**{f"{name}__startswith": prefix}))
+    stems.update(get_stem(name) for name in names)
+    return stems
+
+
+def filter_referenced_stems(stems):
+    """Which of `stems` rows point to right now, one query per file field."""
+
+    def lookup(name):
+        query = Q()
+        for stem in stems:
+            query |= Q(**{f"{name}__startswith": stem})
+        return query
+
+    # префікс ловить і довші імена (abc -> abcd.png), тож stem звіряється ще раз
+    names = _iter_referenced_names(lookup) if stems else ()
+    return {stem for stem in map(get_stem, names) if stem in stems}
+
+
+def _iter_referenced_names(lookup):
+    for model, field in get_file_fields():
+        yield from (
+            model._default_manager.filter(lookup(field.name))
+            .values_list(field.name, flat=True)
+            .iterator(chunk_size=5000)
+        )
+
+
+def collect_orphans(
+    storage,
+    prefix,
+    grace_period,
+    dry_run=False,
+    batch_size=DELETE_BATCH_SIZE,
+    progress=None,
+):
+    """
+    Delete files under `prefix` that no row references and that are older
+    than `grace_period`.
+
+    The listing is streamed and orphans are deleted in batches, so memory
+    doesn't depend on the number of stored objects. The grace period covers
+    uploads that are not attached yet (direct uploads, variants being
+    generated). Right before a batch is deleted, its stems are checked
+    against the database again: a content-addressed object can get a new
+    reference after the referenced set was loaded, and that keeps its
+    variants too.
+    """
+    prefix = prefix.rstrip("/") + "/"
+    stats = CollectStats()
+    stems = get_referenced_stems(prefix)
+    cutoff = timezone.now() - grace_period
+    batch = []
+
+    def flush():
+        # варіант лишається, якщо на його оригінал послались, навіть коли
+        # сам оригінал у цю партію не потрапив
+        stems.update(filter_referenced_stems({get_stem(file.name) for file in batch}))
+        orphans = [file for file in batch if get_stem(file.name) not in stems]
+        stats.referenced += len(batch) - len(orphans)
+        stats.orphaned += len(orphans)
+        stats.orphaned_bytes += sum(file.size for file in orphans)
+        if not dry_run and orphans:
+            failed = delete_files(storage, [file.name for file in orphans])
+            stats.deleted += len(orphans) - len(failed)
+        batch.clear()
+
+    for file in iter_stored_files(storage, prefix):
+        stats.listed += 1
+        if get_stem(file.name) in stems:
+            stats.referenced += 1
+        elif file.modified > cutoff:
+            stats.recent += 1
+        else:
+            batch.append(file)
+            if len(batch) >= batch_size:
+                flush()
+        if progress and stats.listed % PROGRESS_EVERY == 0:
+            progress(stats)
+    if batch:
+        flush()
+
+    logger.info("Orphaned media under %s: %s", prefix, stats)
+    return stats
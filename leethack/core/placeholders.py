@@ -0,0 +1,79 @@
+import math
+
+import numpy as np
+
+BASE83 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~"
+
+
+def encode_base83(value, length):
+    return "".join(BASE83[value // 83 ** (length - i - 1) % 83] for i in range(length))
+
+
+def srgb_to_linear(values):
+    values = values / 255
+    return np.where(
+        values <= 0.04045, values / 12.92, ((values + 0.055) / 1.055) ** 2.4
+    )
+
+
+def linear_to_srgb(value):
+    value = min(max(value, 0), 1)
+    if value <= 0.0031308:
+        return int(value * 12.92 * 255 + 0.5)
+    return int((1.055 * value ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+
+def encode_blurhash(pixels, x_components=4, y_components=3):
+    """
+    BlurHash of an RGB image given as a `(height, width, 3)` uint8 array.
+
+    The image is described by `x_components * y_components` cosine
+    components and packed into a short base83 string that clients decode
+    into a blurred placeholder. A thumbnail of a few dozen pixels gives the
+    nearly the same result as the full image, so callers downscale first.
+    """
+    height, width = pixels.shape[:2]
+    linear = srgb_to_linear(pixels[..., :3].astype(np.float64))
+
+    # косинусні базиси всіх компонент рахуються одним множенням матриць
+    basis_x = np.cos(
+        np.pi * np.outer(np.arange(x_components), np.arange(width)) / width
+    )
+    basis_y = np.cos(
+        np.pi * np.outer(np.arange(y_components), np.arange(height)) / height
+    )
+    factors = np.einsum("jy,ix,yxc->jic", basis_y, basis_x, linear) / (width * height)
+    factors[1:] *= 2
+    factors[0, 1:] *= 2
+    factors = factors.reshape(-1, 3)
+
+    dc, ac = factors[0], factors[1:]
+    size_flag = (x_components - 1) + (y_components - 1) * 9
+    result = encode_base83(size_flag, 1)
+
+    if len(ac):
+        actual_max = float(np.abs(ac).max())
+        quantised_max = max(0, min(82, math.floor(actual_max * 166 - 0.5)))
+        max_value = (quantised_max + 1) / 166
+    else:
+        quantised_max, max_value = 0, 1
+    result += encode_base83(quantised_max, 1)
+
+    r, g, b = (linear_to_srgb(value) for value in dc)
+    result += encode_base83((r << 16) + (g << 8) + b, 4)
+
+    # AC: знаковий корінь, квантований у 19 рівнів на канал
+    quantised = np.clip(
+        np.floor(np.sign(ac) * np.sqrt(np.abs(ac / max_value)) * 9 + 9.5), 0, 18
+    ).astype(int)
+    for r, g, b in quantised:
+        result += encode_base83(r * 19 * 19 + g * 19 + b, 2)
+    return result
+
+
+def get_dominant_color(image, colors=8):
+    """Most common colour of a small RGB image as `#rrggbb`."""
+    quantized = image.quantize(colors)
+    count, index = max(quantized.getcolors())
+    palette = quantized.getpalette()[index * 3 : index * 3 + 3]
+    return "#{:02x}{:02x}{:02x}".format(*palette)
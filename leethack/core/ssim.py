@@ -0,0 +1,41 @@
+import numpy as np
+
+# константи стабілізації з оригінальної статті (Wang et al., 2004)
+C1 = (0.01 * 255) ** 2
+C2 = (0.03 * 255) ** 2
+
+
+def _box_mean(values, size):
+    # середнє у вікні size x size через інтегральне зображення
+    integral = np.pad(values, ((1, 0), (1, 0))).cumsum(0).cumsum(1)
+    total = (
+        integral[size:, size:]
+        - integral[:-size, size:]
+        - integral[size:, :-size]
+        + integral[:-size, :-size]
+    )
+    return total / (size * size)
+
+
+def to_luma(image):
+    return np.asarray(image.convert("L"), dtype=np.float64)
+
+
+def ssim(first, second, window=7):
+    """
+    Mean structural similarity of two PIL images of the same size.
+
+    Computed on luma with a uniform `window` x `window` window, which is
+    enough to rank encoder quality settings against each other.
+    """
+    x, y = to_luma(first), to_luma(second)
+    window = min(window, *x.shape)
+
+    mean_x, mean_y = _box_mean(x, window), _box_mean(y, window)
+    var_x = _box_mean(x * x, window) - mean_x**2
+    var_y = _box_mean(y * y, window) - mean_y**2
+    cov = _box_mean(x * y, window) - mean_x * mean_y
+
+    numerator = (2 * mean_x * mean_y + C1) * (2 * cov + C2)
+    denominator = (mean_x**2 + mean_y**2 + C1) * (var_x + var_y + C2)
+    return float(np.mean(numerator / denominator))
@@ -0,0 +1,241 @@
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.db import models
+from storages.backends.s3 import S3Storage
+from storages.utils import clean_name
+
+# вміст об'єкта за адресою ніколи не змінюється, тож CDN і браузер можуть
+# кешувати його без перевірок
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# sha256 вмісту або похідне від нього ім'я варіанту ("<sha256>_card")
+CONTENT_ADDRESS_RE = re.compile(r"^[0-9a-f]{64}(_[a-z]+)?$")
+# ліміт DeleteObjects в S3 і R2
+DELETE_BATCH_SIZE = 1000
+
+
+class URLCache:
+    """
+    Thread-safe in-process LRU cache of URLs with a fixed lifetime.
+
+    Signed URLs grant access by themselves, so sharing them between users
+    of one process is safe as long as they are handed out well before the
+    signature expires.
+    """
+
+    def __init__(self, timeout, max_size):
+        self.timeout = timeout
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            url, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return url
+
+    def set(self, key, url):
+        with self.lock:
+            self.entries[key] = (url, time.monotonic() + self.timeout)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+
+class CachedURLS3Storage(S3Storage):
+    """
+    S3Storage that reuses presigned URLs instead of signing on every call.
+
+    Every `url()` with querystring auth is a SigV4 HMAC in Python, and a
+    list page asks for the same images and avatars over and over. A signed
+    URL is cached for `url_cache_timeout` seconds (half of
+    `querystring_expire` by default), so a client always gets a URL valid
+    for at least the remaining half. Object names are unique uuids or
+    content hashes, so a cached URL never points to stale content.
+    """
+
+    def __init__(self, **settings):
+        super().__init__(**settings)
+        timeout = self.url_cache_timeout
+        if timeout is None:
+            timeout = self.querystring_expire // 2
+        self.url_cache = URLCache(timeout, self.url_cache_size)
+
+    def get_default_settings(self):
+        return {
+            **super().get_default_settings(),
+            "url_cache_timeout": None,
+            "url_cache_size": 10_000,
+        }
+
+    def url(self, name, parameters=None, expire=None, http_method=None):
+        # кешуються лише підписані URL зі стандартними параметрами
+        if (
+            parameters
+            or expire is not None
+            or http_method is not None
+            or not self.querystring_auth
+            or self.custom_domain
+        ):
+            return super().url(name, parameters, expire, http_method)
+
+        url = self.url_cache.get(name)
+        if url is None:
+            url = super().url(name)
+            self.url_cache.set(name, url)
+        return url
+
+
+def get_content_address(name, content):
+    """Replace the file name in `name` with the sha256 of `content`."""
+    digest = hashlib.sha256()
+    content.seek(0)
+    for chunk in content.chunks():
+        digest.update(chunk)
+    content.seek(0)
+
+    dirname = os.path.dirname(name)
+    extension = os.path.splitext(name)[1].lower()
+    return os.path.join(dirname, f"{digest.hexdigest()}{extension}")
+
+
+def is_content_addressed(name):
+    stem = os.path.splitext(os.path.basename(name or ""))[0]
+    return bool(CONTENT_ADDRESS_RE.match(stem))
+
+
+class ContentAddressedStorageMixin:
+    """
+    Names saved files by the sha256 of their content when
+    `MEDIA_CONTENT_ADDRESSED` is on.
+
+    The directory and extension of the requested name are kept, so
+    `upload_to` still decides the prefix. Names that are already content
+    addressed (such as variants named after their source) are kept as is.
+    If the object already exists, nothing is uploaded: it is `touch`ed and
+    its name is returned. Such objects can be shared by many rows, so they
+    are never deleted with a row; collect_orphaned_media removes them once
+    no row references them and they are older than its grace period.
+    """
+
+    def save(self, name, content, max_length=None):
+        if not settings.MEDIA_CONTENT_ADDRESSED:
+            return super().save(name, content, max_length)
+
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+        if not is_content_addressed(name):
+            name = get_content_address(name, content)
+        # рядок з цим ім'ям ще не закомічений: свіжий час зміни тримає
+        # об'єкт у пільговому періоді збирача сиріт
+        if self.exists(name) and self.touch(name):
+            return name
+        return super().save(name, content, max_length)
+
+    def touch(self, name):
+        """Set the modified time of stored `name` to now; False if it's gone."""
+        raise NotImplementedError
+
+
+class ContentAddressedFileSystemStorage(
+    ContentAddressedStorageMixin, FileSystemStorage
+):
+    def touch(self, name):
+        try:
+            os.utime(self.path(name))
+        except FileNotFoundError:
+            return False
+        return True
+
+
+class MediaS3Storage(ContentAddressedStorageMixin, CachedURLS3Storage):
+    """Media storage: cached signed URLs, content addressing, immutable objects."""
+
+    def get_object_parameters(self, name):
+        params = super().get_object_parameters(name)
+        # і uuid, і content-addressed імена ніколи не перезаписуються
+        params.setdefault("CacheControl", IMMUTABLE_CACHE_CONTROL)
+        return params
+
+    def touch(self, name):
+        from botocore.exceptions import ClientError
+
+        key = self._normalize_name(clean_name(name))
+        # копія об'єкта в себе оновлює LastModified без повторного завантаження
+        try:
+            self.bucket.Object(key).copy_from(
+                CopySource={"Bucket": self.bucket_name, "Key": key},
+                MetadataDirective="REPLACE",
+                **self._get_write_parameters(name),
+            )
+        except ClientError as err:
+            if err.response["Error"]["Code"] in ("NoSuchKey", "404"):
+                return False
+            raise
+        return True
+
+    def delete_many(self, names):
+        """Delete up to 1000 objects in one request, return names that failed."""
+        keys = {self._normalize_name(clean_name(name)): name for name in names}
+        response = self.bucket.delete_objects(
+            Delete={"Objects": [{"Key": key} for key in keys], "Quiet": True}
+        )
+        return [keys[error["Key"]] for error in response.get("Errors", [])]
+
+
+def get_url_prefix(storage):
+    """
+    Prefix such that `storage.url(name)` is the prefix followed by the
+    percent-encoded name, or None if URLs are signed per object.
+    """
+    prefix = storage.url("url-prefix").removesuffix("url-prefix")
+    # перевірка, що ім'я кодується як filepath_to_uri і нічого не додається
+    if storage.url("a b/c~'.jpg") != f"{prefix}a%20b/c~'.jpg":
+        return None
+    return prefix
+
+
+def get_file_fields():
+    for model in apps.get_models():
+        for field in model._meta.concrete_fields:
+            if isinstance(field, models.FileField):
+                yield model, field
+
+
+def delete_files(storage, names):
+    """
+    Delete stored files, in bulk requests when the storage supports them.
+
+    Returns the names that couldn't be deleted.
+    """
+    names = list(names)
+    if hasattr(storage, "delete_many"):
+        failed = []
+        for start in range(0, len(names), DELETE_BATCH_SIZE):
+            failed += storage.delete_many(names[start : start + DELETE_BATCH_SIZE])
+        return failed
+
+    failed = []
+    for name in names:
+        try:
+            storage.delete(name)
+        except OSError:
+            failed.append(name)
+    return failed
@@ -0,0 +1,99 @@
+import datetime
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from leethack.core.api.compiler import compile_serializer
+from leethack.hackathons.api.v1.serializers import HackathonListSerializer
+from leethack.hackathons.models import Hackathon
+from leethack.participations.api.v1.serializers import (
+    HackathonParticipantListSerializer,
+    HackathonParticipationRequestListSerializer,
+)
+from leethack.participations.models import Participant, ParticipationRequest
+from leethack.users.api.v1.serializers import (
+    MyParticipationListSerializer,
+    MyParticipationRequestListSerializer,
+)
+
+
+@pytest.fixture
+def context():
+    return {"request": Request(APIRequestFactory().get("/"))}
+
+
+def assert_same_output(serializer_class, queryset, context):
+    compiled = compile_serializer(serializer_class, queryset.model)
+    assert compiled is not None
+
+    queryset = queryset.order_by("id")
+    expected = serializer_class(queryset, many=True, context=context).data
+    rows = compiled.get_rows(queryset)
+    assert compiled.render_rows(rows, context) == expected
+
+
+@pytest.mark.django_db
+class TestCompiledSerializer:
+
+    def test_hackathon_list(self, hackathon_factory, participant_factory, context):
+        past = timezone.now() - datetime.timedelta(days=10)
+        finished = hackathon_factory(
+            start_datetime=past, end_datetime=past + datetime.timedelta(days=1)
+        )
+        finished.image_variants = {
+            "source": finished.image.name,
+            "thumbnail": {"jpeg": "hackathons/x_thumbnail.jpg"},
+        }
+        finished.image_metadata = {"source": finished.image.name, "width": 10}
+        finished.save()
+        hackathon_factory()
+
+        assert Hackathon.objects.filter(winner__isnull=True).exists()
+        assert_same_output(HackathonListSerializer, Hackathon.objects.all(), context)
+
+    def test_participations(
+        self, participant_factory, participation_request_factory, context
+    ):
+        participant_factory.create_batch(3)
+        for status in ParticipationRequest.Status.values:
+            participation_request_factory(status=status)
+
+        assert_same_output(
+            HackathonParticipantListSerializer, Participant.objects.all(), context
+        )
+        assert_same_output(
+            MyParticipationListSerializer, Participant.objects.all(), context
+        )
+        assert_same_output(
+            HackathonParticipationRequestListSerializer,
+            ParticipationRequest.objects.all(),
+            context,
+        )
+        assert_same_output(
+            MyParticipationRequestListSerializer,
+            ParticipationRequest.objects.all(),
+            context,
+        )
+
+    def test_method_field_is_not_compiled(self):
+        class Serializer(serializers.Serializer):
+            title = serializers.CharField()
+            is_active = serializers.SerializerMethodField()
+
+        assert compile_serializer(Serializer, Hackathon) is None
+
+    def test_list_view_response_matches_serializer(
+        self, api_client, hackathon_factory, context
+    ):
+        hackathon_factory.create_batch(3)
+        response = api_client.get(
+            reverse("api:v1:hackathon_list"), {"ordering": "prize"}
+        )
+
+        queryset = Hackathon.objects.order_by("prize", "id")
+        expected = HackathonListSerializer(queryset, many=True, context=context).data
+        assert response.json()["results"] == expected
@@ -0,0 +1,158 @@
+import math
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.urls import reverse
+from rest_framework import status
+
+from leethack.core import deletes
+from leethack.core.deletes import delete_on_commit, delete_with_retries
+from leethack.core.storage import DELETE_BATCH_SIZE
+from leethack.hackathons.models import Hackathon
+
+HACKATHONS = 300
+
+
+class CountingStorage(FileSystemStorage):
+    """Local storage with a bulk delete that counts requests like S3 would."""
+
+    def __init__(self, *args, fail=0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.requests = 0
+        self.fail = fail
+
+    def delete(self, name):
+        self.requests += 1
+        super().delete(name)
+
+    def delete_many(self, names):
+        self.requests += 1
+        if self.fail:
+            self.fail -= 1
+            raise ConnectionError("storage is unavailable")
+        for name in names:
+            super().delete(name)
+        return []
+
+
+@pytest.fixture
+def storage(settings, monkeypatch):
+    storage = CountingStorage(location=settings.MEDIA_ROOT)
+    monkeypatch.setattr(Hackathon._meta.get_field("image"), "storage", storage)
+    return storage
+
+
+def store_image(storage, name):
+    stem = name.rsplit(".", 1)[0]
+    variants = {"source": name}
+    for variant in ("thumbnail", "card", "full"):
+        variants[variant] = {
+            "webp": f"{stem}_{variant}.webp",
+            "jpeg": f"{stem}_{variant}.jpg",
+        }
+    for path in [name, *variants["thumbnail"].values()]:
+        storage._save(path, ContentFile(b"data"))
+    return variants
+
+
+@pytest.mark.django_db
+class TestDeleteOnCommit:
+
+    def test_cascade_deletes_in_bulk_after_commit(
+        self,
+        api_client,
+        host,
+        hackathon_factory,
+        storage,
+        django_capture_on_commit_callbacks,
+    ):
+        for i in range(HACKATHONS):
+            name = f"hackathons/{i:032x}.png"
+            hackathon_factory(
+                host=host, image=name, image_variants=store_image(storage, name)
+            )
+        api_client.force_authenticate(user=host)
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            response = api_client.delete(reverse("api:v1:me_detail"))
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        # у запиті сховище не викликається
+        assert storage.requests == 0
+
+        for callback in callbacks:
+            callback()
+        files = HACKATHONS * 7
+        assert storage.requests == math.ceil(files / DELETE_BATCH_SIZE)
+        assert storage.listdir("hackathons") == ([], [])
+
+    def test_rolled_back_deletes_are_dropped(
+        self, storage, django_capture_on_commit_callbacks
+    ):
+        storage._save("hackathons/kept.png", ContentFile(b"data"))
+
+        with django_capture_on_commit_callbacks(execute=True):
+            with transaction.atomic():
+                with pytest.raises(ValueError), transaction.atomic():
+                    delete_on_commit(storage, ["hackathons/kept.png"])
+                    raise ValueError
+                delete_on_commit(storage, ["hackathons/missing.png"])
+
+        assert storage.exists("hackathons/kept.png")
+        assert storage.requests == 1
+
+    def test_rolled_back_savepoint_leaves_the_batch(
+        self, storage, django_capture_on_commit_callbacks
+    ):
+        for name in ("deleted.png", "kept.png", "released.png"):
+            storage._save(f"hackathons/{name}", ContentFile(b"data"))
+
+        with django_capture_on_commit_callbacks(execute=True):
+            with transaction.atomic():
+                delete_on_commit(storage, ["hackathons/deleted.png"])
+                with pytest.raises(ValueError), transaction.atomic():
+                    delete_on_commit(storage, ["hackathons/kept.png"])
+                    raise ValueError
+                with transaction.atomic():
+                    delete_on_commit(storage, ["hackathons/released.png"])
+
+        assert storage.listdir("hackathons") == ([], ["kept.png"])
+        assert storage.requests == 1
+
+    def test_uuid_names_are_deleted_without_queries(
+        self, storage, django_assert_num_queries, django_capture_on_commit_callbacks
+    ):
+        name = storage._save(f"hackathons/{'a' * 32}.png", ContentFile(b"data"))
+
+        with django_assert_num_queries(0):
+            with django_capture_on_commit_callbacks(execute=True):
+                delete_on_commit(storage, [name], name)
+
+        assert not storage.exists(name)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_deletes_run_on_real_commit(storage):
+    for name in ("deleted.png", "kept.png"):
+        storage._save(f"hackathons/{name}", ContentFile(b"data"))
+
+    with transaction.atomic():
+        delete_on_commit(storage, ["hackathons/deleted.png"])
+        with pytest.raises(ValueError), transaction.atomic():
+            delete_on_commit(storage, ["hackathons/kept.png"])
+            raise ValueError
+
+    assert storage.listdir("hackathons") == ([], ["kept.png"])
+    assert storage.requests == 1
+
+
+def test_failed_deletes_are_retried(settings, monkeypatch):
+    monkeypatch.setattr(deletes, "RETRY_DELAY", 0)
+    storage = CountingStorage(location=settings.MEDIA_ROOT, fail=2)
+    name = storage._save("hackathons/a.png", ContentFile(b"data"))
+
+    delete_with_retries(storage, [name])
+
+    assert storage.requests == 3
+    assert not storage.exists(name)
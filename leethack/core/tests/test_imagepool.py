@@ -0,0 +1,89 @@
+import os
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from leethack.core import imagepool
+from leethack.core.imagepool import (
+    ImageJobTimeout,
+    ImagePool,
+    ImagePoolBusy,
+    run_in_image_pool,
+)
+from leethack.core.validators import ImageInfo, read_image_info
+from .utils import create_test_image
+
+
+def sleep(seconds):
+    time.sleep(seconds)
+    return os.getpid()
+
+
+def block_in_c():
+    # запит нескінченний, а sqlite не повертається в Python, щоб обробити
+    # SIGALRM
+    query = "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n) "
+    sqlite3.connect(":memory:").execute(query + "SELECT max(x) FROM n").fetchone()
+
+
+@pytest.fixture
+def image_pool():
+    pool = ImagePool(workers=1, max_pending=1)
+    yield pool
+    if pool.executor is not None:
+        pool.executor.shutdown(cancel_futures=True)
+
+
+class TestImagePool:
+
+    def test_runs_job_in_other_process(self, image_pool):
+        data = create_test_image(size=(300, 200)).read()
+
+        info = image_pool.run(read_image_info, data, timeout=10, queue_timeout=1)
+        assert info == ImageInfo("JPEG", 300, 200)
+        assert image_pool.run(sleep, 0, timeout=10, queue_timeout=1) != os.getpid()
+
+    def test_job_timeout(self, image_pool):
+        with pytest.raises(ImageJobTimeout):
+            image_pool.run(sleep, 5, timeout=0.5, queue_timeout=1)
+
+        # воркер переживає таймаут і бере наступні задачі
+        assert image_pool.run(sleep, 0, timeout=10, queue_timeout=1)
+
+    def test_job_blocked_in_c_is_killed(self, image_pool, monkeypatch):
+        monkeypatch.setattr(imagepool, "TIMEOUT_GRACE", 0.5)
+        image_pool.run(sleep, 0, timeout=10, queue_timeout=1)
+        executor = image_pool.executor
+        processes = list(executor._processes.values())
+
+        with pytest.raises(ImageJobTimeout):
+            image_pool.run(block_in_c, timeout=0.5, queue_timeout=1)
+
+        for process in processes:
+            process.join(timeout=5)
+            assert not process.is_alive()
+        # слот звільнено, наступна задача йде в новий пул
+        assert image_pool.run(sleep, 0, timeout=10, queue_timeout=0)
+        assert image_pool.executor is not executor
+
+    def test_full_queue_raises_busy(self, image_pool):
+        # прогріваю пул, щоб старт процесу не впливав на таймінги
+        image_pool.run(sleep, 0, timeout=10, queue_timeout=1)
+        thread = threading.Thread(
+            target=image_pool.run,
+            args=(sleep, 1),
+            kwargs={"timeout": 10, "queue_timeout": 1},
+        )
+        thread.start()
+        time.sleep(0.2)
+
+        with pytest.raises(ImagePoolBusy):
+            image_pool.run(sleep, 0, timeout=10, queue_timeout=0.1)
+        thread.join()
+
+
+def test_runs_inline_without_workers(settings):
+    settings.IMAGE_POOL_WORKERS = 0
+    assert run_in_image_pool(sleep, 0) == os.getpid()
@@ -0,0 +1,233 @@
+from io import BytesIO
+
+import numpy as np
+import pytest
+from PIL import Image
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+from leethack.core import images
+from leethack.core.api.fields import ImageMetadataField, ImageVariantsField
+from leethack.core.images import (
+    OUTPUT_FORMATS,
+    encode,
+    encode_with_target,
+    generate_variants,
+    get_output_formats,
+    process_variants,
+    read_image_metadata,
+)
+from leethack.core.ssim import ssim
+from leethack.hackathons.models import Hackathon
+from .utils import create_test_image
+
+SIZES = {"thumbnail": (64, 64), "card": (192, 192), "full": (512, 512)}
+
+
+def open_stored(name):
+    with default_storage.open(name) as file:
+        image = Image.open(file)
+        image.load()
+    return image
+
+
+def set_image(hackathon, size=(400, 400), fmt="BMP"):
+    content = ContentFile(create_test_image(size=size, fmt=fmt).read())
+    hackathon.image.save(f"test.{fmt.lower()}", content)
+
+
+def create_photo(size=(256, 256)):
+    # градієнт із шумом стискається схоже на фото, на відміну від заливки
+    x, y = np.meshgrid(np.linspace(0, 255, size[0]), np.linspace(0, 255, size[1]))
+    noise = np.random.default_rng(0).normal(0, 12, (size[1], size[0], 3))
+    pixels = np.dstack([x, y, (x + y) / 2]) + noise
+    return Image.fromarray(pixels.clip(0, 255).astype(np.uint8))
+
+
+class TestSsim:
+
+    def test_identical_images(self):
+        image = create_photo()
+        assert ssim(image, image) == pytest.approx(1)
+
+    def test_lower_quality_scores_lower(self):
+        image = create_photo()
+        jpeg = OUTPUT_FORMATS[-1]
+        high = Image.open(BytesIO(encode(image, jpeg, 90)))
+        low = Image.open(BytesIO(encode(image, jpeg, 10)))
+        assert ssim(image, high) > ssim(image, low)
+
+
+class TestEncodeWithTarget:
+
+    @pytest.mark.parametrize("threshold", [0.9, 0.97])
+    def test_meets_threshold(self, threshold):
+        image = create_photo()
+        webp = next(output for output in OUTPUT_FORMATS if output.name == "webp")
+
+        data = encode_with_target(image, webp, threshold)
+        assert ssim(image, Image.open(BytesIO(data))) >= threshold
+
+    def test_lower_threshold_gives_smaller_file(self):
+        image = create_photo()
+        webp = next(output for output in OUTPUT_FORMATS if output.name == "webp")
+
+        assert len(encode_with_target(image, webp, 0.9)) < len(
+            encode_with_target(image, webp, 0.99)
+        )
+
+
+@pytest.mark.django_db
+class TestGenerateVariants:
+
+    def test_variants_are_resized_jpegs_next_to_original(self, hackathon):
+        set_image(hackathon)
+
+        variants = generate_variants(hackathon.image, SIZES)
+
+        assert variants["source"] == hackathon.image.name
+        stem = hackathon.image.name.rsplit(".", 1)[0]
+        # AVIF є лише там, де Pillow його підтримує
+        outputs = get_output_formats()
+        for name, size in SIZES.items():
+            assert set(variants[name]) == {output.name for output in outputs}
+            for output in outputs:
+                path = variants[name][output.name]
+                assert path.startswith(f"{stem}_{name}")
+                image = open_stored(path)
+                assert image.format == output.pil_format
+                assert image.size == min(size, (400, 400))
+
+    def test_crops_to_variant_ratio(self, hackathon):
+        set_image(hackathon, size=(800, 450))
+
+        variants = generate_variants(hackathon.image, {"card": (192, 192)})
+        assert open_stored(variants["card"]["jpeg"]).size == (192, 192)
+
+
+@pytest.mark.django_db
+class TestVariantsPipeline:
+
+    def test_variants_generated_after_commit(
+        self, hackathon, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            set_image(hackathon)
+
+        hackathon.refresh_from_db()
+        assert hackathon.image_variants["source"] == hackathon.image.name
+        assert set(hackathon.image_variants) == {"source", *SIZES}
+
+    def test_replaced_image_variants_are_deleted(
+        self, hackathon, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            set_image(hackathon)
+        hackathon.refresh_from_db()
+        old_path = hackathon.image_variants["card"]["jpeg"]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            set_image(hackathon, fmt="PNG")
+
+        assert not default_storage.exists(old_path)
+
+    def test_outdated_task_does_not_overwrite_new_image(self, hackathon, monkeypatch):
+        set_image(hackathon)
+        generated = []
+
+        def generate_and_replace(fieldfile, sizes):
+            variants = generate_variants(fieldfile, sizes)
+            generated.append(variants)
+            # картинку замінили, поки генерувались варіанти
+            Hackathon.objects.filter(pk=hackathon.pk).update(image="hackathons/new.jpg")
+            return variants
+
+        monkeypatch.setattr(images, "generate_variants", generate_and_replace)
+        sizes = settings.HACKATHON_IMAGE_CONFIG["variants"]
+        process_variants("hackathons.Hackathon", hackathon.pk, "image", sizes)
+
+        hackathon.refresh_from_db()
+        assert hackathon.image_variants == {}
+        assert not default_storage.exists(generated[0]["card"]["jpeg"])
+
+    def test_default_profile_picture_is_skipped(
+        self, user_factory, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            user = user_factory()
+
+        user.refresh_from_db()
+        assert user.profile_picture_variants == {}
+
+
+@pytest.mark.django_db
+class TestImageVariantsField:
+
+    def test_falls_back_to_original(self, hackathon):
+        set_image(hackathon)
+
+        urls = ImageVariantsField("image").to_representation(hackathon)
+        assert urls["card"] == {"bmp": hackathon.image.url}
+
+    def test_returns_variant_urls(self, hackathon, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            set_image(hackathon)
+        hackathon.refresh_from_db()
+
+        urls = ImageVariantsField("image").to_representation(hackathon)
+        card = hackathon.image_variants["card"]
+        # найефективніший формат першим
+        assert list(urls["card"]) == [output.name for output in get_output_formats()]
+        assert urls["card"]["jpeg"] == default_storage.url(card["jpeg"])
+
+    def test_empty_image(self, hackathon):
+        assert ImageVariantsField("image").to_representation(hackathon) is None
+
+
+class TestReadImageMetadata:
+
+    def test_reads_dimensions_colour_and_placeholder(self):
+        buffer = BytesIO()
+        Image.new("RGB", (1600, 900), (10, 120, 200)).save(buffer, "PNG")
+
+        metadata = read_image_metadata(buffer.getvalue())
+
+        assert metadata["width"] == 1600
+        assert metadata["height"] == 900
+        assert metadata["format"] == "png"
+        assert metadata["color"] == "#0a78c8"
+        assert len(metadata["placeholder"]) == 28
+
+    def test_exif_rotation_swaps_dimensions(self):
+        buffer = BytesIO()
+        exif = Image.Exif()
+        exif[0x0112] = 6  # поворот на 90°
+        Image.new("RGB", (400, 300)).save(buffer, "JPEG", exif=exif)
+
+        metadata = read_image_metadata(buffer.getvalue())
+        assert (metadata["width"], metadata["height"]) == (300, 400)
+
+
+@pytest.mark.django_db
+class TestImageMetadata:
+
+    def test_generated_in_background_when_missing(
+        self, hackathon, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            set_image(hackathon)
+        hackathon.refresh_from_db()
+
+        metadata = hackathon.image_metadata
+        assert metadata["source"] == hackathon.image.name
+        assert metadata["size"] == hackathon.image.size
+        assert (metadata["width"], metadata["height"]) == (400, 400)
+
+    def test_field_hides_stale_metadata(self, hackathon):
+        set_image(hackathon)
+        hackathon.image_metadata = {"source": "hackathons/old.png", "width": 1}
+        assert ImageMetadataField("image").to_representation(hackathon) is None
+
+        hackathon.image_metadata["source"] = hackathon.image.name
+        assert ImageMetadataField("image").to_representation(hackathon) == {"width": 1}
@@ -0,0 +1,131 @@
+import os
+import time
+from io import StringIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+
+from leethack.core import orphans
+from leethack.core.orphans import get_stem
+from .utils import create_test_image
+
+DAY = 24 * 60 * 60
+
+
+def store(name, age=2 * DAY):
+    name = default_storage._save(name, ContentFile(b"data"))
+    modified = time.time() - age
+    os.utime(default_storage.path(name), (modified, modified))
+    return name
+
+
+def collect(*args):
+    out = StringIO()
+    call_command("collect_orphaned_media", *args, stdout=out)
+    return out.getvalue()
+
+
+@pytest.fixture
+def hackathon_with_variants(hackathon, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        hackathon.image.save("a.png", ContentFile(create_test_image().read()))
+    hackathon.refresh_from_db()
+    for name in [hackathon.image.name, *hackathon.image_variants["card"].values()]:
+        modified = time.time() - 2 * DAY
+        os.utime(default_storage.path(name), (modified, modified))
+    return hackathon
+
+
+def test_get_stem():
+    assert get_stem("hackathons/abc.png") == "hackathons/abc"
+    assert get_stem("hackathons/abc_card.webp") == "hackathons/abc"
+    assert get_stem("hackathons/abc_other.webp") == "hackathons/abc_other"
+
+
+@pytest.mark.django_db
+class TestCollectOrphanedMedia:
+
+    def test_deletes_only_old_orphans(self, hackathon_with_variants):
+        orphan = store("hackathons/orphan.png")
+        orphan_variant = store("hackathons/orphan_card.webp")
+        recent = store("hackathons/recent.png", age=60)
+
+        output = collect()
+
+        assert not default_storage.exists(orphan)
+        assert not default_storage.exists(orphan_variant)
+        assert default_storage.exists(recent)
+        image = hackathon_with_variants.image
+        assert default_storage.exists(image.name)
+        for path in hackathon_with_variants.image_variants["card"].values():
+            assert default_storage.exists(path)
+        assert "Deleted 2 orphaned files." in output
+
+    def test_dry_run_keeps_files(self):
+        orphan = store("profile_pictures/orphan.png")
+
+        output = collect("--dry-run")
+
+        assert default_storage.exists(orphan)
+        assert "1 orphaned files would be deleted" in output
+
+    def test_default_images_are_kept(self, settings):
+        default = store(settings.DEFAULT_PROFILE_PICTURE)
+
+        collect("--prefix", "profile_pictures/")
+
+        assert default_storage.exists(default)
+
+    def test_grace_period_option(self):
+        orphan = store("hackathons/orphan.png", age=60)
+
+        collect("--grace-period", "0")
+
+        assert not default_storage.exists(orphan)
+
+    def test_new_reference_is_rechecked_before_delete(
+        self, hackathon_with_variants, monkeypatch
+    ):
+        # на файл послались уже після того, як завантажили посилання
+        monkeypatch.setattr(orphans, "get_referenced_stems", lambda prefix: set())
+
+        collect()
+
+        image = hackathon_with_variants.image
+        assert default_storage.exists(image.name)
+        for path in hackathon_with_variants.image_variants["card"].values():
+            assert default_storage.exists(path)
+
+    def test_variants_of_new_reference_are_kept(
+        self, hackathon_with_variants, monkeypatch
+    ):
+        monkeypatch.setattr(orphans, "get_referenced_stems", lambda prefix: set())
+        # оригінал щойно перевикористали, тож у партії лише його варіанти
+        os.utime(default_storage.path(hackathon_with_variants.image.name))
+
+        collect("--batch-size", "1")
+
+        for path in hackathon_with_variants.image_variants["card"].values():
+            assert default_storage.exists(path)
+
+    def test_referenced_names_are_queried_per_batch(self, django_assert_num_queries):
+        for i in range(5):
+            store(f"hackathons/orphan{i}.png")
+
+        fields = len(list(orphans.get_file_fields()))
+        # посилання для префікса і повторна перевірка трьох партій
+        with django_assert_num_queries(fields * 4):
+            collect("--prefix", "hackathons/", "--batch-size", "2")
+
+    @pytest.mark.parametrize("verbosity, reported", [("1", False), ("2", True)])
+    def test_progress_is_reported(self, monkeypatch, verbosity, reported):
+        monkeypatch.setattr(orphans, "PROGRESS_EVERY", 2)
+        for i in range(3):
+            store(f"hackathons/orphan{i}.png")
+
+        output = collect("--prefix", "hackathons/", "--verbosity", verbosity)
+
+        assert ("  listed 2," in output) is reported
+        assert "Deleted 3 orphaned files." in output
@@ -0,0 +1,33 @@
+import numpy as np
+from PIL import Image
+
+from leethack.core.placeholders import BASE83, encode_blurhash, get_dominant_color
+
+
+def gradient(width=32, height=18):
+    x, y = np.meshgrid(np.linspace(0, 255, width), np.linspace(0, 255, height))
+    return np.dstack([x, y, 255 - x]).astype(np.uint8)
+
+
+class TestEncodeBlurhash:
+
+    def test_matches_reference_implementation(self):
+        assert encode_blurhash(gradient()) == "L.Hezk2zw%XAqSWFjue=gJfjfQfj"
+
+    def test_length_depends_on_components(self):
+        assert len(encode_blurhash(gradient(), 4, 3)) == 6 + 2 * (4 * 3 - 1)
+        assert len(encode_blurhash(gradient(), 1, 1)) == 6
+
+    def test_average_colour_is_encoded_exactly(self):
+        pixels = np.full((10, 10, 3), (200, 30, 30), dtype=np.uint8)
+        # DC-компонента - символи 2..5
+        dc = 0
+        for char in encode_blurhash(pixels)[2:6]:
+            dc = dc * 83 + BASE83.index(char)
+        assert (dc >> 16, dc >> 8 & 255, dc & 255) == (200, 30, 30)
+
+
+def test_dominant_color():
+    image = Image.new("RGB", (20, 20), (10, 120, 200))
+    image.paste((250, 250, 250), (0, 0, 5, 5))
+    assert get_dominant_color(image) == "#0a78c8"
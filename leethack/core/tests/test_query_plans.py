@@ -0,0 +1,245 @@
+import datetime
+import json
+import random
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from leethack.core.tests.utils import (
+    assert_plan_uses_indexes,
+    get_page_sql,
+    get_view_queryset,
+)
+from leethack.hackathons.api.v1.views import HackathonListCreateAPIView
+from leethack.hackathons.models import Category, Hackathon
+from leethack.participations.api.v1.views import (
+    HackathonParticipantListAPIView,
+    HackathonParticipationRequestListCreateAPIView,
+)
+from leethack.participations.models import Participant, ParticipationRequest
+from leethack.users.api.v1.views import (
+    MyHostedHackathonListAPIView,
+    MyParticipatedHackathonListAPIView,
+    MyParticipationListAPIView,
+    MyParticipationRequestListAPIView,
+    UserHostedHackathonListAPIView,
+)
+from leethack.users.models import User
+
+LARGE_TABLES = {
+    "users_user",
+    "hackathons_hackathon",
+    "participations_participant",
+    "participations_participationrequest",
+}
+
+USERS = 3000
+HOSTS = 100
+HACKATHONS = 3000
+PARTICIPANTS_PER_HACKATHON = 10
+
+
+def seed():
+    rng = random.Random(0)
+    now = timezone.now()
+
+    users = User.objects.bulk_create(
+        User(
+            email=f"seed_{i}@email.com",
+            username=f"seed_{i}",
+            role=User.Role.HOST if i < HOSTS else User.Role.USER,
+        )
+        for i in range(USERS)
+    )
+    categories = Category.objects.bulk_create(
+        Category(title=f"seed category {i}", slug=f"seed-category-{i}")
+        for i in range(20)
+    )
+
+    hackathons = []
+    for i in range(HACKATHONS):
+        start = now + datetime.timedelta(hours=rng.randint(-5000, 5000))
+        hackathons.append(
+            Hackathon(
+                host=users[rng.randrange(HOSTS)],
+                title=f"seed hackathon {i}",
+                description="Seeded hackathon description.",
+                category=rng.choice(categories),
+                prize=rng.randint(0, 100000),
+                start_datetime=start,
+                end_datetime=start + datetime.timedelta(hours=rng.randint(1, 500)),
+                image="hackathons/seed.jpg",
+            )
+        )
+    hackathons = Hackathon.objects.bulk_create(hackathons)
+
+    participants, requests = [], []
+    statuses = [c[0] for c in ParticipationRequest.Status.choices]
+    for hackathon in hackathons:
+        for user in rng.sample(users, PARTICIPANTS_PER_HACKATHON):
+            created_at = now - datetime.timedelta(minutes=rng.randint(0, 100000))
+            participants.append(
+                Participant(user=user, hackathon=hackathon, created_at=created_at)
+            )
+            requests.append(
+                ParticipationRequest(
+                    user=user,
+                    hackathon=hackathon,
+                    status=rng.choice(statuses),
+                    created_at=created_at,
+                )
+            )
+    participants = Participant.objects.bulk_create(participants)
+    ParticipationRequest.objects.bulk_create(requests)
+
+    winners = participants[:: PARTICIPANTS_PER_HACKATHON * 20]
+    for participant in winners:
+        Hackathon.objects.filter(pk=participant.hackathon_id).update(winner=participant)
+
+    with connection.cursor() as cursor:
+        # перевіряю відкладені FK одразу, інакше вони перевіряються заново
+        # при відкаті кожного тесту
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        cursor.execute("SET CONSTRAINTS ALL DEFERRED")
+        for table in LARGE_TABLES | {"hackathons_category"}:
+            cursor.execute(f"ANALYZE {table}")
+        # VACUUM не працює в транзакції, тому pending list GIN індексів
+        # зливаю вручну, інакше планувальник вважає їх дорогими
+        cursor.execute(
+            "SELECT gin_clean_pending_list(c.oid::regclass) FROM pg_class c "
+            "JOIN pg_am am ON am.oid = c.relam "
+            "WHERE am.amname = 'gin' AND c.relkind = 'i'"
+        )
+
+
+@pytest.fixture(scope="module")
+def seeded_db(django_db_setup, django_db_blocker):
+    # сідую один раз на модуль і відкочую після, бо bulk_create на кілька
+    # десятків тисяч рядків занадто повільний для кожного тесту
+    with django_db_blocker.unblock():
+        with transaction.atomic():
+            seed()
+            yield
+            transaction.set_rollback(True)
+
+
+@pytest.fixture
+def host_user(seeded_db):
+    return User.objects.get(username="seed_0")
+
+
+@pytest.fixture
+def regular_user(seeded_db):
+    return User.objects.get(username=f"seed_{HOSTS + 1}")
+
+
+@pytest.fixture
+def seeded_hackathon(seeded_db):
+    return Hackathon.objects.filter(title="seed hackathon 1").get()
+
+
+@pytest.mark.django_db
+class TestHackathonListPlans:
+
+    @pytest.mark.parametrize(
+        "query_params",
+        [
+            {},
+            {"ordering": "start_datetime"},
+            {"ordering": "-end_datetime"},
+            {"ordering": "prize"},
+            {"ordering": "-prize"},
+            {"category": "seed-category-3"},
+            {"q": "1234"},
+        ],
+    )
+    def test_hackathon_list(self, seeded_db, query_params):
+        queryset = get_view_queryset(
+            HackathonListCreateAPIView, query_params=query_params
+        )
+        assert_plan_uses_indexes(queryset, LARGE_TABLES)
+
+    def test_hackathon_list_by_winner(self, seeded_db):
+        winner = Hackathon.objects.filter(winner__isnull=False).first().winner
+        queryset = get_view_queryset(
+            HackathonListCreateAPIView, query_params={"winner": winner.user.username}
+        )
+        assert_plan_uses_indexes(queryset, LARGE_TABLES)
+
+    @pytest.mark.parametrize("ordering", ["start_datetime", "-end_datetime", "prize"])
+    def test_hackathon_list_keyset_page(self, host_user, ordering):
+        # курсор на другу сторінку видає сам ендпоінт, а план береться
+        # з запиту сторінки, який він виконує
+        request = APIRequestFactory().get(
+            "/", {"ordering": ordering, "pagination": "cursor"}
+        )
+        force_authenticate(request, user=host_user)
+        response = HackathonListCreateAPIView.as_view()(request).render()
+        next_url = json.loads(response.content)["next"]
+        cursor = parse_qs(urlsplit(next_url).query)["cursor"][0]
+
+        sql = get_page_sql(
+            HackathonListCreateAPIView,
+            host_user,
+            query_params={"ordering": ordering, "cursor": cursor},
+        )
+        assert_plan_uses_indexes(sql, LARGE_TABLES)
+
+    def test_unindexed_sort_is_rejected(self, seeded_db):
+        queryset = Hackathon.objects.select_related("host").order_by("description")
+        with pytest.raises(AssertionError, match="Sort"):
+            assert_plan_uses_indexes(queryset[:30], LARGE_TABLES)
+
+    def test_my_participated_hackathon_list(self, regular_user):
+        queryset = get_view_queryset(
+            MyParticipatedHackathonListAPIView, user=regular_user
+        )
+        assert_plan_uses_indexes(queryset, LARGE_TABLES)
+
+    @pytest.mark.parametrize("query_params", [{}, {"ordering": "end_datetime"}])
+    def test_my_hosted_hackathon_list(self, host_user, query_params):
+        queryset = get_view_queryset(
+            MyHostedHackathonListAPIView, user=host_user, query_params=query_params
+        )
+        assert_plan_uses_indexes(queryset, LARGE_TABLES)
+
+    def test_user_hosted_hackathon_list(self, host_user):
+        queryset = get_view_queryset(
+            UserHostedHackathonListAPIView, user_id=host_user.pk
+        )
+        assert_plan_uses_indexes(queryset, LARGE_TABLES)
+
+
+@pytest.mark.django_db
+class TestParticipationListPlans:
+
+    @pytest.mark.parametrize("query_params", [{}, {"search": "seed_12"}])
+    def test_hackathon_participant_list(self, seeded_hackathon, query_params):
+        queryset = get_view_queryset(
+            HackathonParticipantListAPIView,
+            query_params=query_params,
+            hackathon_id=seeded_hackathon.pk,
+        )
+        assert_plan_uses_indexes(queryset, LARGE_TABLES)
+
+    @pytest.mark.parametrize("query_params", [{}, {"status": "pending"}])
+    def test_hackathon_participation_request_list(self, seeded_hackathon, query_params):
+        queryset = get_view_queryset(
+            HackathonParticipationRequestListCreateAPIView,
+            query_params=query_params,
+            hackathon_id=seeded_hackathon.pk,
+        )
+        assert_plan_uses_indexes(queryset, LARGE_TABLES)
+
+    def test_my_participation_list(self, regular_user):
+        queryset = get_view_queryset(MyParticipationListAPIView, user=regular_user)
+        assert_plan_uses_indexes(queryset, LARGE_TABLES)
+
+    def test_my_participation_request_list(self, regular_user):
+        queryset = get_view_queryset(
+            MyParticipationRequestListAPIView, user=regular_user
+        )
+        assert_plan_uses_indexes(queryset, LARGE_TABLES)
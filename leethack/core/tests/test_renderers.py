@@ -0,0 +1,129 @@
+import datetime
+import decimal
+import io
+import uuid
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework import renderers
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.utils.serializer_helpers import ReturnDict
+
+from leethack.core.api.parsers import MessagePackParser, ORJSONParser
+from leethack.core.api.renderers import (
+    MessagePackRenderer,
+    ORJSONRenderer,
+    RawJSON,
+)
+
+msgpack = pytest.importorskip("msgpack")
+
+KYIV = timezone.get_fixed_timezone(180)
+
+
+@pytest.fixture
+def data():
+    return ReturnDict(
+        {
+            "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "utc": datetime.datetime(2026, 1, 2, 3, 4, 5, tzinfo=datetime.UTC),
+            "local": datetime.datetime(2026, 1, 2, 3, 4, 5, 60, tzinfo=KYIV),
+            "date": datetime.date(2026, 1, 2),
+            "prize": decimal.Decimal("10.50"),
+            "label": gettext_lazy("Pending"),
+            "error": [ErrorDetail("Invalid.", code="invalid")],
+            "text": "Хакатон     \x01 🚀",
+            1: None,
+        },
+        serializer=None,
+    )
+
+
+class TestORJSONRenderer:
+
+    def test_matches_drf_renderer(self, data):
+        expected = renderers.JSONRenderer().render(data)
+        assert ORJSONRenderer().render(data) == expected
+
+    def test_indent_uses_drf_renderer(self, data):
+        media_type = "application/json; indent=4"
+        expected = renderers.JSONRenderer().render(data, media_type)
+        assert ORJSONRenderer().render(data, media_type) == expected
+
+    def test_wide_integers_use_drf_renderer(self):
+        assert ORJSONRenderer().render({"n": 2**70}) == b'{"n":%d}' % 2**70
+
+    def test_raw_json(self):
+        raw = RawJSON(b'{"a":[1,2]}')
+        assert ORJSONRenderer().render(raw) == raw
+        indented = ORJSONRenderer().render(raw, "application/json; indent=2")
+        assert indented == b'{\n  "a": [\n    1,\n    2\n  ]\n}'
+
+
+class TestParsers:
+
+    def test_json(self):
+        stream = io.BytesIO('{"title": "Хакатон", "prize": 1.5}'.encode())
+        assert ORJSONParser().parse(stream) == {"title": "Хакатон", "prize": 1.5}
+
+    @pytest.mark.parametrize("body", [b"{", b'{"prize": NaN}'])
+    def test_invalid_json(self, body):
+        with pytest.raises(ParseError):
+            ORJSONParser().parse(io.BytesIO(body))
+
+    def test_messagepack_roundtrip(self, data):
+        # unpackb приймає лише str/bytes ключі (strict_map_key)
+        del data[1]
+        content = MessagePackRenderer().render(data)
+        parsed = MessagePackParser().parse(io.BytesIO(content))
+
+        assert parsed == {
+            "id": "12345678-1234-5678-1234-567812345678",
+            "utc": "2026-01-02T03:04:05Z",
+            "local": "2026-01-02T03:04:05.000060+03:00",
+            "date": "2026-01-02",
+            "prize": 10.5,
+            "label": "Pending",
+            "error": ["Invalid."],
+            "text": data["text"],
+        }
+
+    def test_invalid_messagepack(self):
+        with pytest.raises(ParseError):
+            MessagePackParser().parse(io.BytesIO(b"\xc1"))
+
+
+@pytest.mark.django_db
+class TestContentNegotiation:
+
+    def test_messagepack_list(self, api_client, hackathon_factory, settings):
+        settings.SQL_JSON_RENDERING = True
+        hackathon_factory.create_batch(2)
+        url = reverse("api:v1:hackathon_list")
+
+        json_response = api_client.get(url)
+        response = api_client.get(url, HTTP_ACCEPT="application/msgpack")
+
+        assert response["Content-Type"] == "application/msgpack"
+        assert msgpack.unpackb(response.content) == json_response.json()
+
+    def test_messagepack_request_body(self, api_client, user):
+        api_client.force_authenticate(user)
+        response = api_client.patch(
+            reverse("api:v1:me_detail"),
+            data=msgpack.packb({"first_name": "Олена"}),
+            content_type="application/msgpack",
+            HTTP_ACCEPT="application/msgpack",
+        )
+
+        assert response.status_code == 200
+        assert msgpack.unpackb(response.content)["first_name"] == "Олена"
+
+    def test_invalid_json_body(self, api_client, user):
+        api_client.force_authenticate(user)
+        response = api_client.patch(
+            reverse("api:v1:me_detail"), data=b"{", content_type="application/json"
+        )
+        assert response.status_code == 400
@@ -0,0 +1,92 @@
+import datetime
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+NESTED_TYPES = {"host": "user", "category": "category", "winner": "participant"}
+
+
+def resolve(row, included):
+    """Row of a side-loaded response with nested objects put back in place."""
+    row = dict(row)
+    for name, type_name in NESTED_TYPES.items():
+        if row.get(name) is not None:
+            row[name] = dict(included[type_name][row[name]])
+            if name == "winner":
+                row[name]["user"] = included["user"][row[name]["user"]]
+    return row
+
+
+@pytest.fixture
+def hosted(host, category_factory, hackathon_factory, participant_factory):
+    past = timezone.now() - datetime.timedelta(days=10)
+    categories = category_factory.create_batch(2)
+    hackathons = [
+        hackathon_factory(host=host, category=categories[i % 2]) for i in range(4)
+    ]
+    finished = hackathon_factory(
+        host=host,
+        category=categories[0],
+        start_datetime=past,
+        end_datetime=past + datetime.timedelta(days=1),
+    )
+    finished.winner = participant_factory(hackathon=finished)
+    finished.save()
+    return [*hackathons, finished]
+
+
+@pytest.mark.django_db
+class TestSideload:
+
+    def test_objects_are_included_once(self, api_client, host, hosted):
+        api_client.force_authenticate(host)
+        url = reverse("api:v1:my_hosted_hackathon_list")
+        embedded = api_client.get(url).json()
+        response = api_client.get(url, {"sideload": "true"}).json()
+
+        included = response["included"]
+        assert set(included["user"]) == {str(host.id), str(hosted[-1].winner.user_id)}
+        assert len(included["category"]) == 2
+        assert len(included["participant"]) == 1
+        assert response["count"] == embedded["count"]
+        resolved = [resolve(row, included) for row in response["results"]]
+        assert resolved == embedded["results"]
+
+    def test_query_count_does_not_grow(
+        self, api_client, host, hosted, hackathon_factory
+    ):
+        api_client.force_authenticate(host)
+        url = reverse("api:v1:my_hosted_hackathon_list")
+        with CaptureQueriesContext(connection) as before:
+            api_client.get(url, {"sideload": "true"})
+        hackathon_factory.create_batch(5, host=host)
+        with CaptureQueriesContext(connection) as after:
+            api_client.get(url, {"sideload": "true"})
+
+        assert len(after) == len(before)
+        page_query = next(
+            q["sql"] for q in after.captured_queries if "LIMIT" in q["sql"]
+        )
+        assert "users_user" not in page_query
+
+    def test_sql_json_rendering(self, api_client, hosted, settings):
+        url = reverse("api:v1:hackathon_list")
+        params = {"sideload": "1", "fields": "id,host,winner"}
+        expected = api_client.get(url, params)
+        cache.clear()
+        settings.SQL_JSON_RENDERING = True
+        response = api_client.get(url, params)
+
+        assert response.content == expected.content
+        assert set(response.json()["results"][0]) == {"id", "host", "winner"}
+
+    def test_without_nested_objects(self, api_client, category_factory):
+        category_factory.create_batch(2)
+        response = api_client.get(reverse("api:v1:category_list"), {"sideload": "1"})
+
+        assert len(response.data["results"]) == 2
+        assert response.data["included"] == {}
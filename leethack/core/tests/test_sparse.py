@@ -0,0 +1,137 @@
+import datetime
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from leethack.core.api.compiler import compile_serializer
+from leethack.core.api.sparse import get_sparse_serializer, parse_paths
+from leethack.core.api.sqljson import compile_sql_json
+from leethack.hackathons.api.v1.serializers import HackathonListSerializer
+from leethack.hackathons.models import Hackathon
+
+
+def get_page_query(queries):
+    return next(q["sql"] for q in queries if "COUNT(*)" not in q["sql"])
+
+
+@pytest.fixture
+def finished(hackathon_factory, participant_factory):
+    past = timezone.now() - datetime.timedelta(days=10)
+    hackathon = hackathon_factory(
+        start_datetime=past, end_datetime=past + datetime.timedelta(days=1)
+    )
+    hackathon.winner = participant_factory(hackathon=hackathon)
+    hackathon.save()
+    return hackathon
+
+
+class TestGetSparseSerializer:
+
+    def test_same_paths_reuse_class(self):
+        first = get_sparse_serializer(
+            HackathonListSerializer, parse_paths("id,title"), None
+        )
+        second = get_sparse_serializer(
+            HackathonListSerializer, parse_paths("title, id,"), None
+        )
+
+        assert first is second
+        assert list(first().fields) == ["id", "title"]
+
+    def test_pruned_serializers_compile(self):
+        serializer_class = get_sparse_serializer(
+            HackathonListSerializer,
+            parse_paths("id,host.username,category,winner"),
+            parse_paths("category"),
+        )
+
+        assert compile_serializer(serializer_class, Hackathon) is not None
+        assert compile_sql_json(serializer_class, Hackathon) is not None
+
+    @pytest.mark.parametrize(
+        "fields, expand",
+        [("id,nope", None), ("title.x", None), (None, "title"), (None, "host.nope")],
+    )
+    def test_unknown_paths(self, fields, expand):
+        with pytest.raises(ValidationError):
+            get_sparse_serializer(
+                HackathonListSerializer,
+                fields and parse_paths(fields),
+                expand and parse_paths(expand),
+            )
+
+
+@pytest.mark.django_db
+class TestSparseFieldsets:
+
+    def test_fields_drop_joins(self, api_client, finished):
+        url = reverse("api:v1:hackathon_list")
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url, {"fields": "id,title,image"})
+
+        assert response.status_code == 200
+        assert list(response.json()["results"][0]) == ["id", "title", "image"]
+        sql = get_page_query(queries.captured_queries)
+        assert "users_user" not in sql
+        assert "hackathons_category" not in sql
+
+    def test_expand_collapses_other_relations(self, api_client, finished):
+        url = reverse("api:v1:hackathon_list")
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url, {"expand": "category"})
+
+        result = response.json()["results"][0]
+        assert result["host"] == str(finished.host_id)
+        assert result["winner"] == str(finished.winner_id)
+        assert result["category"]["slug"] == finished.category.slug
+        assert "users_user" not in get_page_query(queries.captured_queries)
+
+    def test_nested_fields(self, api_client, finished):
+        response = api_client.get(
+            reverse("api:v1:hackathon_list"),
+            {"fields": "id,winner.user.username", "expand": "winner"},
+        )
+
+        assert response.json()["results"][0] == {
+            "id": str(finished.id),
+            "winner": {"user": {"username": finished.winner.user.username}},
+        }
+
+    def test_sql_json_rendering(self, api_client, finished, settings):
+        url = reverse("api:v1:hackathon_list")
+        params = {"fields": "id,title,host,winner.user", "expand": "winner"}
+        expected = api_client.get(url, params)
+        cache.clear()
+        settings.SQL_JSON_RENDERING = True
+        response = api_client.get(url, params)
+
+        assert response.content == expected.content
+
+    def test_detail(self, api_client, finished):
+        url = reverse("api:v1:hackathon_detail", kwargs={"pk": finished.pk})
+        response = api_client.get(url, {"fields": "id,description"})
+
+        assert response.data == {
+            "id": str(finished.id),
+            "description": finished.description,
+        }
+
+    def test_unknown_field(self, api_client, finished):
+        response = api_client.get(reverse("api:v1:hackathon_list"), {"fields": "x"})
+        assert response.status_code == 400
+
+    def test_writes_ignore_fields(self, api_client, user):
+        api_client.force_authenticate(user)
+        url = reverse("api:v1:me_detail")
+        response = api_client.patch(
+            f"{url}?fields=id", data={"first_name": "Olena"}, format="json"
+        )
+
+        assert response.status_code == 200
+        assert response.data["first_name"] == "Olena"
+        assert list(api_client.get(url, {"fields": "id"}).data) == ["id"]
@@ -0,0 +1,184 @@
+import datetime
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from leethack.core.api import compiler
+from leethack.core.api.renderers import PrerenderedJSONRenderer, RawJSON
+from leethack.core.api.sqljson import compile_sql_json, render_object, render_rows
+from leethack.hackathons.api.v1.serializers import HackathonListSerializer
+from leethack.hackathons.api.v1.views.hackathon import HackathonListCreateAPIView
+from leethack.hackathons.models import Hackathon
+from leethack.participations.models import ParticipationRequest
+from leethack.users.api.v1.serializers import MyParticipationRequestListSerializer
+
+TRICKY_TEXT = 'Хакатон "№1" Zeta\n\t\\ \x01   🚀'
+
+
+def get_both(api_client, settings, url, params=None):
+    settings.SQL_JSON_RENDERING = False
+    expected = api_client.get(url, params)
+    # анонімні списки кешуються, друга відповідь має рендеритися заново
+    cache.clear()
+    settings.SQL_JSON_RENDERING = True
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get(url, params)
+    assert any("to_json" in query["sql"] for query in queries.captured_queries)
+    return response, expected
+
+
+@pytest.mark.django_db
+class TestSQLJSONRendering:
+
+    @pytest.fixture
+    def hackathons(self, hackathon_factory, participant_factory):
+        past = timezone.now() - datetime.timedelta(days=10)
+        finished = hackathon_factory(
+            title=TRICKY_TEXT,
+            start_datetime=past.replace(microsecond=0),
+            end_datetime=past + datetime.timedelta(days=1, microseconds=5),
+        )
+        finished.image.name = "hackathons/a b/x'y%#?.JPG"
+        finished.image_variants = {
+            "source": finished.image.name,
+            "thumbnail": {"gif": "x.gif", "jpeg": "x t.jpg", "avif": "x.avif"},
+            "full": {"webp": "x.webp"},
+        }
+        finished.image_metadata = {
+            "source": finished.image.name,
+            "width": 10,
+            "format": "jpeg",
+            "color": None,
+        }
+        finished.save()
+        finished.winner = participant_factory(hackathon=finished)
+        finished.save()
+        finished.host.username = TRICKY_TEXT[:20]
+        finished.host.profile_picture = ""
+        finished.host.save()
+
+        stale = hackathon_factory()
+        stale.image.name = "hackathons/ü ø.tar.png"
+        stale.image_variants = {"source": "other.jpg"}
+        stale.image_metadata = {"source": "other.jpg", "width": 1}
+        stale.save()
+        hackathon_factory.create_batch(2)
+
+    def test_matches_drf_renderer(self, api_client, settings, hackathons):
+        settings.SQL_JSON_RENDERING = True
+        response = api_client.get(reverse("api:v1:hackathon_list"))
+
+        request = Request(APIRequestFactory().get("/"))
+        queryset = Hackathon.objects.order_by("start_datetime", "id")
+        results = HackathonListSerializer(
+            queryset, many=True, context={"request": request}
+        ).data
+        expected = JSONRenderer().render(
+            {"count": 4, "next": None, "previous": None, "results": results}
+        )
+        assert response.content == expected
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"ordering": "-prize", "page_size": 2, "page": 2},
+            {"pagination": "cursor", "page_size": 3},
+            {"search": "zeta"},
+        ],
+    )
+    def test_hackathon_list(self, api_client, settings, hackathons, params):
+        url = reverse("api:v1:hackathon_list")
+        response, expected = get_both(api_client, settings, url, params)
+        assert response.content == expected.content
+
+    def test_my_participations(
+        self, api_client, settings, user, participant_factory, hackathon_factory
+    ):
+        hackathon = hackathon_factory(title=TRICKY_TEXT)
+        hackathon.image.name = ""
+        hackathon.save()
+        participant_factory(user=user, hackathon=hackathon)
+        participant_factory.create_batch(2, user=user)
+        api_client.force_authenticate(user)
+
+        url = reverse("api:v1:my_participation_list")
+        response, expected = get_both(api_client, settings, url)
+        assert response.content == expected.content
+
+    def test_display_labels(self, participation_request_factory):
+        for status in ParticipationRequest.Status.values:
+            participation_request_factory(status=status)
+        context = {"request": Request(APIRequestFactory().get("/"))}
+        queryset = ParticipationRequest.objects.order_by("id")
+
+        compiled = compile_sql_json(
+            MyParticipationRequestListSerializer, ParticipationRequest
+        )
+        rows = queryset.annotate(row_json=compiled.get_expression(context)).values_list(
+            "row_json", named=True
+        )
+
+        data = MyParticipationRequestListSerializer(
+            queryset, many=True, context=context
+        ).data
+        assert render_rows(rows) == JSONRenderer().render(data)
+
+    def test_falls_back_for_browsable_api(self, api_client, settings, hackathon):
+        settings.SQL_JSON_RENDERING = True
+        response = api_client.get(
+            reverse("api:v1:hackathon_list"), HTTP_ACCEPT="text/html"
+        )
+
+        assert response.status_code == 200
+        assert response.data["results"][0]["id"] == str(hackathon.id)
+
+    @pytest.mark.parametrize("compiled", [True, False])
+    def test_fallback_filters_once(
+        self, api_client, settings, monkeypatch, hackathon, compiled
+    ):
+        settings.SQL_JSON_RENDERING = True
+        if not compiled:
+            monkeypatch.setattr(compiler, "compile_serializer", lambda *args: None)
+        calls = []
+        filter_queryset = HackathonListCreateAPIView.filter_queryset
+
+        def counting_filter_queryset(view, queryset):
+            calls.append(queryset)
+            return filter_queryset(view, queryset)
+
+        monkeypatch.setattr(
+            HackathonListCreateAPIView, "filter_queryset", counting_filter_queryset
+        )
+        # з відступом SQL-рендеринг поступається наступному шляху
+        response = api_client.get(
+            reverse("api:v1:hackathon_list"),
+            {"search": hackathon.title},
+            HTTP_ACCEPT="application/json; indent=2",
+        )
+
+        assert response.status_code == 200
+        assert response.json()["count"] == 1
+        assert len(calls) == 1
+
+    def test_unsupported_fields_are_not_compiled(self):
+        class Serializer(serializers.Serializer):
+            status = serializers.ChoiceField(choices=["a"])
+
+        assert compile_sql_json(Serializer, ParticipationRequest) is None
+
+
+def test_render_object_keeps_raw_values_and_key_order():
+    renderer = PrerenderedJSONRenderer()
+    data = {"results": RawJSON(b'[{"a":1}]'), "next": None, "title": TRICKY_TEXT}
+
+    rendered = render_object(renderer, data, None, {})
+
+    assert rendered == JSONRenderer().render({**data, "results": [{"a": 1}]})
@@ -0,0 +1,241 @@
+import datetime
+import hashlib
+import os
+import time
+from unittest import mock
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+from leethack.core import images
+from leethack.core.orphans import collect_orphans
+from leethack.core.storage import (
+    IMMUTABLE_CACHE_CONTROL,
+    CachedURLS3Storage,
+    MediaS3Storage,
+    URLCache,
+    delete_files,
+    is_content_addressed,
+)
+from .utils import create_test_image
+
+
+def create_storage(**options):
+    return CachedURLS3Storage(
+        access_key="key",
+        secret_key="secret",
+        bucket_name="bucket",
+        endpoint_url="https://storage.example.com",
+        location="media",
+        signature_version="s3v4",
+        **options,
+    )
+
+
+@pytest.fixture
+def storage():
+    return create_storage()
+
+
+def count_signatures(storage):
+    client = storage.connection.meta.client
+    return mock.patch.object(
+        client,
+        "generate_presigned_url",
+        side_effect=client.generate_presigned_url,
+    )
+
+
+class TestCachedURLS3Storage:
+
+    def test_url_is_signed_once(self, storage):
+        with count_signatures(storage) as sign:
+            first = storage.url("hackathons/a.png")
+            second = storage.url("hackathons/a.png")
+
+        assert first == second
+        assert "X-Amz-Signature" in first
+        assert sign.call_count == 1
+
+    def test_default_timeout_is_half_of_signature_ttl(self, storage):
+        assert storage.url_cache.timeout == storage.querystring_expire // 2
+
+    def test_expired_url_is_signed_again(self):
+        storage = create_storage(url_cache_timeout=0)
+        with count_signatures(storage) as sign:
+            storage.url("hackathons/a.png")
+            storage.url("hackathons/a.png")
+        assert sign.call_count == 2
+
+    def test_custom_parameters_are_not_cached(self, storage):
+        with count_signatures(storage) as sign:
+            storage.url("hackathons/a.png", expire=60)
+            storage.url("hackathons/a.png", expire=60)
+        assert sign.call_count == 2
+
+    def test_public_domain_is_not_signed(self):
+        storage = create_storage(
+            custom_domain="media.example.com", querystring_auth=False
+        )
+        assert storage.url("hackathons/a.png") == (
+            "https://media.example.com/media/hackathons/a.png"
+        )
+
+
+def test_url_cache_evicts_least_recently_used():
+    cache = URLCache(timeout=60, max_size=2)
+    cache.set("a", "url-a")
+    cache.set("b", "url-b")
+    cache.get("a")
+    cache.set("c", "url-c")
+
+    assert cache.get("a") == "url-a"
+    assert cache.get("b") is None
+
+
+@pytest.fixture
+def content_addressed(settings):
+    settings.MEDIA_CONTENT_ADDRESSED = True
+
+
+def image_content():
+    return ContentFile(create_test_image(fmt="PNG").read())
+
+
+def collect_expired_orphans(settings):
+    # спільні файли видаляє лише збирач сиріт після пільгового періоду
+    past = time.time() - 60 * 60
+    for root, _, files in os.walk(settings.MEDIA_ROOT):
+        for file in files:
+            os.utime(os.path.join(root, file), (past, past))
+    collect_orphans(default_storage, "hackathons/", datetime.timedelta(minutes=1))
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("content_addressed")
+class TestContentAddressedStorage:
+
+    def test_name_is_content_hash(self):
+        content = image_content()
+        digest = hashlib.sha256(content.read()).hexdigest()
+
+        name = default_storage.save("hackathons/upload.PNG", content)
+
+        assert name == f"hackathons/{digest}.png"
+        assert is_content_addressed(name)
+
+    def test_same_content_is_stored_once(self, hackathon_factory):
+        first, second = hackathon_factory(), hackathon_factory()
+        first.image.save("a.png", image_content())
+        second.image.save("b.png", image_content())
+
+        assert first.image.name == second.image.name
+        assert default_storage.listdir("hackathons")[1] == [
+            first.image.name.split("/")[1]
+        ]
+
+    def test_shared_file_is_left_to_orphan_collector(
+        self, hackathon_factory, django_capture_on_commit_callbacks, settings
+    ):
+        first, second = hackathon_factory(), hackathon_factory()
+        first.image.save("a.png", image_content())
+        second.image.save("b.png", image_content())
+        name = first.image.name
+
+        with django_capture_on_commit_callbacks(execute=True):
+            first.delete()
+        collect_expired_orphans(settings)
+        assert default_storage.exists(name)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            second.delete()
+        assert default_storage.exists(name)
+        collect_expired_orphans(settings)
+        assert not default_storage.exists(name)
+
+    def test_dedup_hit_survives_pending_delete(
+        self, hackathon_factory, django_capture_on_commit_callbacks
+    ):
+        hackathon = hackathon_factory()
+        hackathon.image.save("a.png", image_content())
+        name = hackathon.image.name
+
+        with django_capture_on_commit_callbacks(execute=True):
+            hackathon.delete()
+            # інший запит зберігає той самий вміст, а його рядок закомітиться
+            # вже після видалення
+            assert default_storage.save("hackathons/b.png", image_content()) == name
+
+        assert default_storage.exists(name)
+
+    def test_shared_variants_are_reused_and_kept(
+        self,
+        hackathon_factory,
+        django_capture_on_commit_callbacks,
+        monkeypatch,
+        settings,
+    ):
+        first, second = hackathon_factory(), hackathon_factory()
+        with django_capture_on_commit_callbacks(execute=True):
+            first.image.save("a.png", image_content())
+        transcode = mock.Mock(side_effect=images.transcode_image)
+        monkeypatch.setattr(images, "transcode_image", transcode)
+        with django_capture_on_commit_callbacks(execute=True):
+            second.image.save("b.png", image_content())
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        assert second.image_variants == first.image_variants
+        transcode.assert_not_called()
+
+        card = first.image_variants["card"]["webp"]
+        with django_capture_on_commit_callbacks(execute=True):
+            first.delete()
+        collect_expired_orphans(settings)
+        assert default_storage.exists(card)
+        with django_capture_on_commit_callbacks(execute=True):
+            second.delete()
+        assert default_storage.exists(card)
+        collect_expired_orphans(settings)
+        assert not default_storage.exists(card)
+
+
+def test_media_storage_marks_objects_immutable():
+    storage = MediaS3Storage(
+        access_key="key", secret_key="secret", bucket_name="bucket"
+    )
+    params = storage.get_object_parameters("hackathons/a.png")
+    assert params["CacheControl"] == IMMUTABLE_CACHE_CONTROL
+
+
+def test_media_storage_deletes_in_batches_of_1000():
+    storage = MediaS3Storage(
+        access_key="key", secret_key="secret", bucket_name="bucket", location="media"
+    )
+    with mock.patch.object(type(storage), "bucket") as bucket:
+        bucket.delete_objects.side_effect = [
+            {"Errors": [{"Key": "media/hackathons/7.png", "Code": "InternalError"}]},
+            {},
+        ]
+        failed = delete_files(storage, [f"hackathons/{i}.png" for i in range(1500)])
+
+    calls = bucket.delete_objects.call_args_list
+    assert [len(call.kwargs["Delete"]["Objects"]) for call in calls] == [1000, 500]
+    assert calls[0].kwargs["Delete"]["Objects"][0] == {"Key": "media/hackathons/0.png"}
+    assert failed == ["hackathons/7.png"]
+
+
+def test_media_storage_touch_copies_object_onto_itself():
+    storage = MediaS3Storage(
+        access_key="key", secret_key="secret", bucket_name="bucket", location="media"
+    )
+    with mock.patch.object(type(storage), "bucket") as bucket:
+        assert storage.touch("hackathons/a.png")
+
+    bucket.Object.assert_called_once_with("media/hackathons/a.png")
+    params = bucket.Object.return_value.copy_from.call_args.kwargs
+    assert params["CopySource"] == {"Bucket": "bucket", "Key": "media/hackathons/a.png"}
+    assert params["MetadataDirective"] == "REPLACE"
+    assert params["ContentType"] == "image/png"
+    assert params["CacheControl"] == IMMUTABLE_CACHE_CONTROL
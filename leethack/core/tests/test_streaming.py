@@ -0,0 +1,103 @@
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from leethack.core.api import streaming
+
+NDJSON = "application/x-ndjson"
+
+
+def read_lines(response):
+    assert response.streaming
+    content = b"".join(response.streaming_content)
+    assert content.endswith(b"\n")
+    return [json.loads(line) for line in content.splitlines()]
+
+
+@pytest.mark.django_db
+class TestNDJSONStreaming:
+
+    @pytest.fixture
+    def participants(self, hackathon, participant_factory):
+        return participant_factory.create_batch(7, hackathon=hackathon)
+
+    @pytest.fixture
+    def url(self, hackathon):
+        return reverse(
+            "api:v1:hackathon_participant_list", kwargs={"hackathon_id": hackathon.pk}
+        )
+
+    @pytest.fixture
+    def host_client(self, api_client, hackathon):
+        api_client.force_authenticate(hackathon.host)
+        return api_client
+
+    @pytest.mark.parametrize("renderer", ["serializer", "compiled", "sql"])
+    def test_lines_match_list(
+        self, host_client, url, participants, settings, monkeypatch, renderer
+    ):
+        expected = host_client.get(url, {"page_size": 200}).json()["results"]
+        settings.SQL_JSON_RENDERING = renderer == "sql"
+        if renderer == "serializer":
+            monkeypatch.setattr(streaming, "compile_serializer", lambda *args: None)
+        # кілька порцій курсора і неповна остання
+        settings.API_STREAM_CHUNK_SIZE = 3
+        with CaptureQueriesContext(connection) as queries:
+            response = host_client.get(url, HTTP_ACCEPT=NDJSON)
+            lines = read_lines(response)
+
+        assert response["Content-Type"] == NDJSON
+        assert "Accept" in response["Vary"]
+        assert lines == expected
+        sql = [query["sql"] for query in queries.captured_queries]
+        assert not any("COUNT(*)" in query for query in sql)
+
+    def test_filters_and_fields(self, host_client, url, participants):
+        params = {"ordering": "created_at", "fields": "id"}
+        expected = host_client.get(url, params).json()["results"]
+        response = host_client.get(url, {**params, "format": "ndjson"})
+
+        assert read_lines(response) == expected
+        assert list(expected[0]) == ["id"]
+
+    def test_sideload_is_ignored(self, host_client, url, participants):
+        response = host_client.get(url, {"sideload": "1"}, HTTP_ACCEPT=NDJSON)
+
+        lines = read_lines(response)
+        assert len(lines) == len(participants)
+        assert isinstance(lines[0]["user"], dict)
+
+    def test_participation_requests(
+        self, host_client, hackathon, participation_request_factory
+    ):
+        participation_request_factory.create_batch(3, hackathon=hackathon)
+        url = reverse(
+            "api:v1:hackathon_participation_request_list",
+            kwargs={"hackathon_id": hackathon.pk},
+        )
+        expected = host_client.get(url).json()["results"]
+
+        assert read_lines(host_client.get(url, HTTP_ACCEPT=NDJSON)) == expected
+
+    def test_permissions(self, api_client, user, url, participants):
+        api_client.force_authenticate(user)
+        response = api_client.get(url, HTTP_ACCEPT=NDJSON)
+
+        assert response.status_code == 403
+        assert not response.streaming
+        assert response.content.count(b"\n") == 1
+
+    def test_bad_fields_before_stream(self, host_client, url, participants):
+        response = host_client.get(url, {"fields": "nope"}, HTTP_ACCEPT=NDJSON)
+        assert response.status_code == 400
+
+    def test_not_negotiated_for_writes(self, host_client, hackathon):
+        url = reverse(
+            "api:v1:hackathon_participation_request_list",
+            kwargs={"hackathon_id": hackathon.pk},
+        )
+        response = host_client.post(url, HTTP_ACCEPT=NDJSON)
+        assert response.status_code == 406
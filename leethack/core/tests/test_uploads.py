@@ -0,0 +1,102 @@
+import threading
+
+import pytest
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from rest_framework import status
+
+from leethack.users.api.v1.serializers.user import MeUpdateSerializer
+from .utils import create_test_image
+
+
+def upload(name, size):
+    return SimpleUploadedFile(
+        name, create_test_image(size=size).read(), content_type="image/jpeg"
+    )
+
+
+@pytest.fixture
+def images():
+    return {
+        "profile_picture": upload("picture.jpg", (192, 192)),
+        "profile_background": upload("background.jpg", (1920, 1080)),
+    }
+
+
+def stored_files():
+    return [
+        name
+        for directory in ("profile_pictures", "profile_backgrounds")
+        if default_storage.exists(directory)
+        for name in default_storage.listdir(directory)[1]
+    ]
+
+
+@pytest.mark.django_db
+class TestConcurrentFileUpload:
+
+    def test_files_are_stored_concurrently(self, api_client, user, images, monkeypatch):
+        # обидва завантаження мають зустрітись, послідовно це неможливо
+        barrier = threading.Barrier(2, timeout=5)
+        save = FileSystemStorage._save
+
+        def wait_and_save(storage, name, content):
+            barrier.wait()
+            return save(storage, name, content)
+
+        monkeypatch.setattr(FileSystemStorage, "_save", wait_and_save)
+        api_client.force_authenticate(user=user)
+
+        response = api_client.patch(reverse("api:v1:me_detail"), data=images)
+
+        assert response.status_code == status.HTTP_200_OK
+        user.refresh_from_db()
+        assert default_storage.exists(user.profile_picture.name)
+        assert default_storage.exists(user.profile_background.name)
+
+    def test_metadata_is_saved_with_upload(self, api_client, user, images):
+        api_client.force_authenticate(user=user)
+
+        api_client.patch(reverse("api:v1:me_detail"), data=images)
+
+        # фонова обробка ще не запускалась
+        user.refresh_from_db()
+        metadata = user.profile_background_metadata
+        assert metadata["source"] == user.profile_background.name
+        assert (metadata["width"], metadata["height"]) == (1920, 1080)
+        assert metadata["size"] == user.profile_background.size
+        assert user.profile_picture_metadata["format"] == "jpeg"
+
+    def test_failed_upload_deletes_stored_files(self, user, images, monkeypatch):
+        save = FileSystemStorage._save
+
+        def fail_background(storage, name, content):
+            if name.startswith("profile_backgrounds/"):
+                raise OSError("storage is unavailable")
+            return save(storage, name, content)
+
+        monkeypatch.setattr(FileSystemStorage, "_save", fail_background)
+        picture = user.profile_picture.name
+        serializer = MeUpdateSerializer(user, data=images, partial=True)
+        serializer.is_valid(raise_exception=True)
+
+        with pytest.raises(OSError):
+            serializer.save()
+
+        user.refresh_from_db()
+        assert user.profile_picture.name == picture
+        assert stored_files() == []
+
+    def test_failed_save_deletes_stored_files(self, user, images, monkeypatch):
+        def fail(*args, **kwargs):
+            raise RuntimeError("database is unavailable")
+
+        monkeypatch.setattr(type(user), "save", fail)
+        serializer = MeUpdateSerializer(user, data=images, partial=True)
+        serializer.is_valid(raise_exception=True)
+
+        with pytest.raises(RuntimeError):
+            serializer.save()
+
+        assert stored_files() == []
@@ -1,16 +1,113 @@
+import struct
+import zlib
+
 import pytest
+from PIL import Image
 from rest_framework.exceptions import ValidationError
-from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.uploadedfile import SimpleUploadedFile, TemporaryUploadedFile
 
 from .utils import create_test_image
+from ..utils import build_image_validators
 from ..validators import (
     ImageRatioValidator,
     ImageFormatValidator,
     MinResolutionValidator,
     MaxImageSizeValidator,
+    MaxPixelsValidator,
+    ImageInfo,
+    inspect_image,
 )
 
 
+def create_pixel_bomb(width, height):
+    # маленький PNG, у заголовку (IHDR) якого підмінені розміри
+    data = create_test_image(size=(1, 1), fmt="PNG").read()
+    ihdr = b"IHDR" + struct.pack(">II", width, height) + data[24:29]
+    crc = struct.pack(">I", zlib.crc32(ihdr))
+    return data[:12] + ihdr + crc + data[33:]
+
+
+@pytest.fixture
+def count_image_opens(monkeypatch):
+    calls = []
+    original_open = Image.open
+
+    def counting_open(*args, **kwargs):
+        calls.append(args)
+        return original_open(*args, **kwargs)
+
+    monkeypatch.setattr(Image, "open", counting_open)
+    return calls
+
+
+class TestInspectImage:
+
+    def test_returns_format_and_size(self):
+        image_file = create_test_image(size=(300, 200), fmt="PNG")
+        uploaded_file = SimpleUploadedFile("test.png", image_file.read())
+
+        assert inspect_image(uploaded_file) == ImageInfo("PNG", 300, 200)
+        assert uploaded_file.tell() == 0
+
+    def test_validator_chain_parses_image_once(self, count_image_opens):
+        image_file = create_test_image(size=(200, 200))
+        uploaded_file = SimpleUploadedFile("test.jpg", image_file.read())
+        config = {
+            "allowed_formats": {"jpeg"},
+            "ratio": (1 / 1, "1:1"),
+            "min_width": 100,
+            "min_height": 100,
+            "max_size_mb": 1,
+        }
+
+        for validator in build_image_validators(config):
+            validator(uploaded_file)
+        assert len(count_image_opens) == 1
+
+    def test_invalid_image_is_parsed_once(self, count_image_opens):
+        invalid_file = SimpleUploadedFile("invalid.jpg", b"not an image content")
+
+        for _ in range(3):
+            with pytest.raises(ValidationError):
+                inspect_image(invalid_file)
+        assert len(count_image_opens) == 1
+
+    def test_temporary_uploaded_file(self):
+        image_file = create_test_image(size=(300, 200))
+        uploaded_file = TemporaryUploadedFile("test.jpg", "image/jpeg", 0, None)
+        uploaded_file.write(image_file.read())
+
+        assert inspect_image(uploaded_file) == ImageInfo("JPEG", 300, 200)
+        uploaded_file.close()
+
+
+class TestMaxPixelsValidator:
+
+    def test_error(self):
+        uploaded_file = SimpleUploadedFile("bomb.png", create_pixel_bomb(5000, 5000))
+
+        validator = MaxPixelsValidator({"max_pixels": 4096 * 4096})
+        with pytest.raises(ValidationError) as exc_info:
+            validator(uploaded_file)
+        assert "16.8 megapixels" in str(exc_info.value)
+
+    def test_no_error(self):
+        image_file = create_test_image(size=(200, 200))
+        uploaded_file = SimpleUploadedFile("test.jpg", image_file.read())
+
+        validator = MaxPixelsValidator({"max_pixels": 200 * 200})
+        validator(uploaded_file)
+
+    def test_rejects_before_decoding(self, monkeypatch):
+        uploaded_file = SimpleUploadedFile("bomb.png", create_pixel_bomb(5000, 5000))
+        monkeypatch.setattr(
+            Image.Image, "load", lambda self: pytest.fail("image was decoded")
+        )
+
+        with pytest.raises(ValidationError):
+            MaxPixelsValidator({"max_pixels": 4096 * 4096})(uploaded_file)
+
+
 class TestImageRatioValidator:
 
     def test_invalid_image(self):
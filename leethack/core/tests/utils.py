@@ -47,3 +47,101 @@ def create_test_image(
             current_size = (int(current_size[0] * 1.5), int(current_size[1] * 1.5))
 
     raise ValueError("Cannot reach target size with current parameters.")
+
+
+def get_view(view_class, user=None, query_params=None, **kwargs):
+    """Return an initialized view instance for a GET request."""
+    from django.contrib.auth.models import AnonymousUser
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory, force_authenticate
+
+    django_request = APIRequestFactory().get("/", query_params or {})
+    force_authenticate(django_request, user=user or AnonymousUser())
+    view = view_class(kwargs=kwargs, format_kwarg=None)
+    view.request = Request(django_request)
+    view.request.user = user or AnonymousUser()
+    return view
+
+
+def get_view_queryset(view_class, user=None, query_params=None, **kwargs):
+    """Return the page queryset a list view would issue for given request."""
+    view = get_view(view_class, user, query_params, **kwargs)
+    queryset = view.filter_queryset(view.get_queryset())
+    return queryset[: view.paginator.get_page_size(view.request)]
+
+
+def get_page_sql(view_class, user, query_params=None, **kwargs):
+    """Return the SQL of the page query a GET to a list view runs."""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.test import APIRequestFactory, force_authenticate
+
+    request = APIRequestFactory().get("/", query_params or {})
+    force_authenticate(request, user=user)
+    with CaptureQueriesContext(connection) as queries:
+        response = view_class.as_view()(request, **kwargs)
+        response.render()
+    assert response.status_code == 200, response.data
+    model = view_class.queryset.model
+    return next(
+        query["sql"]
+        for query in queries.captured_queries
+        if "LIMIT" in query["sql"] and model._meta.db_table in query["sql"]
+    )
+
+
+def iter_plan_nodes(plan):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from iter_plan_nodes(child)
+
+
+def get_scanned_relations(node):
+    return {
+        child["Relation Name"]
+        for child in iter_plan_nodes(node)
+        if "Relation Name" in child
+    }
+
+
+def explain(query):
+    import json
+
+    from django.db import connection
+
+    if not isinstance(query, str):
+        return json.loads(query.explain(format="json"))[0]["Plan"]
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {query}")
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+def assert_plan_uses_indexes(query, large_tables, max_sort_rows=1000):
+    """
+    Run EXPLAIN on a queryset (or SQL) and fail if the plan reads any of
+    large_tables with a sequential scan or sorts more than max_sort_rows
+    rows read from one of them, directly or through joins.
+    """
+    import json
+
+    plan = explain(query)
+    problems = []
+
+    for node in iter_plan_nodes(plan):
+        node_type = node["Node Type"]
+        if node_type == "Seq Scan" and node["Relation Name"] in large_tables:
+            problems.append(f"Seq Scan on {node['Relation Name']}")
+        if node_type in ("Sort", "Incremental Sort"):
+            # кілька рядків, знайдених за умовою індексу, сортувати дешево
+            rows = node["Plans"][0]["Plan Rows"]
+            relations = get_scanned_relations(node) & large_tables
+            if relations and rows > max_sort_rows:
+                problems.append(
+                    f"{node_type} of {rows} rows from "
+                    f"{', '.join(sorted(relations))} by {node['Sort Key']}"
+                )
+
+    assert not problems, "\n".join(problems) + "\n" + json.dumps(plan, indent=2)
@@ -0,0 +1,63 @@
+from django.conf import settings
+from django.core.files.uploadhandler import FileUploadHandler
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class UploadTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = _("Uploaded file is too large.")
+    default_code = "upload_too_large"
+
+
+def get_max_upload_bytes(config: dict) -> int:
+    return int(config["max_size_mb"] * 1024 * 1024)
+
+
+class LimitedUploadHandler(FileUploadHandler):
+    """
+    Aborts multipart parsing as soon as a file field exceeds its size limit.
+
+    Must be the first handler: chunks are passed on unchanged to the
+    following handlers (memory or temporary file), so nothing beyond the
+    limit is buffered, and the rest of the request body is never read.
+    """
+
+    def __init__(self, request=None, limits=None):
+        super().__init__(request)
+        # {field_name: max_bytes}
+        self.limits = limits or {}
+        self.field_limit = None
+        self.received = 0
+
+    def handle_raw_input(
+        self, input_data, META, content_length, boundary, encoding=None
+    ):
+        max_fields_size = settings.DATA_UPLOAD_MAX_MEMORY_SIZE
+        if not self.limits or max_fields_size is None:
+            return
+        # тіло, яке не влізе навіть у суму всіх лімітів, навіть не читаємо
+        if content_length > sum(self.limits.values()) + max_fields_size:
+            raise UploadTooLarge()
+
+    def new_file(self, field_name, *args, **kwargs):
+        super().new_file(field_name, *args, **kwargs)
+        self.field_limit = self.limits.get(field_name)
+        self.received = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.field_limit is not None and self.received > self.field_limit:
+            max_size_mb = round(self.field_limit / 1024 / 1024, 2)
+            raise UploadTooLarge(
+                {
+                    self.field_name: [
+                        _(f"Image file size must be under {max_size_mb}MB.")
+                    ]
+                }
+            )
+        return raw_data
+
+    def file_complete(self, file_size):
+        return None
@@ -4,6 +4,7 @@ from leethack.core.validators import (
     ImageFormatValidator,
     ImageRatioValidator,
     MinResolutionValidator,
+    MaxPixelsValidator,
     MaxImageSizeValidator,
     FileValidator,
 )
@@ -14,6 +15,7 @@ def build_image_validators(config: dict) -> list[FileValidator]:
         ImageFormatValidator(config),
         ImageRatioValidator(config),
         MinResolutionValidator(config),
+        MaxPixelsValidator(config),
         MaxImageSizeValidator(config),
     ]
 
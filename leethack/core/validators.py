@@ -1,32 +1,105 @@
 from PIL import Image, UnidentifiedImageError
-from django.core.files.uploadedfile import InMemoryUploadedFile, SimpleUploadedFile
+from django.core.files.uploadedfile import UploadedFile
 from rest_framework.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 import math
-
-from typing import Protocol, Union
+from dataclasses import dataclass
+from io import BytesIO
+
+from typing import Protocol
+
+from leethack.core.imagepool import ImageJobTimeout, run_in_image_pool
+
+# атрибут файлу, в якому кешується результат inspect_image
+IMAGE_INFO_ATTR = "_image_info"
+INVALID_IMAGE = object()
+# розбір заголовка має займати мілісекунди
+INSPECT_TIMEOUT = 10
+
+
+@dataclass(frozen=True)
+class ImageInfo:
+    format: str | None
+    width: int
+    height: int
+
+
+def read_image_info(source) -> ImageInfo:
+    # source - шлях до тимчасового файлу або вміст файлу в пам'яті,
+    # бо сам UploadedFile не передається в інший процес
+    if isinstance(source, bytes):
+        source = BytesIO(source)
+    with Image.open(source) as image:
+        info = ImageInfo(image.format, image.width, image.height)
+        image.verify()
+    return info
+
+
+def read_header_info(data: bytes) -> ImageInfo:
+    # data - лише початок файлу, тож verify() тут неможливий
+    with Image.open(BytesIO(data)) as image:
+        return ImageInfo(image.format, image.width, image.height)
+
+
+def get_image_source(file):
+    if hasattr(file, "temporary_file_path"):
+        # інший процес читає файл з диска, тож буфер має бути скинутий
+        file.flush()
+        return file.temporary_file_path()
+    file.seek(0)
+    return file.read()
+
+
+def inspect_image(file) -> ImageInfo:
+    """
+    Parse image header once and cache format and dimensions on the file.
+
+    Only the header is read and `verify()` checks the container structure,
+    pixel data is not decoded. Parsing runs in the image process pool. Every
+    validator in the chain reads the cached result, so an upload is parsed
+    once regardless of the number of validators.
+    """
+    info = getattr(file, IMAGE_INFO_ATTR, None)
+    if info is INVALID_IMAGE:
+        raise ValidationError(_("Invalid or corrupted image file."))
+    if info is not None:
+        return info
+
+    # forms.ImageField вже відкрив і перевірив файл, повторно не парсимо
+    image = getattr(file, "image", None)
+    if isinstance(image, Image.Image):
+        info = ImageInfo(image.format, image.width, image.height)
+        setattr(file, IMAGE_INFO_ATTR, info)
+        return info
+
+    try:
+        info = run_in_image_pool(
+            read_image_info, get_image_source(file), timeout=INSPECT_TIMEOUT
+        )
+    except (
+        UnidentifiedImageError,
+        OSError,
+        Image.DecompressionBombError,
+        ImageJobTimeout,
+    ):
+        setattr(file, IMAGE_INFO_ATTR, INVALID_IMAGE)
+        raise ValidationError(_("Invalid or corrupted image file."))
+    finally:
+        file.seek(0)
+
+    setattr(file, IMAGE_INFO_ATTR, info)
+    return info
 
 
 class FileValidator(Protocol):
     # вимагає щоб будь-який клас, який відповідає інтерфейсу `__call__(file)`
     # автоматично задовільняв цей протокол - навіть без явного наслідування.
-    def __call__(
-        self, file: Union[InMemoryUploadedFile, SimpleUploadedFile]
-    ) -> None: ...
+    def __call__(self, file: UploadedFile) -> None: ...
 
 
 class BaseImageValidator(FileValidator):
-    def open_image(self, file):
-        try:
-            image = Image.open(file)
-            image.verify()
-            file.seek(0)
-            image = Image.open(file)
-            image.load()
-            file.seek(0)
-            return image
-        except (UnidentifiedImageError, OSError):
-            raise ValidationError(_("Invalid or corrupted image file."))
+    def inspect_image(self, file) -> ImageInfo:
+        return inspect_image(file)
 
 
 class ImageRatioValidator(BaseImageValidator):
@@ -37,7 +110,7 @@ class ImageRatioValidator(BaseImageValidator):
         return self.validate(file)
 
     def validate(self, file):
-        image = self.open_image(file)
+        image = self.inspect_image(file)
         if not math.isclose(image.width / image.height, self.ratio[0], rel_tol=1e-2):
             raise ValidationError(
                 _(f"Image must have {self.ratio[1]} resolution ratio.")
@@ -52,7 +125,7 @@ class ImageFormatValidator(BaseImageValidator):
         return self.validate(file)
 
     def validate(self, file):
-        image = self.open_image(file)
+        image = self.inspect_image(file)
         if not image.format:
             raise ValidationError(_("Could not determine image format."))
 
@@ -75,13 +148,31 @@ class MinResolutionValidator(BaseImageValidator):
         return self.validate(file)
 
     def validate(self, file):
-        image = self.open_image(file)
+        image = self.inspect_image(file)
         if image.width < self.min_width or image.height < self.min_height:
             raise ValidationError(
                 _(f"Image must be at least {self.min_width}x{self.min_height}.")
             )
 
 
+class MaxPixelsValidator(BaseImageValidator):
+    def __init__(self, config: dict):
+        self.max_pixels = config.get("max_pixels")
+
+    def __call__(self, file):
+        return self.validate(file)
+
+    def validate(self, file):
+        if not self.max_pixels:
+            return
+        image = self.inspect_image(file)
+        if image.width * image.height > self.max_pixels:
+            megapixels = round(self.max_pixels / 1_000_000, 1)
+            raise ValidationError(
+                _(f"Image must have at most {megapixels} megapixels.")
+            )
+
+
 class MaxImageSizeValidator:
     def __init__(self, config: dict):
         self.max_size_mb = config.get("max_size_mb")
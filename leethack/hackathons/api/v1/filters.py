@@ -1,7 +1,13 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
 from django.utils import timezone
 from django_filters import rest_framework as filters
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
 
-from leethack.hackathons.models import Hackathon
+from leethack.hackathons.models import Hackathon, SEARCH_CONFIG
 
 
 class HackathonFilterSet(filters.FilterSet):
@@ -34,3 +40,53 @@ class HackathonFilterSet(filters.FilterSet):
         qs = queryset.exclude(winner__isnull=True)
         qs = qs.filter(winner__user__username=value)
         return qs
+
+
+class HackathonSearchFilter(BaseFilterBackend):
+    """
+    Full-text search over title and description of hackathon.
+    Uses GIN-indexed search_vector and orders results by relevance
+    unless client requests explicit ordering.
+    """
+
+    search_param = "q"
+    # старі клієнти шукають через параметр SearchFilter
+    legacy_search_param = "search"
+    search_description = "Full-text search in title and description."
+
+    def get_search_terms(self, request):
+        params = request.query_params
+        value = params.get(self.search_param) or params.get(self.legacy_search_param)
+        return re.findall(r"\w+", value or "")
+
+    def build_query(self, terms):
+        # останнє слово шукаємо як префікс, щоб пошук працював під час набору
+        tokens = [*terms[:-1], f"{terms[-1]}:*"]
+        return SearchQuery(" & ".join(tokens), search_type="raw", config=SEARCH_CONFIG)
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+
+        query = self.build_query(terms)
+        queryset = queryset.filter(search_vector=query).annotate(
+            # double precision замість real, щоб значення точно проходило
+            # через курсор keyset пагінації
+            rank=Cast(SearchRank(F("search_vector"), query), FloatField())
+        )
+
+        if OrderingFilter.ordering_param not in request.query_params:
+            queryset = queryset.order_by("-rank", *queryset.query.order_by)
+        return queryset
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.search_param,
+                "required": False,
+                "in": "query",
+                "description": self.search_description,
+                "schema": {"type": "string"},
+            }
+        ]
@@ -3,6 +3,12 @@ from rest_framework import serializers
 from rest_framework.fields import empty
 
 from leethack.participations.models import Participant
+from leethack.core.api.fields import (
+    ImageMetadataField,
+    ImageUploadField,
+    ImageVariantsField,
+)
+from leethack.core.api.uploads import ConcurrentFileUploadMixin
 from leethack.core.utils import build_image_validators
 from .nested import CategoryNestedSerializer
 from leethack.hackathons.models import Hackathon
@@ -42,6 +48,12 @@ class BaseHackathonReadSerializer(serializers.Serializer):
     image = serializers.ImageField(
         help_text="URL of the image stored in Cloudflare R2."
     )
+    image_variants = ImageVariantsField(
+        "image", help_text="URLs of resized image variants."
+    )
+    image_metadata = ImageMetadataField(
+        "image", help_text="Dimensions, colour and placeholder of the image."
+    )
 
 
 class HackathonListSerializer(BaseHackathonReadSerializer):
@@ -59,13 +71,13 @@ class HackathonRetrieveSerializer(BaseHackathonReadSerializer):
     description = serializers.CharField(help_text="Description of hackathon.")
 
 
-class HackathonCreateSerializer(serializers.ModelSerializer):
+class HackathonCreateSerializer(ConcurrentFileUploadMixin, serializers.ModelSerializer):
     """
     Serializer for creating hackathon.
     Validates image using custom validators.
     """
 
-    image = serializers.ImageField(
+    image = ImageUploadField(
         validators=build_image_validators(settings.HACKATHON_IMAGE_CONFIG),
         help_text="Image of hackathon.",
     )
@@ -84,7 +96,7 @@ class HackathonCreateSerializer(serializers.ModelSerializer):
         )
 
 
-class HackathonUpdateSerializer(serializers.ModelSerializer):
+class HackathonUpdateSerializer(ConcurrentFileUploadMixin, serializers.ModelSerializer):
     """
     Serializer for updating hackathons.
     Validates winner field against hackathon participants and image.
@@ -95,7 +107,7 @@ class HackathonUpdateSerializer(serializers.ModelSerializer):
         required=False,
         help_text="UUID of Participant instance.",
     )
-    image = serializers.ImageField(
+    image = ImageUploadField(
         validators=build_image_validators(settings.HACKATHON_IMAGE_CONFIG),
         required=False,
         help_text="New image of hackathon.",
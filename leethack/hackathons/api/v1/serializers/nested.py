@@ -1,5 +1,7 @@
 from rest_framework import serializers
 
+from leethack.core.api.fields import ImageMetadataField
+
 
 class CategoryNestedSerializer(serializers.Serializer):
     """Nested serializer for Category model."""
@@ -18,3 +20,6 @@ class HackathonNestedSerializer(serializers.Serializer):
         help_text="Nested detail representation of category."
     )
     image = serializers.ImageField(help_text="URL of image stored in Cloudflare R2.")
+    image_metadata = ImageMetadataField(
+        "image", help_text="Dimensions, colour and placeholder of the image."
+    )
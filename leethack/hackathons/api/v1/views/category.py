@@ -1,11 +1,19 @@
 from rest_framework import generics, filters
 
+from leethack.core.api.cache import AnonymousListCacheMixin
+from leethack.core.api.sideload import SideloadListMixin
+from leethack.core.api.sparse import SparseFieldsetMixin
 from .pagination import CategoryPagination
 from ..serializers import CategoryListSerializer
 from leethack.hackathons.models import Category
 
 
-class CategoryListAPIView(generics.ListAPIView):
+class CategoryListAPIView(
+    AnonymousListCacheMixin,
+    SideloadListMixin,
+    SparseFieldsetMixin,
+    generics.ListAPIView,
+):
     """
     GET: Return paginated list of categories. Any user can perform this action.
     """
@@ -1,6 +1,14 @@
+from django.conf import settings
 from rest_framework import generics, permissions
 
+from leethack.core.api.cache import AnonymousListCacheMixin
+from leethack.core.api.compiler import CompiledListMixin
+from leethack.core.api.conditional import ConditionalRequestMixin
 from leethack.core.api.permissions import ReadOnly
+from leethack.core.api.planner import PlannedQuerySetMixin
+from leethack.core.api.sideload import SideloadListMixin
+from leethack.core.api.sqljson import SQLJSONListMixin
+from leethack.core.api.uploads import UploadLimitMixin
 from .mixins import HackathonFilterMixin
 from ..permissions import IsHackathonHost
 from ..serializers import (
@@ -14,13 +22,19 @@ from leethack.hackathons.models import Hackathon
 from leethack.users.api.v1.permissions import IsHost
 
 
-class HackathonQuerySetMixin:
-    def get_queryset(self):
-        return Hackathon.objects.select_related("category", "host", "winner")
+class HackathonQuerySetMixin(PlannedQuerySetMixin):
+    queryset = Hackathon.objects.all()
 
 
 class HackathonListCreateAPIView(
-    HackathonQuerySetMixin, HackathonFilterMixin, generics.ListCreateAPIView
+    AnonymousListCacheMixin,
+    SideloadListMixin,
+    SQLJSONListMixin,
+    CompiledListMixin,
+    UploadLimitMixin,
+    HackathonQuerySetMixin,
+    HackathonFilterMixin,
+    generics.ListCreateAPIView,
 ):
     """
     GET: Return paginated list of hackathons.
@@ -31,6 +45,7 @@ class HackathonListCreateAPIView(
     permission_classes = [ReadOnly | permissions.IsAdminUser | IsHost]
     pagination_class = HackathonPagination
     ordering = ("start_datetime",)
+    upload_limits = {"image": settings.HACKATHON_IMAGE_CONFIG}
 
     def get_serializer_class(self):
         if self.request.method == "GET":
@@ -42,7 +57,10 @@ class HackathonListCreateAPIView(
 
 
 class HackathonDetailAPIView(
-    HackathonQuerySetMixin, generics.RetrieveUpdateDestroyAPIView
+    ConditionalRequestMixin,
+    UploadLimitMixin,
+    HackathonQuerySetMixin,
+    generics.RetrieveUpdateDestroyAPIView,
 ):
     """
     GET: Retrieve detailed information about a specific hackathon.
@@ -52,9 +70,8 @@ class HackathonDetailAPIView(
     """
 
     permission_classes = [ReadOnly | permissions.IsAdminUser | IsHackathonHost]
-
-    def get_queryset(self):
-        return super().get_queryset().select_related("winner__user")
+    etag_related = ("category", "host", "winner", "winner__user")
+    upload_limits = {"image": settings.HACKATHON_IMAGE_CONFIG}
 
     def get_serializer_class(self):
         if self.request.method == "GET":
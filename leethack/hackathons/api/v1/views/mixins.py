@@ -1,17 +1,15 @@
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
 
-from ..filters import HackathonFilterSet
+from ..filters import HackathonFilterSet, HackathonSearchFilter
 
 
 class HackathonFilterMixin:
     filter_backends = (
         DjangoFilterBackend,
         filters.OrderingFilter,
-        filters.SearchFilter,
+        HackathonSearchFilter,
     )
     filterset_class = HackathonFilterSet
-    # TODO: move search in description in SearchVector
-    search_fields = ("title", "description")
     ordering_fields = ("start_datetime", "end_datetime", "prize")
     ordering = ("-end_datetime",)
@@ -1,7 +1,9 @@
 from rest_framework.pagination import PageNumberPagination
 
+from leethack.core.api.pagination import KeysetPageNumberPagination
 
-class HackathonPagination(PageNumberPagination):
+
+class HackathonPagination(KeysetPageNumberPagination):
     page_size = 30
     page_size_query_param = "page_size"
     max_page_size = 200
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.1 on 2026-10-18 08:32
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hackathons", "0005_alter_hackathon_image"),
+        (
+            "participations",
+            "0002_remove_participationrequest_unique_participation_request_user_hackathon_and_more",
+        ),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="hackathon",
+            name="search_vector",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.contrib.postgres.search.CombinedSearchVector(
+                    django.contrib.postgres.search.SearchVector(
+                        "title", config="english", weight="A"
+                    ),
+                    "||",
+                    django.contrib.postgres.search.SearchVector(
+                        "description", config="english", weight="B"
+                    ),
+                    django.contrib.postgres.search.SearchConfig("english"),
+                ),
+                output_field=django.contrib.postgres.search.SearchVectorField(),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="hackathon",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="hackathon_search_vector_gin"
+            ),
+        ),
+    ]
@@ -0,0 +1,91 @@
+# Generated by Django 5.2.1 on 2026-10-18 08:35
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hackathons", "0006_hackathon_search_vector"),
+        (
+            "participations",
+            "0002_remove_participationrequest_unique_participation_request_user_hackathon_and_more",
+        ),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="hackathon",
+            name="category",
+            field=models.ForeignKey(
+                db_index=False,
+                help_text="Category of hackathon.",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                to="hackathons.category",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="hackathon",
+            name="host",
+            field=models.ForeignKey(
+                db_index=False,
+                help_text="Organizer of hackathon.",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="hosted_hackathons",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="hackathon",
+            name="winner",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="won_hackathons",
+                to="participations.participant",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="hackathon",
+            index=models.Index(
+                fields=["start_datetime", "id"], name="hackathon_start_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="hackathon",
+            index=models.Index(
+                fields=["end_datetime", "id"], name="hackathon_end_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="hackathon",
+            index=models.Index(fields=["prize", "id"], name="hackathon_prize_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="hackathon",
+            index=models.Index(
+                fields=["host", "end_datetime", "id"], name="hackathon_host_end_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="hackathon",
+            index=models.Index(
+                fields=["category", "start_datetime", "id"],
+                name="hackathon_category_start_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="hackathon",
+            index=models.Index(
+                condition=models.Q(("winner__isnull", False)),
+                fields=["winner"],
+                name="hackathon_winner_idx",
+            ),
+        ),
+    ]
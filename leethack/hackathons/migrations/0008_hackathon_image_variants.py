@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 08:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hackathons", "0007_list_query_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="hackathon",
+            name="image_variants",
+            field=models.JSONField(default=dict, editable=False),
+        ),
+    ]
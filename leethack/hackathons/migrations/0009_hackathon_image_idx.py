@@ -0,0 +1,20 @@
+# Generated by Django 5.2.1 on 2026-10-18 09:33
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hackathons", "0008_hackathon_image_variants"),
+        ("participations", "0003_list_query_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="hackathon",
+            index=models.Index(fields=["image"], name="hackathon_image_idx"),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 09:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hackathons", "0009_hackathon_image_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="hackathon",
+            name="image_metadata",
+            field=models.JSONField(default=dict, editable=False),
+        ),
+    ]
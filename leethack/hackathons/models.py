@@ -2,6 +2,8 @@ import os
 import uuid
 
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
@@ -31,6 +33,9 @@ class Category(UUIDModel, TimestampedModel):
         super().save(*args, **kwargs)
 
 
+SEARCH_CONFIG = "english"
+
+
 def upload_hackathon_image(instance, filename):
     unique_filename = generate_unique_filename(filename)
     return os.path.join("hackathons/", unique_filename)
@@ -41,6 +46,8 @@ class Hackathon(UUIDModel, TimestampedModel):
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
         related_name="hosted_hackathons",
+        # покривається індексом hackathon_host_end_idx
+        db_index=False,
         help_text=_("Organizer of hackathon."),
     )
     title = models.CharField(max_length=255, help_text=_("Title of hackathon."))
@@ -49,6 +56,8 @@ class Hackathon(UUIDModel, TimestampedModel):
         "Category",
         on_delete=models.SET_NULL,
         null=True,
+        # покривається індексом hackathon_category_start_idx
+        db_index=False,
         help_text=_("Category of hackathon."),
     )
     prize = models.PositiveIntegerField(help_text=_("Prize for winning hackathon."))
@@ -62,9 +71,24 @@ class Hackathon(UUIDModel, TimestampedModel):
         null=True,
         blank=True,
         related_name="won_hackathons",
+        # замість повного індексу - частковий hackathon_winner_idx
+        db_index=False,
     )
     # TODO: генерувати унікальні імена для файлів
     image = models.ImageField(upload_to=upload_hackathon_image)
+    # зменшені копії (leethack.core.images), генеруються у фоні після збереження
+    image_variants = models.JSONField(default=dict, editable=False)
+    # розміри, формат, колір і placeholder (leethack.core.images.read_image_metadata)
+    image_metadata = models.JSONField(default=dict, editable=False)
+    # генерується postgres при кожному записі, тому завжди актуальний
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector("title", weight="A", config=SEARCH_CONFIG)
+            + SearchVector("description", weight="B", config=SEARCH_CONFIG)
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
 
     class Meta:
         constraints = [
@@ -73,6 +97,34 @@ class Hackathon(UUIDModel, TimestampedModel):
                 name="end_datetime_after_start_datetime",
             )
         ]
+        indexes = [
+            GinIndex(fields=("search_vector",), name="hackathon_search_vector_gin"),
+            # сортування списків разом з тай-брейкером keyset пагінації
+            models.Index(
+                fields=("start_datetime", "id"), name="hackathon_start_id_idx"
+            ),
+            models.Index(fields=("end_datetime", "id"), name="hackathon_end_id_idx"),
+            models.Index(fields=("prize", "id"), name="hackathon_prize_id_idx"),
+            # хакатони хоста (/me/hosted-hackathons/, /users/<id>/hackathons/)
+            models.Index(
+                fields=("host", "end_datetime", "id"), name="hackathon_host_end_idx"
+            ),
+            # фільтр ?category= з сортуванням за замовчуванням
+            models.Index(
+                fields=("category", "start_datetime", "id"),
+                name="hackathon_category_start_idx",
+            ),
+            # більшість хакатонів без переможця, тому частковий індекс
+            # значно менший за повний індекс FK
+            models.Index(
+                fields=("winner",),
+                condition=models.Q(winner__isnull=False),
+                name="hackathon_winner_idx",
+            ),
+            # перевірка, чи на файл ще посилаються
+            # (leethack.core.orphans)
+            models.Index(fields=("image",), name="hackathon_image_idx"),
+        ]
 
     def __str__(self):
         return self.title
@@ -1,9 +1,25 @@
-from django.db.models.signals import post_delete
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from leethack.hackathons.models import Hackathon
+from leethack.core.cache import bump_listing_version
+from leethack.core.images import delete_image_on_commit, schedule_variants
+from leethack.hackathons.models import Hackathon, Category
 
 
 @receiver(post_delete, sender=Hackathon)
 def delete_hackathon_image(sender, instance, **kwargs):
-    instance.image.delete(save=False)
+    delete_image_on_commit(instance.image, instance.image_variants)
+
+
+@receiver(post_save, sender=Hackathon)
+def generate_hackathon_image_variants(sender, instance, **kwargs):
+    schedule_variants(instance, "image", settings.HACKATHON_IMAGE_CONFIG)
+
+
+@receiver(post_save, sender=Hackathon)
+@receiver(post_delete, sender=Hackathon)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_hackathon_listings(sender, instance, **kwargs):
+    bump_listing_version()
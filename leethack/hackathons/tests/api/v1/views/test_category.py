@@ -72,3 +72,22 @@ class TestCategoryListAPIView:
         category_factory.create_batch(3)
         response = api_client.get(list_url, {"page": 100})
         assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_category_save_invalidates_cache(
+        self,
+        api_client,
+        list_url,
+        category_factory,
+        django_capture_on_commit_callbacks,
+    ):
+        category = category_factory(title="Python")
+        assert api_client.get(list_url)["X-Cache"] == "MISS"
+        assert api_client.get(list_url)["X-Cache"] == "HIT"
+
+        with django_capture_on_commit_callbacks(execute=True):
+            category.title = "Django"
+            category.save()
+
+        response = api_client.get(list_url)
+        assert response["X-Cache"] == "MISS"
+        assert response.data["results"][0]["title"] == "Django"
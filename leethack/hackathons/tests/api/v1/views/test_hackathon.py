@@ -1,12 +1,24 @@
+import base64
 import datetime
+import json
+import threading
 
 import pytest
+from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework import status
-
-from leethack.core.tests.utils import create_test_image
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from leethack.core.tests.utils import create_test_image, get_view_queryset
+from leethack.hackathons.api.v1.views import (
+    HackathonListCreateAPIView,
+    HackathonDetailAPIView,
+)
 from leethack.hackathons.models import Hackathon
 
 
@@ -103,7 +115,9 @@ class TestHackathonListCreateAPIView:
 
             response = api_client.get(list_url, {"category": ai.slug})
             assert response.status_code == status.HTTP_200_OK
-            assert {h["id"] for h in response.data["results"]} == {str(ai_hackathon.id)}
+            assert {h["id"] for h in response.json()["results"]} == {
+                str(ai_hackathon.id)
+            }
 
         @pytest.mark.parametrize("param", ["active", "past", "dasjirq"])
         def test_by_hackathon_status(
@@ -124,7 +138,7 @@ class TestHackathonListCreateAPIView:
 
             response = api_client.get(list_url, {"hackathon_status": param})
             assert response.status_code == status.HTTP_200_OK
-            assert {h["id"] for h in response.data["results"]} == expected_ids
+            assert {h["id"] for h in response.json()["results"]} == expected_ids
 
         def test_by_start_after(self, api_client, list_url, hackathon_factory):
             hackathon1 = hackathon_factory(
@@ -141,7 +155,7 @@ class TestHackathonListCreateAPIView:
             }
             response = api_client.get(list_url, query_params)
             assert response.status_code == status.HTTP_200_OK
-            assert {h["id"] for h in response.data["results"]} == {str(hackathon2.id)}
+            assert {h["id"] for h in response.json()["results"]} == {str(hackathon2.id)}
 
         def test_by_end_before(self, api_client, list_url, hackathon_factory):
             hackathon1 = hackathon_factory(
@@ -158,7 +172,7 @@ class TestHackathonListCreateAPIView:
             }
             response = api_client.get(list_url, query_params)
             assert response.status_code == status.HTTP_200_OK
-            assert {h["id"] for h in response.data["results"]} == {str(hackathon1.id)}
+            assert {h["id"] for h in response.json()["results"]} == {str(hackathon1.id)}
 
         def test_by_winner(
             self,
@@ -174,10 +188,99 @@ class TestHackathonListCreateAPIView:
 
             response = api_client.get(list_url, {"winner": "john"})
             assert response.status_code == status.HTTP_200_OK
-            assert {h["id"] for h in response.data["results"]} == {
+            assert {h["id"] for h in response.json()["results"]} == {
                 str(john_hackathon.id)
             }
 
+    class TestSearch:
+
+        def test_matches_title_and_description(
+            self, api_client, list_url, hackathon_factory
+        ):
+            by_title = hackathon_factory(title="Robotics challenge")
+            by_description = hackathon_factory(description="Build robots together.")
+            hackathon_factory(title="Design sprint", description="Posters.")
+
+            response = api_client.get(list_url, {"q": "robot"})
+            assert response.status_code == status.HTTP_200_OK
+            assert {h["id"] for h in response.json()["results"]} == {
+                str(by_title.id),
+                str(by_description.id),
+            }
+
+        def test_title_match_ranked_above_description_match(
+            self, api_client, list_url, hackathon_factory
+        ):
+            by_description = hackathon_factory(
+                title="Weekend event", description="Blockchain tooling."
+            )
+            by_title = hackathon_factory(
+                title="Blockchain weekend", description="Tooling."
+            )
+
+            response = api_client.get(list_url, {"q": "blockchain"})
+            assert [h["id"] for h in response.json()["results"]] == [
+                str(by_title.id),
+                str(by_description.id),
+            ]
+
+        def test_prefix_of_last_word_matches(
+            self, api_client, list_url, hackathon_factory
+        ):
+            hackathon = hackathon_factory(title="Quantum computing cup")
+
+            response = api_client.get(list_url, {"q": "quantum comp"})
+            assert {h["id"] for h in response.json()["results"]} == {str(hackathon.id)}
+
+        def test_legacy_search_param(self, api_client, list_url, hackathon_factory):
+            hackathon = hackathon_factory(title="Robotics challenge")
+            hackathon_factory(title="Design sprint")
+
+            response = api_client.get(list_url, {"search": "robotics"})
+            assert {h["id"] for h in response.json()["results"]} == {str(hackathon.id)}
+
+        def test_combines_with_filters(
+            self, api_client, list_url, hackathon_factory, category_factory
+        ):
+            ai = category_factory(title="AI")
+            hackathon = hackathon_factory(title="Robotics challenge", category=ai)
+            hackathon_factory(title="Robotics league")
+
+            response = api_client.get(list_url, {"q": "robotics", "category": ai.slug})
+            assert {h["id"] for h in response.json()["results"]} == {str(hackathon.id)}
+
+        def test_explicit_ordering_overrides_relevance(
+            self, api_client, list_url, hackathon_factory
+        ):
+            hackathon_factory(title="Robotics", prize=100, description="Robotics.")
+            hackathon_factory(title="Robotics cup", prize=300)
+            hackathon_factory(title="Weekend", prize=200, description="Robotics.")
+
+            response = api_client.get(list_url, {"q": "robotics", "ordering": "prize"})
+            prizes = [h["prize"] for h in response.json()["results"]]
+            assert prizes == [100, 200, 300]
+
+        def test_keyset_pagination_by_relevance(
+            self, api_client, list_url, hackathon_factory
+        ):
+            hackathons = [
+                hackathon_factory(title="Robotics", description="Robotics robotics."),
+                hackathon_factory(title="Robotics cup", description="Robotics."),
+                hackathon_factory(title="Weekend", description="Robotics."),
+                hackathon_factory(title="Weekend", description="Robotics."),
+            ]
+            hackathon_factory(title="Design sprint")
+
+            params = {"q": "robotics", "pagination": "cursor", "page_size": 1}
+            response = api_client.get(list_url, params)
+            ids = [h["id"] for h in response.json()["results"]]
+            while response.json()["next"]:
+                response = api_client.get(response.json()["next"])
+                ids += [h["id"] for h in response.json()["results"]]
+
+            assert len(ids) == len(set(ids))
+            assert set(ids) == {str(h.id) for h in hackathons}
+
     def test_create_invalid_data_returns_400(
         self, api_client, list_url, host, past_date, future_date
     ):
@@ -208,9 +311,9 @@ class TestHackathonListCreateAPIView:
         hackathon_factory.create_batch(5)
         response = api_client.get(list_url, {"page_size": 2})
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data["results"]) == 2
-        assert "count" in response.data
-        assert response.data["count"] == 5
+        assert len(response.json()["results"]) == 2
+        assert "count" in response.json()
+        assert response.json()["count"] == 5
 
     def test_ordering_by_prize_asc(self, api_client, list_url, hackathon_factory):
         hackathon_factory(prize="500")
@@ -219,7 +322,7 @@ class TestHackathonListCreateAPIView:
 
         response = api_client.get(list_url, {"ordering": "prize"})
         assert response.status_code == status.HTTP_200_OK
-        prizes = [hackathon["prize"] for hackathon in response.data["results"]]
+        prizes = [hackathon["prize"] for hackathon in response.json()["results"]]
         assert prizes == sorted(prizes)
 
     def test_ordering_by_prize_desc(self, api_client, list_url, hackathon_factory):
@@ -229,9 +332,302 @@ class TestHackathonListCreateAPIView:
 
         response = api_client.get(list_url, {"ordering": "-prize"})
         assert response.status_code == status.HTTP_200_OK
-        prizes = [hackathon["prize"] for hackathon in response.data["results"]]
+        prizes = [hackathon["prize"] for hackathon in response.json()["results"]]
         assert prizes == sorted(prizes, reverse=True)
 
+    class TestQueryPlan:
+
+        def count_queries(self, api_client, url):
+            cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                response = api_client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            return len(queries)
+
+        def test_query_count_does_not_grow_with_winners(
+            self,
+            api_client,
+            list_url,
+            hackathon_factory,
+            participant_factory,
+            past_date,
+        ):
+            def create_finished():
+                hackathon = hackathon_factory(
+                    start_datetime=past_date - datetime.timedelta(days=1),
+                    end_datetime=past_date,
+                )
+                hackathon.winner = participant_factory(hackathon=hackathon)
+                hackathon.save()
+
+            create_finished()
+            expected = self.count_queries(api_client, list_url)
+
+            for _ in range(4):
+                create_finished()
+            assert self.count_queries(api_client, list_url) == expected
+
+        def test_list_defers_description(self, hackathon):
+            queryset = get_view_queryset(HackathonListCreateAPIView)
+            assert "description" in queryset[0].get_deferred_fields()
+
+    class TestKeysetPagination:
+
+        def collect_pages(self, api_client, url, params):
+            response = api_client.get(url, params)
+            assert response.status_code == status.HTTP_200_OK
+            assert "count" not in response.json()
+
+            pages = [response.json()["results"]]
+            while response.json()["next"]:
+                response = api_client.get(response.json()["next"])
+                assert response.status_code == status.HTTP_200_OK
+                pages.append(response.json()["results"])
+            return pages, response
+
+        @pytest.mark.parametrize(
+            "ordering",
+            [
+                "start_datetime",
+                "-start_datetime",
+                "end_datetime",
+                "-end_datetime",
+                "prize",
+                "-prize",
+            ],
+        )
+        def test_walks_all_rows_in_order(
+            self, api_client, list_url, hackathon_factory, ordering
+        ):
+            # однакові призи перевіряють тай-брейкер по id
+            for prize in (100, 100, 100, 200, 200, 300, 400):
+                hackathon_factory(prize=prize)
+
+            params = {"pagination": "cursor", "page_size": 2, "ordering": ordering}
+            pages, _ = self.collect_pages(api_client, list_url, params)
+            keyset_ids = [h["id"] for page in pages for h in page]
+
+            tie_breaker = "-id" if ordering.startswith("-") else "id"
+            expected_ids = [
+                str(pk)
+                for pk in Hackathon.objects.order_by(ordering, tie_breaker).values_list(
+                    "id", flat=True
+                )
+            ]
+
+            assert len(pages) == 4
+            assert keyset_ids == expected_ids
+
+        def test_previous_link_returns_previous_page(
+            self, api_client, list_url, hackathon_factory
+        ):
+            hackathon_factory.create_batch(5)
+            params = {"pagination": "cursor", "page_size": 2, "ordering": "prize"}
+
+            first = api_client.get(list_url, params)
+            assert first.json()["previous"] is None
+
+            second = api_client.get(first.json()["next"])
+            previous = api_client.get(second.json()["previous"])
+            assert previous.status_code == status.HTTP_200_OK
+            assert previous.json()["results"] == first.json()["results"]
+            assert previous.json()["previous"] is None
+            assert previous.json()["next"] is not None
+
+        def test_invalid_cursor(self, api_client, list_url):
+            response = api_client.get(list_url, {"cursor": "invalid"})
+            assert response.status_code == status.HTTP_404_NOT_FOUND
+
+        def test_cursor_from_other_ordering_is_rejected(
+            self, api_client, list_url, hackathon_factory
+        ):
+            hackathon_factory.create_batch(3)
+            params = {"pagination": "cursor", "page_size": 1, "ordering": "prize"}
+            response = api_client.get(list_url, params)
+
+            cursor = response.json()["next"].split("cursor=")[1]
+            response = api_client.get(
+                list_url, {"cursor": cursor, "ordering": "-start_datetime"}
+            )
+            assert response.status_code == status.HTTP_404_NOT_FOUND
+
+        def tamper(self, next_link, value):
+            cursor = next_link.split("cursor=")[1].split("&")[0]
+            payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * 3))
+            payload["p"][0] = value
+            data = json.dumps(payload).encode()
+            return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+        @pytest.mark.parametrize("value", [["2025-01-01"], {"a": 1}, None])
+        def test_cursor_with_wrong_value_type(
+            self, api_client, list_url, hackathon_factory, value
+        ):
+            hackathon_factory.create_batch(3)
+            params = {
+                "pagination": "cursor",
+                "page_size": 1,
+                "ordering": "start_datetime",
+            }
+            response = api_client.get(list_url, params)
+
+            cursor = self.tamper(response.json()["next"], value)
+            response = api_client.get(
+                list_url, {"cursor": cursor, "ordering": "start_datetime"}
+            )
+            assert response.status_code == status.HTTP_404_NOT_FOUND
+
+        def test_cursor_with_non_numeric_rank(
+            self, api_client, list_url, hackathon_factory
+        ):
+            hackathon_factory.create_batch(3, title="Zeta cup")
+            params = {"pagination": "cursor", "page_size": 1, "q": "zeta"}
+            response = api_client.get(list_url, params)
+
+            cursor = self.tamper(response.json()["next"], "high")
+            response = api_client.get(list_url, {"cursor": cursor, "q": "zeta"})
+            assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    class TestListCache:
+
+        def test_anonymous_response_is_cached(
+            self, api_client, list_url, hackathon_factory
+        ):
+            hackathon_factory.create_batch(2)
+
+            first = api_client.get(list_url, {"ordering": "prize"})
+            assert first["X-Cache"] == "MISS"
+
+            second = api_client.get(list_url, {"ordering": "prize"})
+            assert second["X-Cache"] == "HIT"
+            assert second.data == first.data
+
+        def test_query_params_are_normalized(
+            self, api_client, list_url, hackathon_factory
+        ):
+            hackathon_factory.create_batch(2)
+            api_client.get(f"{list_url}?ordering=prize&page_size=1")
+
+            response = api_client.get(f"{list_url}?page_size=1&ordering=prize&q=")
+            assert response["X-Cache"] == "HIT"
+
+            response = api_client.get(list_url, {"ordering": "-prize"})
+            assert response["X-Cache"] == "MISS"
+
+        def test_authenticated_user_bypasses_cache(
+            self, api_client, list_url, host, hackathon
+        ):
+            api_client.get(list_url)
+            api_client.force_authenticate(user=host)
+
+            response = api_client.get(list_url)
+            assert response.status_code == status.HTTP_200_OK
+            assert "X-Cache" not in response
+
+        def test_hackathon_save_invalidates_cache(
+            self,
+            api_client,
+            list_url,
+            hackathon,
+            django_capture_on_commit_callbacks,
+        ):
+            api_client.get(list_url)
+
+            with django_capture_on_commit_callbacks(execute=True):
+                hackathon.title = "Renamed"
+                hackathon.save()
+
+            response = api_client.get(list_url)
+            assert response["X-Cache"] == "MISS"
+            assert response.json()["results"][0]["title"] == "Renamed"
+
+        def test_winner_delete_invalidates_cache(
+            self,
+            api_client,
+            list_url,
+            hackathon,
+            participant_factory,
+            django_capture_on_commit_callbacks,
+        ):
+            hackathon.winner = participant_factory(hackathon=hackathon)
+            hackathon.save()
+            api_client.get(list_url)
+
+            with django_capture_on_commit_callbacks(execute=True):
+                hackathon.winner.delete()
+
+            response = api_client.get(list_url)
+            assert response["X-Cache"] == "MISS"
+
+        def test_last_login_does_not_invalidate_cache(
+            self,
+            api_client,
+            list_url,
+            hackathon,
+            django_capture_on_commit_callbacks,
+        ):
+            api_client.get(list_url)
+
+            with django_capture_on_commit_callbacks(execute=True):
+                hackathon.host.last_login = timezone.now()
+                hackathon.host.save(update_fields=["last_login"])
+
+            response = api_client.get(list_url)
+            assert response["X-Cache"] == "HIT"
+
+        def test_unlisted_user_field_does_not_invalidate_cache(
+            self,
+            api_client,
+            list_url,
+            hackathon,
+            django_capture_on_commit_callbacks,
+        ):
+            api_client.get(list_url)
+
+            with django_capture_on_commit_callbacks(execute=True):
+                hackathon.host.first_name = "Renamed"
+                hackathon.host.save()
+
+            response = api_client.get(list_url)
+            assert response["X-Cache"] == "HIT"
+
+        def test_listed_user_field_invalidates_cache(
+            self,
+            api_client,
+            list_url,
+            hackathon,
+            django_capture_on_commit_callbacks,
+        ):
+            api_client.get(list_url)
+
+            with django_capture_on_commit_callbacks(execute=True):
+                hackathon.host.username = "renamed"
+                hackathon.host.save()
+
+            response = api_client.get(list_url)
+            assert response["X-Cache"] == "MISS"
+            assert response.json()["results"][0]["host"]["username"] == "renamed"
+
+        def test_stale_response_is_served_while_refreshing(
+            self,
+            api_client,
+            list_url,
+            hackathon,
+            django_capture_on_commit_callbacks,
+        ):
+            first = api_client.get(list_url)
+            with django_capture_on_commit_callbacks(execute=True):
+                hackathon.title = "Renamed"
+                hackathon.save()
+
+            # імітую інший запит, який уже перераховує відповідь
+            request = Request(APIRequestFactory().get(list_url))
+            key = HackathonListCreateAPIView().get_list_cache_key(request)
+            cache.add(f"{key}:lock", 1)
+
+            response = api_client.get(list_url)
+            assert response["X-Cache"] == "STALE"
+            assert response.data == first.data
+
 
 @pytest.mark.django_db
 class TestHackathonDetailAPIView:
@@ -339,3 +735,120 @@ class TestHackathonDetailAPIView:
         assert response.status_code == status.HTTP_200_OK
         hackathon.refresh_from_db()
         assert hackathon.host == old_host
+
+    class TestConditionalRequests:
+
+        def test_get_returns_etag(self, api_client, detail_url):
+            response = api_client.get(detail_url)
+            assert response.status_code == status.HTTP_200_OK
+            assert response["ETag"]
+            # host (User) не має updated_at
+            assert "Last-Modified" not in response
+
+        def test_if_none_match_returns_304(self, api_client, detail_url):
+            etag = api_client.get(detail_url)["ETag"]
+
+            response = api_client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == status.HTTP_304_NOT_MODIFIED
+            assert response["ETag"] == etag
+            assert not response.content
+
+        def test_related_change_changes_etag(self, api_client, detail_url, hackathon):
+            etag = api_client.get(detail_url)["ETag"]
+
+            hackathon.host.first_name = "Changed"
+            hackathon.host.save()
+
+            response = api_client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == status.HTTP_200_OK
+            assert response["ETag"] != etag
+
+        def test_patch_with_matching_if_match(self, api_client, detail_url, hackathon):
+            api_client.force_authenticate(user=hackathon.host)
+            etag = api_client.get(detail_url)["ETag"]
+
+            response = api_client.patch(
+                detail_url, data={"title": "updated title"}, HTTP_IF_MATCH=etag
+            )
+            assert response.status_code == status.HTTP_200_OK
+            assert response["ETag"] != etag
+            assert api_client.get(detail_url)["ETag"] == response["ETag"]
+
+        def test_patch_with_stale_if_match_returns_412(
+            self, api_client, detail_url, hackathon
+        ):
+            api_client.force_authenticate(user=hackathon.host)
+            etag = api_client.get(detail_url)["ETag"]
+            api_client.patch(detail_url, data={"title": "first edit"})
+
+            response = api_client.patch(
+                detail_url, data={"title": "second edit"}, HTTP_IF_MATCH=etag
+            )
+            assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+            hackathon.refresh_from_db()
+            assert hackathon.title == "first edit"
+
+        @pytest.mark.django_db(transaction=True)
+        def test_concurrent_patches_with_same_if_match(
+            self, detail_url, hackathon, monkeypatch
+        ):
+            client = APIClient()
+            client.force_authenticate(user=hackathon.host)
+            etag = client.get(detail_url)["ETag"]
+
+            # перший PATCH зупиняється між перевіркою ETag і записом
+            checked, proceed = threading.Event(), threading.Event()
+            perform_update = HackathonDetailAPIView.perform_update
+
+            def paused_perform_update(view, serializer):
+                if serializer.validated_data["title"] == "first edit":
+                    checked.set()
+                    proceed.wait(5)
+                perform_update(view, serializer)
+
+            monkeypatch.setattr(
+                HackathonDetailAPIView,
+                "perform_update",
+                paused_perform_update,
+            )
+
+            responses = {}
+
+            def patch(title):
+                client = APIClient()
+                client.force_authenticate(user=hackathon.host)
+                try:
+                    responses[title] = client.patch(
+                        detail_url, data={"title": title}, HTTP_IF_MATCH=etag
+                    )
+                finally:
+                    connection.close()
+
+            first = threading.Thread(target=patch, args=("first edit",))
+            second = threading.Thread(target=patch, args=("second edit",))
+            first.start()
+            assert checked.wait(5)
+            second.start()
+            # без блокування другий PATCH встиг би пройти перевірку і записати
+            second.join(0.5)
+            proceed.set()
+            first.join(5)
+            second.join(5)
+
+            assert responses["first edit"].status_code == status.HTTP_200_OK
+            assert (
+                responses["second edit"].status_code
+                == status.HTTP_412_PRECONDITION_FAILED
+            )
+            hackathon.refresh_from_db()
+            assert hackathon.title == "first edit"
+
+    def test_patch_too_large_image_returns_413(self, api_client, detail_url, hackathon):
+        api_client.force_authenticate(user=hackathon.host)
+        image = SimpleUploadedFile(
+            "large.jpg", b"0" * (3 * 1024 * 1024), content_type="image/jpeg"
+        )
+
+        response = api_client.patch(detail_url, data={"image": image})
+        assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        assert "image" in response.data
@@ -1,4 +1,5 @@
 from django.contrib import admin
+from django.utils import timezone
 
 from leethack.participations.models import Participant, ParticipationRequest
 
@@ -36,12 +37,18 @@ class ParticipantAdmin(admin.ModelAdmin):
 
 @admin.action(description="Approve selected requests")
 def approve_requests(request, queryset):
-    queryset.update(status=ParticipationRequest.Status.APPROVED)
+    # update() обходить save(), тому updated_at (і ETag) оновлюю явно
+    queryset.update(
+        status=ParticipationRequest.Status.APPROVED, updated_at=timezone.now()
+    )
 
 
 @admin.action(description="Reject selected requests")
 def reject_requests(request, queryset):
-    queryset.update(status=ParticipationRequest.Status.REJECTED)
+    # update() обходить save(), тому updated_at (і ETag) оновлюю явно
+    queryset.update(
+        status=ParticipationRequest.Status.REJECTED, updated_at=timezone.now()
+    )
 
 
 @admin.register(ParticipationRequest)
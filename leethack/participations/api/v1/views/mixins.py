@@ -1,11 +1,12 @@
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
 
+from leethack.core.api.filters import TrigramSearchFilter
 from ..filters import ParticipationRequestFilterSet
 
 
 class ParticipantFilterMixin:
-    filter_backends = (filters.OrderingFilter, filters.SearchFilter)
+    filter_backends = (filters.OrderingFilter, TrigramSearchFilter)
     ordering_fields = ("created_at",)
     ordering = ("-created_at",)
 
@@ -14,7 +15,7 @@ class ParticipationRequestFilterMixin:
     filter_backends = (
         DjangoFilterBackend,
         filters.OrderingFilter,
-        filters.SearchFilter,
+        TrigramSearchFilter,
     )
     filterset_class = ParticipationRequestFilterSet
     ordering_fields = ("created_at",)
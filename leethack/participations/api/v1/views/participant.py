@@ -1,6 +1,10 @@
 from rest_framework import generics, permissions
 
+from leethack.core.api.compiler import CompiledListMixin
 from leethack.core.api.permissions import ReadOnly
+from leethack.core.api.planner import PlannedQuerySetMixin
+from leethack.core.api.sideload import SideloadListMixin
+from leethack.core.api.streaming import NDJSONStreamingListMixin
 from leethack.hackathons.api.v1.permissions import IsHackathonHost
 from .mixins import ParticipantFilterMixin
 from ..serializers import (
@@ -11,15 +15,21 @@ from .pagination import HackathonParticipantPagination
 from leethack.participations.models import Participant
 
 
-class HackathonParticipantQuerySetMixin:
+class HackathonParticipantQuerySetMixin(PlannedQuerySetMixin):
+    queryset = Participant.objects.all()
+
     def get_queryset(self):
-        qs = Participant.objects.filter(hackathon_id=self.kwargs["hackathon_id"])
-        qs = qs.select_related("user")
-        return qs
+        qs = super().get_queryset()
+        return qs.filter(hackathon_id=self.kwargs["hackathon_id"])
 
 
 class HackathonParticipantListAPIView(
-    HackathonParticipantQuerySetMixin, ParticipantFilterMixin, generics.ListAPIView
+    NDJSONStreamingListMixin,
+    SideloadListMixin,
+    CompiledListMixin,
+    HackathonParticipantQuerySetMixin,
+    ParticipantFilterMixin,
+    generics.ListAPIView,
 ):
     """
     GET: Return a paginated list of participant for a specific hackathon.
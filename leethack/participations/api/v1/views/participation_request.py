@@ -1,6 +1,11 @@
 from rest_framework import generics, permissions, filters
 
+from leethack.core.api.compiler import CompiledListMixin
+from leethack.core.api.conditional import ConditionalRequestMixin
 from leethack.core.api.permissions import ReadOnly, PostOnly
+from leethack.core.api.planner import PlannedQuerySetMixin
+from leethack.core.api.sideload import SideloadListMixin
+from leethack.core.api.streaming import NDJSONStreamingListMixin
 from leethack.hackathons.api.v1.permissions import IsHackathonHost
 from .mixins import ParticipationRequestFilterMixin
 from .pagination import HackathonParticipationRequestPagination
@@ -13,15 +18,18 @@ from ..serializers import (
 from leethack.participations.models import ParticipationRequest, Participant
 
 
-class HackathonParticipationRequestQuerySetMixin:
+class HackathonParticipationRequestQuerySetMixin(PlannedQuerySetMixin):
+    queryset = ParticipationRequest.objects.all()
+
     def get_queryset(self):
         hackathon_id = self.kwargs["hackathon_id"]
-        qs = ParticipationRequest.objects.filter(hackathon_id=hackathon_id)
-        qs = qs.select_related("user")
-        return qs
+        return super().get_queryset().filter(hackathon_id=hackathon_id)
 
 
 class HackathonParticipationRequestListCreateAPIView(
+    NDJSONStreamingListMixin,
+    SideloadListMixin,
+    CompiledListMixin,
     HackathonParticipationRequestQuerySetMixin,
     ParticipationRequestFilterMixin,
     generics.ListCreateAPIView,
@@ -62,7 +70,9 @@ class HackathonParticipationRequestListCreateAPIView(
 
 
 class HackathonParticipationRequestDetailAPIView(
-    HackathonParticipationRequestQuerySetMixin, generics.RetrieveUpdateDestroyAPIView
+    ConditionalRequestMixin,
+    HackathonParticipationRequestQuerySetMixin,
+    generics.RetrieveUpdateDestroyAPIView,
 ):
     """
     GET: Return detailed information about specific participation request.
@@ -72,6 +82,7 @@ class HackathonParticipationRequestDetailAPIView(
     """
 
     permission_classes = [permissions.IsAdminUser | IsHackathonHost]
+    etag_related = ("user",)
 
     def get_serializer_class(self):
         if self.request.method == "GET":
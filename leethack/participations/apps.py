@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ParticipationsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "leethack.participations"
+
+    def ready(self):
+        import leethack.participations.signals
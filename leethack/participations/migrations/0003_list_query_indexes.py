@@ -0,0 +1,97 @@
+# Generated by Django 5.2.1 on 2026-10-18 08:35
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hackathons", "0007_list_query_indexes"),
+        (
+            "participations",
+            "0002_remove_participationrequest_unique_participation_request_user_hackathon_and_more",
+        ),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="participant",
+            name="hackathon",
+            field=models.ForeignKey(
+                db_index=False,
+                help_text="Hackathon this user is participant of.",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="participants",
+                to="hackathons.hackathon",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="participant",
+            name="user",
+            field=models.ForeignKey(
+                db_index=False,
+                help_text="User who is participant",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="participants",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="participationrequest",
+            name="hackathon",
+            field=models.ForeignKey(
+                db_index=False,
+                help_text="Hackathon this user is participant of.",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="participation_requests",
+                to="hackathons.hackathon",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="participationrequest",
+            name="user",
+            field=models.ForeignKey(
+                db_index=False,
+                help_text="User who sent request",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="participation_requests",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="participant",
+            index=models.Index(
+                fields=["hackathon", "created_at"], name="participant_hackathon_created"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="participant",
+            index=models.Index(
+                fields=["user", "created_at"],
+                include=("hackathon",),
+                name="participant_user_created",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="participationrequest",
+            index=models.Index(
+                fields=["hackathon", "status", "created_at"],
+                name="request_hackathon_status_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="participationrequest",
+            index=models.Index(
+                fields=["hackathon", "created_at"], name="request_hackathon_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="participationrequest",
+            index=models.Index(
+                fields=["user", "created_at"], name="request_user_created_idx"
+            ),
+        ),
+    ]
@@ -6,16 +6,19 @@ from leethack.core.models import UUIDModel, TimestampedModel
 
 
 class Participant(UUIDModel, TimestampedModel):
+    # індекси FK покриваються складеними індексами з Meta.indexes
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
         related_name="participants",
+        db_index=False,
         help_text=_("User who is participant"),
     )
     hackathon = models.ForeignKey(
         "hackathons.Hackathon",
         on_delete=models.CASCADE,
         related_name="participants",
+        db_index=False,
         help_text=_("Hackathon this user is participant of."),
     )
 
@@ -25,6 +28,20 @@ class Participant(UUIDModel, TimestampedModel):
                 fields=("user", "hackathon"), name="unique_participant_user_hackathon"
             )
         ]
+        indexes = [
+            # учасники хакатону, відсортовані за created_at
+            models.Index(
+                fields=("hackathon", "created_at"),
+                name="participant_hackathon_created",
+            ),
+            # участі користувача; INCLUDE hackathon дозволяє index-only scan
+            # при з'єднанні в /me/participated-hackathons/
+            models.Index(
+                fields=("user", "created_at"),
+                include=("hackathon",),
+                name="participant_user_created",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.username} in {self.hackathon.title}"
@@ -36,16 +53,19 @@ class ParticipationRequest(UUIDModel, TimestampedModel):
         PENDING = ("pending", "Pending")
         REJECTED = ("rejected", "Rejected")
 
+    # індекси FK покриваються складеними індексами з Meta.indexes
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
         related_name="participation_requests",
+        db_index=False,
         help_text=_("User who sent request"),
     )
     hackathon = models.ForeignKey(
         "hackathons.Hackathon",
         on_delete=models.CASCADE,
         related_name="participation_requests",
+        db_index=False,
         help_text=_("Hackathon this user is participant of."),
     )
     status = models.CharField(
@@ -63,6 +83,21 @@ class ParticipationRequest(UUIDModel, TimestampedModel):
                 name="unique_participation_request_user_hackathon",
             )
         ]
+        indexes = [
+            # запити хакатону з фільтром ?status= та без нього
+            models.Index(
+                fields=("hackathon", "status", "created_at"),
+                name="request_hackathon_status_idx",
+            ),
+            models.Index(
+                fields=("hackathon", "created_at"),
+                name="request_hackathon_created_idx",
+            ),
+            # запити користувача (/me/requests/)
+            models.Index(
+                fields=("user", "created_at"), name="request_user_created_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.username} -> {self.hackathon.title} [{self.status}]"
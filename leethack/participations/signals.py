@@ -0,0 +1,13 @@
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+
+from leethack.core.cache import bump_listing_version
+from leethack.participations.models import Participant
+
+
+@receiver(pre_delete, sender=Participant)
+def invalidate_hackathon_listings(sender, instance, **kwargs):
+    # видалення переможця обнуляє Hackathon.winner через SET_NULL без
+    # сигналів, тому перевіряю до видалення
+    if instance.won_hackathons.exists():
+        bump_listing_version()
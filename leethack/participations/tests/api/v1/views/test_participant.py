@@ -136,6 +136,32 @@ class TestHackathonParticipantListAPIView:
         assert "john" in usernames
         assert all("jo" in username for username in usernames)
 
+    def test_search_tolerates_typos(
+        self, api_client, list_url, hackathon, participant_factory, admin_user
+    ):
+        api_client.force_authenticate(user=admin_user)
+        participant = participant_factory(
+            user__username="christopher", hackathon=hackathon
+        )
+        participant_factory(user__username="alice", hackathon=hackathon)
+
+        response = api_client.get(list_url, {"search": "cristopher"})
+        assert response.status_code == status.HTTP_200_OK
+        assert [p["id"] for p in response.data["results"]] == [str(participant.id)]
+
+    def test_search_orders_by_similarity(
+        self, api_client, list_url, hackathon, participant_factory, admin_user
+    ):
+        api_client.force_authenticate(user=admin_user)
+        partial = participant_factory(user__username="johnathan", hackathon=hackathon)
+        exact = participant_factory(user__username="john", hackathon=hackathon)
+
+        response = api_client.get(list_url, {"search": "john"})
+        assert [p["id"] for p in response.data["results"]] == [
+            str(exact.id),
+            str(partial.id),
+        ]
+
     def test_pagination_works(
         self, api_client, list_url, hackathon, participant_factory, admin_user
     ):
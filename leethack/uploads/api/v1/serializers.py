@@ -0,0 +1,255 @@
+import datetime
+
+from PIL import Image, UnidentifiedImageError
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+
+from leethack.core.imagepool import ImageJobTimeout, run_in_image_pool
+from leethack.core.utils import build_image_validators
+from leethack.core.validators import (
+    IMAGE_INFO_ATTR,
+    INSPECT_TIMEOUT,
+    read_header_info,
+    read_image_info,
+)
+from leethack.uploads.backends import get_upload_backend
+from leethack.uploads.targets import UPLOAD_TARGETS
+
+SESSION_SALT = "leethack.uploads.session"
+COMPLETED_KEY = "uploads:completed:{}"
+
+
+def get_allowed_content_types(config):
+    Image.init()
+    return {Image.MIME[fmt.upper()]: fmt for fmt in config["allowed_formats"]}
+
+
+class StoredImage:
+    """File stand-in that lets image validators check an object in storage."""
+
+    def __init__(self, name, size, info):
+        self.name = name
+        self.size = size
+        setattr(self, IMAGE_INFO_ATTR, info)
+
+
+def inspect_stored_image(backend, name):
+    head = backend.read_head(name, settings.DIRECT_UPLOAD_HEADER_BYTES)
+    if head is None:
+        raise serializers.ValidationError(_("File has not been uploaded."))
+    data, size = head
+
+    try:
+        try:
+            info = run_in_image_pool(read_header_info, data, timeout=INSPECT_TIMEOUT)
+        except (UnidentifiedImageError, OSError):
+            if len(data) >= size:
+                raise
+            # деяким форматам (WebP) для розбору потрібен весь файл
+            data, size = backend.read_head(name, size)
+            info = run_in_image_pool(read_image_info, data, timeout=INSPECT_TIMEOUT)
+    except (
+        UnidentifiedImageError,
+        OSError,
+        Image.DecompressionBombError,
+        ImageJobTimeout,
+    ):
+        raise serializers.ValidationError(_("Invalid or corrupted image file."))
+    return StoredImage(name, size, info)
+
+
+class PresignedUploadSerializer(serializers.Serializer):
+    method = serializers.CharField(help_text="HTTP method of upload request.")
+    url = serializers.SerializerMethodField(help_text="URL to send the file to.")
+    fields = serializers.DictField(
+        child=serializers.CharField(),
+        help_text="Form fields to send before the file (POST uploads).",
+    )
+    headers = serializers.DictField(
+        child=serializers.CharField(),
+        help_text="Headers to send with the file (PUT uploads).",
+    )
+
+    def get_url(self, obj) -> str:
+        request = self.context.get("request")
+        if request is None:
+            return obj.url
+        return request.build_absolute_uri(obj.url)
+
+
+class UploadSessionCreateSerializer(serializers.Serializer):
+    """
+    Starts a direct upload of an image into storage.
+    Returns presigned request for the upload and token for completing it.
+    """
+
+    target = serializers.ChoiceField(
+        choices=list(UPLOAD_TARGETS),
+        write_only=True,
+        help_text="Image field the file is uploaded for.",
+    )
+    object_id = serializers.UUIDField(
+        required=False,
+        write_only=True,
+        help_text="Hackathon id for hackathon_image.",
+    )
+    content_type = serializers.CharField(
+        write_only=True, help_text="MIME type of the file."
+    )
+    token = serializers.CharField(
+        read_only=True, help_text="Token for completing the upload."
+    )
+    name = serializers.CharField(
+        read_only=True, help_text="Name the file is uploaded under."
+    )
+    upload = PresignedUploadSerializer(read_only=True)
+    expires_at = serializers.DateTimeField(
+        read_only=True, help_text="Time until which the upload can be completed."
+    )
+
+    def validate(self, attrs):
+        target = UPLOAD_TARGETS[attrs["target"]]
+        if target.requires_object and not attrs.get("object_id"):
+            raise serializers.ValidationError(
+                {"object_id": _("This field is required for this target.")}
+            )
+
+        content_types = get_allowed_content_types(target.config)
+        if attrs["content_type"] not in content_types:
+            raise serializers.ValidationError(
+                {
+                    "content_type": _(
+                        "Content type must be one of: {}".format(
+                            ", ".join(sorted(content_types))
+                        )
+                    )
+                }
+            )
+
+        user = self.context["request"].user
+        attrs["instance"] = target.get_object(user, attrs.get("object_id"))
+        return attrs
+
+    def create(self, validated_data):
+        target = UPLOAD_TARGETS[validated_data["target"]]
+        instance = validated_data["instance"]
+        content_type = validated_data["content_type"]
+        extension = get_allowed_content_types(target.config)[content_type]
+        name = target.generate_name(instance, extension)
+
+        expires_in = settings.DIRECT_UPLOAD_EXPIRES
+        upload = get_upload_backend().create_upload(
+            name,
+            content_type,
+            int(target.config["max_size_mb"] * 1024 * 1024),
+            expires_in,
+        )
+        token = signing.dumps(
+            {
+                "user": str(self.context["request"].user.pk),
+                "target": validated_data["target"],
+                "object_id": str(instance.pk),
+                "name": name,
+                "content_type": content_type,
+            },
+            salt=SESSION_SALT,
+        )
+        return {
+            "token": token,
+            "name": name,
+            "upload": upload,
+            "expires_at": timezone.now() + datetime.timedelta(seconds=expires_in),
+        }
+
+
+class UploadSessionCompleteSerializer(serializers.Serializer):
+    """
+    Validates the uploaded object and attaches it to the target image field.
+
+    The presigned request can write to the uploaded name until it expires,
+    so the object is first copied to a new name and that copy is checked
+    and attached. Each token completes once. An object that fails
+    validation is deleted from storage.
+    """
+
+    token = serializers.CharField(
+        write_only=True, help_text="Token returned when the upload was started."
+    )
+    name = serializers.CharField(read_only=True, help_text="Name of stored file.")
+    url = serializers.SerializerMethodField(help_text="URL of stored file.")
+
+    def validate_token(self, value):
+        try:
+            session = signing.loads(
+                value, salt=SESSION_SALT, max_age=settings.DIRECT_UPLOAD_EXPIRES
+            )
+        except signing.SignatureExpired:
+            raise serializers.ValidationError(_("Upload session has expired."))
+        except signing.BadSignature:
+            raise serializers.ValidationError(_("Invalid upload session."))
+
+        if session["user"] != str(self.context["request"].user.pk):
+            raise serializers.ValidationError(_("Invalid upload session."))
+        return session
+
+    def validate(self, attrs):
+        session = attrs["token"]
+        target = UPLOAD_TARGETS[session["target"]]
+        user = self.context["request"].user
+        instance = target.get_object(user, session["object_id"])
+        attrs["instance"] = instance
+
+        backend = get_upload_backend()
+        declared_format = get_allowed_content_types(target.config)[
+            session["content_type"]
+        ]
+        # токен діє, поки діє presigned запит, тож і запис про нього
+        completed_key = COMPLETED_KEY.format(session["name"])
+        if not cache.add(completed_key, "", timeout=settings.DIRECT_UPLOAD_EXPIRES):
+            raise serializers.ValidationError(
+                {"token": _("Upload session has already been completed.")}
+            )
+        name = backend.promote(
+            session["name"], target.generate_name(instance, declared_format)
+        )
+        if name is None:
+            # файл ще можна завантажити і завершити сесію пізніше
+            cache.delete(completed_key)
+            raise serializers.ValidationError(
+                {"file": _("File has not been uploaded.")}
+            )
+        cache.set(completed_key, name, timeout=settings.DIRECT_UPLOAD_EXPIRES)
+
+        try:
+            image = inspect_stored_image(backend, name)
+            # розширення імені обране за заявленим типом, тож він має збігатись
+            if getattr(image, IMAGE_INFO_ATTR).format.lower() != declared_format:
+                raise serializers.ValidationError(
+                    _("Image format does not match the declared content type.")
+                )
+            for validator in build_image_validators(target.config):
+                validator(image)
+        except serializers.ValidationError as exc:
+            # невалідний файл нікому не належить, тож одразу прибираємо його
+            backend.delete(name)
+            raise serializers.ValidationError({"file": exc.detail})
+        attrs["name"] = name
+        return attrs
+
+    def create(self, validated_data):
+        session = validated_data["token"]
+        target = UPLOAD_TARGETS[session["target"]]
+        target.attach(validated_data["instance"], validated_data["name"])
+        return {"name": validated_data["name"]}
+
+    def get_url(self, obj) -> str:
+        url = default_storage.url(obj["name"])
+        request = self.context.get("request")
+        if request is None:
+            return url
+        return request.build_absolute_uri(url)
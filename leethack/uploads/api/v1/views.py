@@ -0,0 +1,96 @@
+import tempfile
+
+from django.conf import settings
+from django.core import signing
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.utils.translation import gettext_lazy as _
+from drf_spectacular.utils import extend_schema
+from rest_framework import generics, permissions, status
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from leethack.core.uploadhandler import UploadTooLarge
+from leethack.uploads.backends import LOCAL_UPLOAD_SALT, check_local_upload_storage
+from .serializers import UploadSessionCompleteSerializer, UploadSessionCreateSerializer
+
+CHUNK_SIZE = 64 * 1024
+
+
+class UploadSessionCreateAPIView(generics.CreateAPIView):
+    """
+    POST: Start a direct upload of hackathon image or profile picture/background.
+    The file is sent straight to storage with the returned presigned request,
+    then attached with the complete endpoint.
+    Only authenticated user can perform this action.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = UploadSessionCreateSerializer
+
+
+class UploadSessionCompleteAPIView(generics.GenericAPIView):
+    """
+    POST: Validate the uploaded file and attach it to the image field.
+    Only the user who started the upload can perform this action.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = UploadSessionCompleteSerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+@extend_schema(exclude=True)
+class LocalUploadAPIView(APIView):
+    """
+    PUT: Store request body under the name signed into the URL.
+    Plays the role of the bucket for LocalDirectUploadBackend and is only
+    routed when that backend is configured.
+    """
+
+    # доступ дає підпис в URL, як у presigned URL сховища
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+
+    def put(self, request, token):
+        try:
+            upload = signing.loads(
+                token, salt=LOCAL_UPLOAD_SALT, max_age=settings.DIRECT_UPLOAD_EXPIRES
+            )
+        except signing.BadSignature:
+            raise NotFound()
+        check_local_upload_storage(default_storage)
+
+        if request.content_type != upload["content_type"]:
+            raise ValidationError(
+                {"content_type": _("Content-Type does not match the upload.")}
+            )
+        max_bytes = upload["max_bytes"]
+        content_length = int(request.META.get("CONTENT_LENGTH") or 0)
+        if not content_length:
+            raise ValidationError({"file": _("Empty upload.")})
+        if content_length > max_bytes:
+            raise UploadTooLarge()
+
+        with tempfile.SpooledTemporaryFile(
+            max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE
+        ) as buffer:
+            size = 0
+            while chunk := request.stream.read(CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge()
+                buffer.write(chunk)
+
+            # як і PUT у бакет, повторне завантаження перезаписує об'єкт
+            name = upload["name"]
+            default_storage.delete(name)
+            buffer.seek(0)
+            default_storage.save(name, File(buffer, name))
+        return Response(status=status.HTTP_204_NO_CONTENT)
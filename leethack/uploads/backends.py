@@ -0,0 +1,167 @@
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.storage import default_storage
+from django.urls import reverse
+from django.utils.module_loading import import_string
+
+from leethack.core.storage import (
+    IMMUTABLE_CACHE_CONTROL,
+    ContentAddressedStorageMixin,
+)
+
+LOCAL_UPLOAD_SALT = "leethack.uploads.local"
+
+
+@dataclass(frozen=True)
+class PresignedUpload:
+    """Request the client sends to put a file into storage directly."""
+
+    method: str
+    url: str
+    # поля форми для POST або заголовки для PUT
+    fields: dict = field(default_factory=dict)
+    headers: dict = field(default_factory=dict)
+
+
+class S3DirectUploadBackend:
+    """
+    Direct uploads to the S3-compatible bucket behind `default_storage`.
+
+    Uses presigned POST rather than PUT: its policy pins the key and content
+    type and limits the size with `content-length-range`, which a presigned
+    PUT URL can't enforce. The POST stays valid until it expires, so the
+    checked file is attached from a copy under a key it can't write to
+    (`promote`).
+    """
+
+    def __init__(self, storage=None):
+        self.storage = storage or default_storage
+
+    def get_key(self, name):
+        from storages.utils import clean_name
+
+        # ключ з урахуванням location сховища ("media/")
+        return self.storage._normalize_name(clean_name(name))
+
+    def create_upload(self, name, content_type, max_bytes, expires_in):
+        post = self.storage.connection.meta.client.generate_presigned_post(
+            Bucket=self.storage.bucket_name,
+            Key=self.get_key(name),
+            Fields={
+                "Content-Type": content_type,
+                "Cache-Control": IMMUTABLE_CACHE_CONTROL,
+            },
+            Conditions=[
+                {"Content-Type": content_type},
+                {"Cache-Control": IMMUTABLE_CACHE_CONTROL},
+                ["content-length-range", 1, max_bytes],
+            ],
+            ExpiresIn=expires_in,
+        )
+        return PresignedUpload("POST", post["url"], fields=post["fields"])
+
+    def read_head(self, name, length):
+        from botocore.exceptions import ClientError
+
+        try:
+            response = self.storage.bucket.Object(self.get_key(name)).get(
+                Range=f"bytes=0-{length - 1}"
+            )
+        except ClientError as err:
+            if err.response["Error"]["Code"] in ("NoSuchKey", "404"):
+                return None
+            raise
+        # "bytes 0-65535/1234567"
+        size = int(response["ContentRange"].rsplit("/", 1)[1])
+        return response["Body"].read(), size
+
+    def promote(self, name, final_name):
+        """
+        Copy uploaded `name` to `final_name` and delete it; None if missing.
+        """
+        from botocore.exceptions import ClientError
+
+        # копія зберігає Content-Type і Cache-Control, задані при завантаженні
+        try:
+            self.storage.bucket.Object(self.get_key(final_name)).copy_from(
+                CopySource={
+                    "Bucket": self.storage.bucket_name,
+                    "Key": self.get_key(name),
+                }
+            )
+        except ClientError as err:
+            if err.response["Error"]["Code"] in ("NoSuchKey", "404"):
+                return None
+            raise
+        self.storage.delete(name)
+        return final_name
+
+    def delete(self, name):
+        self.storage.delete(name)
+
+
+class LocalDirectUploadBackend:
+    """
+    Stand-in for the bucket when media is stored locally (tests, development).
+
+    The presigned URL points to `LocalUploadAPIView`, which accepts the PUT
+    and saves the body into `default_storage`. The view is routed only while
+    this backend is configured, and the storage must keep the given names
+    (`MEDIA_CONTENT_ADDRESSED` off).
+    """
+
+    def __init__(self, storage=None):
+        self.storage = storage or default_storage
+
+    def create_upload(self, name, content_type, max_bytes, expires_in):
+        check_local_upload_storage(self.storage)
+        token = signing.dumps(
+            {"name": name, "content_type": content_type, "max_bytes": max_bytes},
+            salt=LOCAL_UPLOAD_SALT,
+        )
+        url = reverse("api:v1:local_upload", kwargs={"token": token})
+        return PresignedUpload("PUT", url, headers={"Content-Type": content_type})
+
+    def read_head(self, name, length):
+        if not self.storage.exists(name):
+            return None
+        with self.storage.open(name, "rb") as file:
+            return file.read(length), self.storage.size(name)
+
+    def promote(self, name, final_name):
+        if not self.storage.exists(name):
+            return None
+        with self.storage.open(name, "rb") as file:
+            final_name = self.storage.save(final_name, file)
+        self.storage.delete(name)
+        return final_name
+
+    def delete(self, name):
+        self.storage.delete(name)
+
+
+def check_local_upload_storage(storage):
+    """
+    Raise ImproperlyConfigured if `storage` would save a local upload under
+    another name than the signed one.
+    """
+    if settings.MEDIA_CONTENT_ADDRESSED and isinstance(
+        storage, ContentAddressedStorageMixin
+    ):
+        raise ImproperlyConfigured(
+            "LocalDirectUploadBackend needs a storage that keeps names "
+            "(MEDIA_CONTENT_ADDRESSED off)."
+        )
+
+
+def get_upload_backend():
+    return import_string(settings.DIRECT_UPLOAD_BACKEND)()
+
+
+def uses_local_upload_backend():
+    return issubclass(
+        import_string(settings.DIRECT_UPLOAD_BACKEND), LocalDirectUploadBackend
+    )
@@ -0,0 +1,80 @@
+from django.apps import apps
+from django.conf import settings
+from rest_framework.exceptions import NotFound, PermissionDenied
+
+
+class UploadTarget:
+    """
+    Image field that can be filled by a direct upload.
+
+    Object names come from the field's `upload_to`, so directly uploaded
+    files land under the same prefixes as multipart uploads.
+    """
+
+    model_label = None
+    field_name = None
+    config_name = None
+    # чи потрібен id об'єкта, до якого прикріплюється файл
+    requires_object = False
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    @property
+    def config(self):
+        return getattr(settings, self.config_name)
+
+    def generate_name(self, instance, extension):
+        field = self.model._meta.get_field(self.field_name)
+        return field.generate_filename(instance, f"upload.{extension}")
+
+    def get_object(self, user, object_id):
+        raise NotImplementedError
+
+    def attach(self, instance, name):
+        setattr(instance, self.field_name, name)
+        update_fields = [self.field_name]
+        if hasattr(instance, "updated_at"):
+            update_fields.append("updated_at")
+        instance.save(update_fields=update_fields)
+
+
+class ProfileImageTarget(UploadTarget):
+    model_label = "users.User"
+
+    def get_object(self, user, object_id):
+        return user
+
+
+class ProfilePictureTarget(ProfileImageTarget):
+    field_name = "profile_picture"
+    config_name = "PROFILE_PICTURE_CONFIG"
+
+
+class ProfileBackgroundTarget(ProfileImageTarget):
+    field_name = "profile_background"
+    config_name = "PROFILE_BACKGROUND_CONFIG"
+
+
+class HackathonImageTarget(UploadTarget):
+    model_label = "hackathons.Hackathon"
+    field_name = "image"
+    config_name = "HACKATHON_IMAGE_CONFIG"
+    requires_object = True
+
+    def get_object(self, user, object_id):
+        hackathon = self.model.objects.filter(pk=object_id).first()
+        if hackathon is None:
+            raise NotFound()
+        # ті самі права, що й на PATCH хакатону
+        if not (user.is_staff or hackathon.host_id == user.pk):
+            raise PermissionDenied()
+        return hackathon
+
+
+UPLOAD_TARGETS = {
+    "hackathon_image": HackathonImageTarget(),
+    "profile_picture": ProfilePictureTarget(),
+    "profile_background": ProfileBackgroundTarget(),
+}
@@ -0,0 +1,234 @@
+from importlib import reload
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.storage import default_storage
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from leethack.core.tests.utils import create_test_image
+
+
+@pytest.fixture
+def session_url():
+    return reverse("api:v1:upload_session_create")
+
+
+@pytest.fixture
+def complete_url():
+    return reverse("api:v1:upload_session_complete")
+
+
+def start_upload(api_client, session_url, **data):
+    data.setdefault("target", "profile_picture")
+    data.setdefault("content_type", "image/png")
+    return api_client.post(session_url, data, format="json")
+
+
+def put_file(api_client, upload, content):
+    return api_client.generic(
+        upload["method"],
+        upload["url"],
+        content,
+        content_type=upload["headers"]["Content-Type"],
+    )
+
+
+def create_png(size=(200, 200)):
+    return create_test_image(size=size, fmt="PNG").read()
+
+
+@pytest.mark.django_db
+class TestUploadSession:
+
+    def test_anonymous_user(self, api_client, session_url):
+        response = start_upload(api_client, session_url)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_profile_picture_upload(self, api_client, session_url, complete_url, user):
+        api_client.force_authenticate(user=user)
+        response = start_upload(api_client, session_url)
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["name"].startswith("profile_pictures/")
+        assert response.data["name"].endswith(".png")
+
+        upload_name = response.data["name"]
+        upload = response.data["upload"]
+        assert put_file(api_client, upload, create_png()).status_code == 204
+
+        response = api_client.post(
+            complete_url, {"token": response.data["token"]}, format="json"
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        user.refresh_from_db()
+        assert user.profile_picture.name == response.data["name"]
+        # прикріплюється копія, в яку presigned запит не може записати
+        assert response.data["name"].startswith("profile_pictures/")
+        assert response.data["name"] != upload_name
+        assert not default_storage.exists(upload_name)
+
+    def test_hackathon_image_upload(
+        self, api_client, session_url, complete_url, hackathon
+    ):
+        api_client.force_authenticate(user=hackathon.host)
+        response = start_upload(
+            api_client,
+            session_url,
+            target="hackathon_image",
+            object_id=str(hackathon.pk),
+        )
+        assert response.data["name"].startswith("hackathons/")
+        put_file(api_client, response.data["upload"], create_png())
+
+        response = api_client.post(
+            complete_url, {"token": response.data["token"]}, format="json"
+        )
+        assert response.status_code == status.HTTP_200_OK
+        hackathon.refresh_from_db()
+        assert hackathon.image.name == response.data["name"]
+
+    def test_hackathon_image_requires_object_id(self, api_client, session_url, host):
+        api_client.force_authenticate(user=host)
+        response = start_upload(api_client, session_url, target="hackathon_image")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "object_id" in response.data
+
+    def test_not_host_cannot_upload_hackathon_image(
+        self, api_client, session_url, hackathon, host
+    ):
+        api_client.force_authenticate(user=host)
+        response = start_upload(
+            api_client,
+            session_url,
+            target="hackathon_image",
+            object_id=str(hackathon.pk),
+        )
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_content_type_not_allowed(self, api_client, session_url, user):
+        api_client.force_authenticate(user=user)
+        response = start_upload(api_client, session_url, content_type="image/gif")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "content_type" in response.data
+
+
+@pytest.mark.django_db
+class TestUploadSessionComplete:
+
+    @pytest.fixture
+    def session(self, api_client, session_url, user):
+        api_client.force_authenticate(user=user)
+        return start_upload(api_client, session_url).data
+
+    def complete(self, api_client, complete_url, session):
+        return api_client.post(complete_url, {"token": session["token"]}, format="json")
+
+    def test_not_uploaded(self, api_client, complete_url, session):
+        response = self.complete(api_client, complete_url, session)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "file" in response.data
+
+    def test_invalid_image_is_deleted(self, api_client, complete_url, session, user):
+        put_file(api_client, session["upload"], create_png(size=(400, 200)))
+
+        response = self.complete(api_client, complete_url, session)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not default_storage.exists(session["name"])
+        user.refresh_from_db()
+        assert user.profile_picture.name != session["name"]
+
+    def test_replayed_upload_does_not_replace_attached_file(
+        self, api_client, complete_url, session, user
+    ):
+        content = create_png()
+        put_file(api_client, session["upload"], content)
+        name = self.complete(api_client, complete_url, session).data["name"]
+
+        # presigned запит ще дійсний, але пише лише в ім'я завантаження
+        put_file(api_client, session["upload"], b"not checked")
+        response = self.complete(api_client, complete_url, session)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "token" in response.data
+        user.refresh_from_db()
+        assert user.profile_picture.name == name
+        with default_storage.open(name, "rb") as file:
+            assert file.read() == content
+
+    def test_can_complete_after_early_attempt(self, api_client, complete_url, session):
+        assert self.complete(api_client, complete_url, session).status_code == 400
+        put_file(api_client, session["upload"], create_png())
+
+        response = self.complete(api_client, complete_url, session)
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_format_must_match_content_type(self, api_client, complete_url, session):
+        content = create_test_image(size=(200, 200), fmt="JPEG").read()
+        put_file(api_client, session["upload"], content)
+
+        response = self.complete(api_client, complete_url, session)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_other_user_token(self, api_client, complete_url, session, user_factory):
+        put_file(api_client, session["upload"], create_png())
+        api_client.force_authenticate(user=user_factory())
+
+        response = self.complete(api_client, complete_url, session)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "token" in response.data
+
+    def test_expired_session(self, api_client, complete_url, session, settings):
+        put_file(api_client, session["upload"], create_png())
+        settings.DIRECT_UPLOAD_EXPIRES = -1
+
+        response = self.complete(api_client, complete_url, session)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestLocalUpload:
+
+    @pytest.fixture
+    def upload(self, api_client, session_url, user):
+        api_client.force_authenticate(user=user)
+        return start_upload(api_client, session_url).data["upload"]
+
+    def test_too_large(self, api_client, upload):
+        # ліміт фото профілю 2MB зашитий у підписаний URL
+        content = b"0" * (2 * 1024 * 1024 + 1)
+        response = put_file(api_client, upload, content)
+        assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+
+    def test_content_type_mismatch(self, api_client, upload):
+        upload["headers"]["Content-Type"] = "image/jpeg"
+        response = put_file(api_client, upload, create_png())
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_invalid_signature(self, api_client, upload):
+        upload["url"] = upload["url"].replace("/local/", "/local/x")
+        response = put_file(api_client, upload, create_png())
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_renaming_storage_is_rejected(self, api_client, upload, settings):
+        settings.MEDIA_CONTENT_ADDRESSED = True
+        with pytest.raises(ImproperlyConfigured):
+            put_file(api_client, upload, create_png())
+        # конфігурація перевіряється до запису в сховище
+        assert not default_storage.exists("profile_pictures")
+
+
+def test_local_upload_is_not_routed_with_s3():
+    from leethack.api.urls import v1
+
+    try:
+        with override_settings(
+            DIRECT_UPLOAD_BACKEND="leethack.uploads.backends.S3DirectUploadBackend"
+        ):
+            names = {pattern.name for pattern in reload(v1).upload_urlpatterns}
+    finally:
+        reload(v1)
+
+    assert "upload_session_create" in names
+    assert "local_upload" not in names
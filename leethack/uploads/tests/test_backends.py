@@ -0,0 +1,91 @@
+from io import BytesIO
+from unittest import mock
+
+import numpy as np
+import pytest
+from PIL import Image
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from storages.backends.s3 import S3Storage
+
+from leethack.core.validators import ImageInfo
+from leethack.uploads.api.v1.serializers import inspect_stored_image
+from leethack.uploads.backends import LocalDirectUploadBackend, S3DirectUploadBackend
+
+
+class TestS3DirectUploadBackend:
+
+    def test_presigned_post_is_scoped_to_key(self):
+        storage = S3Storage(
+            access_key="key",
+            secret_key="secret",
+            bucket_name="bucket",
+            endpoint_url="https://storage.example.com",
+            location="media",
+            signature_version="s3v4",
+        )
+        backend = S3DirectUploadBackend(storage)
+
+        upload = backend.create_upload(
+            "hackathons/abc.png", "image/png", 1024, expires_in=60
+        )
+
+        assert upload.method == "POST"
+        assert upload.fields["key"] == "media/hackathons/abc.png"
+        assert upload.fields["Content-Type"] == "image/png"
+        assert "policy" in upload.fields
+
+    def test_promote_copies_to_final_key(self):
+        storage = S3Storage(
+            access_key="key",
+            secret_key="secret",
+            bucket_name="bucket",
+            location="media",
+        )
+        backend = S3DirectUploadBackend(storage)
+        with (
+            mock.patch.object(type(storage), "bucket") as bucket,
+            mock.patch.object(storage, "delete") as delete,
+        ):
+            name = backend.promote("hackathons/upload.png", "hackathons/final.png")
+
+        assert name == "hackathons/final.png"
+        bucket.Object.assert_called_once_with("media/hackathons/final.png")
+        bucket.Object.return_value.copy_from.assert_called_once_with(
+            CopySource={"Bucket": "bucket", "Key": "media/hackathons/upload.png"}
+        )
+        delete.assert_called_once_with("hackathons/upload.png")
+
+
+class TestInspectStoredImage:
+
+    def test_reads_only_header(self, settings):
+        settings.DIRECT_UPLOAD_HEADER_BYTES = 1024
+        buffer = BytesIO()
+        pixels = np.random.default_rng(0).integers(0, 255, (300, 400, 3), np.uint8)
+        Image.fromarray(pixels).save(buffer, "PNG")
+        name = default_storage.save(
+            "hackathons/test.png", ContentFile(buffer.getvalue())
+        )
+
+        image = inspect_stored_image(LocalDirectUploadBackend(), name)
+        assert image.size == len(buffer.getvalue())
+        assert image._image_info == ImageInfo("PNG", 400, 300)
+
+    def test_falls_back_to_whole_file(self, settings):
+        # WebP не розбирається з обрізаного початку файлу
+        settings.DIRECT_UPLOAD_HEADER_BYTES = 64
+        buffer = BytesIO()
+        Image.new("RGB", (300, 300), "red").save(buffer, "WEBP")
+        name = default_storage.save(
+            "hackathons/test.webp", ContentFile(buffer.getvalue())
+        )
+
+        image = inspect_stored_image(LocalDirectUploadBackend(), name)
+        assert image._image_info == ImageInfo("WEBP", 300, 300)
+
+    def test_missing_object(self):
+        from rest_framework.exceptions import ValidationError
+
+        with pytest.raises(ValidationError):
+            inspect_stored_image(LocalDirectUploadBackend(), "hackathons/missing.png")
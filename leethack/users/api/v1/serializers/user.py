@@ -4,6 +4,12 @@ from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
 
+from leethack.core.api.fields import (
+    ImageMetadataField,
+    ImageUploadField,
+    ImageVariantsField,
+)
+from leethack.core.api.uploads import ConcurrentFileUploadMixin
 from leethack.core.utils import build_image_validators
 
 User = get_user_model()
@@ -18,6 +24,13 @@ class UserNestedSerializer(serializers.Serializer):
     profile_picture = serializers.ImageField(
         help_text="URL of profile picture stored in Cloudflare R2."
     )
+    profile_picture_variants = ImageVariantsField(
+        "profile_picture", help_text="URLs of resized profile picture variants."
+    )
+    profile_picture_metadata = ImageMetadataField(
+        "profile_picture",
+        help_text="Dimensions, colour and placeholder of profile picture.",
+    )
 
 
 class MeRetrieveSerializer(serializers.Serializer):
@@ -34,20 +47,27 @@ class MeRetrieveSerializer(serializers.Serializer):
     profile_background = serializers.ImageField(
         help_text="URL of profile background stored in Cloudflare R2."
     )
+    profile_picture_variants = ImageVariantsField(
+        "profile_picture", help_text="URLs of resized profile picture variants."
+    )
+    profile_background_variants = ImageVariantsField(
+        "profile_background",
+        help_text="URLs of resized profile background variants.",
+    )
 
 
-class MeUpdateSerializer(serializers.ModelSerializer):
+class MeUpdateSerializer(ConcurrentFileUploadMixin, serializers.ModelSerializer):
     """
     Serializer for updating authenticated user.
     Validates profile picture, profile background and password
     """
 
-    profile_picture = serializers.ImageField(
+    profile_picture = ImageUploadField(
         validators=build_image_validators(settings.PROFILE_PICTURE_CONFIG),
         required=False,
         help_text="New profile picture.",
     )
-    profile_background = serializers.ImageField(
+    profile_background = ImageUploadField(
         validators=build_image_validators(settings.PROFILE_BACKGROUND_CONFIG),
         required=False,
         help_text="New profile background.",
@@ -1,5 +1,8 @@
 from rest_framework import generics, permissions
 
+from leethack.core.api.compiler import CompiledListMixin
+from leethack.core.api.planner import PlannedQuerySetMixin
+from leethack.core.api.sideload import SideloadListMixin
 from leethack.hackathons.api.v1.serializers import HackathonListSerializer
 from leethack.hackathons.api.v1.views.mixins import HackathonFilterMixin
 from leethack.hackathons.models import Hackathon
@@ -10,15 +13,16 @@ from .pagination import (
 )
 
 
-class HackathonSelectRelatedQuerySetMixin:
-    def get_queryset(self):
-        return Hackathon.objects.select_related(
-            "category", "host", "winner", "winner__user"
-        )
+class HackathonSelectRelatedQuerySetMixin(PlannedQuerySetMixin):
+    queryset = Hackathon.objects.all()
 
 
 class MyParticipatedHackathonListAPIView(
-    HackathonSelectRelatedQuerySetMixin, HackathonFilterMixin, generics.ListAPIView
+    SideloadListMixin,
+    CompiledListMixin,
+    HackathonSelectRelatedQuerySetMixin,
+    HackathonFilterMixin,
+    generics.ListAPIView,
 ):
     """
     GET: Return paginated list of hackathons the authenticated user is participating in.
@@ -34,7 +38,11 @@ class MyParticipatedHackathonListAPIView(
 
 
 class MyHostedHackathonListAPIView(
-    HackathonSelectRelatedQuerySetMixin, HackathonFilterMixin, generics.ListAPIView
+    SideloadListMixin,
+    CompiledListMixin,
+    HackathonSelectRelatedQuerySetMixin,
+    HackathonFilterMixin,
+    generics.ListAPIView,
 ):
     """
     GET: Return paginated list of hackathons the authenticated user is hosting.
@@ -50,7 +58,11 @@ class MyHostedHackathonListAPIView(
 
 
 class UserHostedHackathonListAPIView(
-    HackathonSelectRelatedQuerySetMixin, HackathonFilterMixin, generics.ListAPIView
+    SideloadListMixin,
+    CompiledListMixin,
+    HackathonSelectRelatedQuerySetMixin,
+    HackathonFilterMixin,
+    generics.ListAPIView,
 ):
     """
     GET: Return paginated list of hackathons the specific user is hosting.
@@ -1,19 +1,21 @@
 from rest_framework.pagination import PageNumberPagination
 
+from leethack.core.api.pagination import KeysetPageNumberPagination
 
-class MyParticipatedHackathonPagination(PageNumberPagination):
+
+class MyParticipatedHackathonPagination(KeysetPageNumberPagination):
     page_size = 30
     page_size_query_param = "page_size"
     max_page_size = 200
 
 
-class MyHostedHackathonPagination(PageNumberPagination):
+class MyHostedHackathonPagination(KeysetPageNumberPagination):
     page_size = 30
     page_size_query_param = "page_size"
     max_page_size = 200
 
 
-class UserHostedHackathonPagination(PageNumberPagination):
+class UserHostedHackathonPagination(KeysetPageNumberPagination):
     page_size = 30
     page_size_query_param = "page_size"
     max_page_size = 200
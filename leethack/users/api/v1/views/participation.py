@@ -1,6 +1,11 @@
 from rest_framework import generics, permissions
 from rest_framework.exceptions import PermissionDenied
 
+from leethack.core.api.compiler import CompiledListMixin
+from leethack.core.api.conditional import ConditionalRequestMixin
+from leethack.core.api.planner import PlannedQuerySetMixin
+from leethack.core.api.sideload import SideloadListMixin
+from leethack.core.api.sqljson import SQLJSONListMixin
 from leethack.participations.api.v1.views.mixins import (
     ParticipantFilterMixin,
     ParticipationRequestFilterMixin,
@@ -15,23 +20,23 @@ from leethack.users.api.v1.serializers import (
 from .pagination import MyParticipationRequestPagination, MyParticipationPagination
 
 
-class MyParticipationRequestQuerySetMixin:
+class MyParticipationRequestQuerySetMixin(PlannedQuerySetMixin):
+    queryset = ParticipationRequest.objects.all()
 
     def get_queryset(self):
-        qs = ParticipationRequest.objects.filter(user=self.request.user)
-        qs = qs.select_related("hackathon", "hackathon__category")
-        return qs
+        return super().get_queryset().filter(user=self.request.user)
 
 
-class MyParticipationQuerySetMixin:
+class MyParticipationQuerySetMixin(PlannedQuerySetMixin):
+    queryset = Participant.objects.all()
 
     def get_queryset(self):
-        qs = Participant.objects.filter(user=self.request.user)
-        qs = qs.select_related("hackathon", "hackathon__category")
-        return qs
+        return super().get_queryset().filter(user=self.request.user)
 
 
 class MyParticipationRequestListAPIView(
+    SideloadListMixin,
+    CompiledListMixin,
     MyParticipationRequestQuerySetMixin,
     ParticipationRequestFilterMixin,
     generics.ListAPIView,
@@ -48,7 +53,9 @@ class MyParticipationRequestListAPIView(
 
 
 class MyParticipationRequestDetailAPIView(
-    MyParticipationRequestQuerySetMixin, generics.RetrieveDestroyAPIView
+    ConditionalRequestMixin,
+    MyParticipationRequestQuerySetMixin,
+    generics.RetrieveDestroyAPIView,
 ):
     """
     GET: Return detailed information about specific participation request of authenticated user.
@@ -58,6 +65,7 @@ class MyParticipationRequestDetailAPIView(
 
     serializer_class = MyParticipationRequestRetrieveSerializer
     permission_classes = [permissions.IsAuthenticated]
+    etag_related = ("hackathon", "hackathon__category")
 
     def perform_destroy(self, instance):
         if not instance.is_pending:
@@ -66,7 +74,12 @@ class MyParticipationRequestDetailAPIView(
 
 
 class MyParticipationListAPIView(
-    MyParticipationQuerySetMixin, ParticipantFilterMixin, generics.ListAPIView
+    SideloadListMixin,
+    SQLJSONListMixin,
+    CompiledListMixin,
+    MyParticipationQuerySetMixin,
+    ParticipantFilterMixin,
+    generics.ListAPIView,
 ):
     """
     GET: Return paginated list of hackathons the authenticated user is participating in.
@@ -80,7 +93,9 @@ class MyParticipationListAPIView(
 
 
 class MyParticipationDetailAPIView(
-    MyParticipationQuerySetMixin, generics.RetrieveDestroyAPIView
+    ConditionalRequestMixin,
+    MyParticipationQuerySetMixin,
+    generics.RetrieveDestroyAPIView,
 ):
     """
     GET: Return detailed information about participant of authenticated user in hackathons.
@@ -90,3 +105,4 @@ class MyParticipationDetailAPIView(
 
     serializer_class = MyParticipationRetrieveSerializer
     permission_classes = [permissions.IsAuthenticated]
+    etag_related = ("hackathon", "hackathon__category")
@@ -1,14 +1,23 @@
+from django.conf import settings
 from rest_framework import generics, permissions
 
 from django.contrib.auth import get_user_model
 
+from leethack.core.api.conditional import ConditionalRequestMixin
+from leethack.core.api.sparse import SparseFieldsetMixin
+from leethack.core.api.uploads import UploadLimitMixin
 from leethack.users.api.v1.serializers import MeRetrieveSerializer
 from leethack.users.api.v1.serializers.user import MeUpdateSerializer
 
 User = get_user_model()
 
 
-class MeDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
+class MeDetailAPIView(
+    ConditionalRequestMixin,
+    SparseFieldsetMixin,
+    UploadLimitMixin,
+    generics.RetrieveUpdateDestroyAPIView,
+):
     """
     GET: Retrieve the authenticated user's profile.
     PATCH: Update the authenticated user's profile.
@@ -17,6 +26,10 @@ class MeDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
     """
 
     permission_classes = [permissions.IsAuthenticated]
+    upload_limits = {
+        "profile_picture": settings.PROFILE_PICTURE_CONFIG,
+        "profile_background": settings.PROFILE_BACKGROUND_CONFIG,
+    }
 
     def get_object(self):
         return self.request.user
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-18 08:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0006_user_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="profile_background_variants",
+            field=models.JSONField(default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="profile_picture_variants",
+            field=models.JSONField(default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-18 09:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0008_user_image_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="profile_background_metadata",
+            field=models.JSONField(default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="profile_picture_metadata",
+            field=models.JSONField(default=dict, editable=False),
+        ),
+    ]
@@ -3,7 +3,9 @@ import os
 from django.conf import settings
 from django.contrib.auth.base_user import BaseUserManager
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils.translation import gettext_lazy as _
 
 from leethack.core.models import UUIDModel
@@ -77,13 +79,33 @@ class User(UUIDModel, AbstractUser):
         blank=True,
         default=settings.DEFAULT_PROFILE_BACKGROUND,
     )
+    # зменшені копії (leethack.core.images), генеруються у фоні після збереження
+    profile_picture_variants = models.JSONField(default=dict, editable=False)
+    profile_background_variants = models.JSONField(default=dict, editable=False)
+    # розміри, формат, колір і placeholder (leethack.core.images.read_image_metadata)
+    profile_picture_metadata = models.JSONField(default=dict, editable=False)
+    profile_background_metadata = models.JSONField(default=dict, editable=False)
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
 
     objects = UserManager()
 
-    # TODO: add resize of profile_picture and profile_background, convert to JPEG
+    class Meta:
+        # UPPER(...) збігається з тим, як django будує icontains, тому ці
+        # індекси обслуговують і пошук підрядка, і триграмну схожість
+        indexes = [
+            GinIndex(
+                OpClass(Upper(field), name="gin_trgm_ops"),
+                name=f"user_{field}_trgm",
+            )
+            for field in ("username", "email", "first_name", "last_name")
+        ] + [
+            # перевірка, чи на файл ще посилаються
+            # (leethack.core.orphans)
+            models.Index(fields=(field,), name=f"user_{field}_idx")
+            for field in ("profile_picture", "profile_background")
+        ]
 
     def save(self, *args, **kwargs):
         if not self.username:
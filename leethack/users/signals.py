@@ -1,15 +1,78 @@
 from django.conf import settings
-from django.db.models.signals import post_delete
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
 from django.contrib.auth import get_user_model
 
+from leethack.core.api.planner import get_queryset_plan
+from leethack.core.cache import bump_listing_version
+from leethack.core.images import delete_image_on_commit, schedule_variants
+from leethack.users.api.v1.serializers import UserNestedSerializer
+
 User = get_user_model()
 
 
 @receiver(post_delete, sender=User)
 def delete_user_files(sender, instance, **kwargs):
-    if instance.profile_picture.name != settings.DEFAULT_PROFILE_PICTURE:
-        instance.profile_picture.delete(save=False)
-    if instance.profile_background.name != settings.DEFAULT_PROFILE_BACKGROUND:
-        instance.profile_background.delete(save=False)
+    delete_image_on_commit(instance.profile_picture, instance.profile_picture_variants)
+    delete_image_on_commit(
+        instance.profile_background, instance.profile_background_variants
+    )
+
+
+@receiver(post_save, sender=User)
+def generate_profile_image_variants(sender, instance, **kwargs):
+    schedule_variants(instance, "profile_picture", settings.PROFILE_PICTURE_CONFIG)
+    schedule_variants(
+        instance, "profile_background", settings.PROFILE_BACKGROUND_CONFIG
+    )
+
+
+def get_listed_fields():
+    """
+    User columns UserNestedSerializer renders in listings, or None if it
+    reads more than model fields.
+    """
+    plan = get_queryset_plan(UserNestedSerializer, User)
+    if not plan.restricted:
+        return None
+    return plan.fields - {User._meta.pk.name}
+
+
+def has_listed_changes(instance, update_fields):
+    fields = get_listed_fields()
+    if fields is None:
+        return True
+    if update_fields is not None:
+        fields &= set(update_fields)
+    if not fields:
+        return False
+
+    saved = User._default_manager.filter(pk=instance.pk).values(*fields).first()
+    if saved is None:
+        return True
+    return any(
+        User._meta.get_field(name).get_prep_value(getattr(instance, name))
+        != saved[name]
+        for name in fields
+    )
+
+
+@receiver(pre_save, sender=User)
+def check_listed_changes(sender, instance, update_fields=None, raw=False, **kwargs):
+    # новий користувач ще не показується в жодному списку; вхід, зміна
+    # пароля чи ролі теж не змінюють того, що рендерить UserNestedSerializer
+    instance._listed_changes = raw or (
+        not instance._state.adding and has_listed_changes(instance, update_fields)
+    )
+
+
+@receiver(post_save, sender=User)
+def invalidate_hackathon_listings(sender, instance, **kwargs):
+    if instance.__dict__.pop("_listed_changes", True):
+        bump_listing_version()
+
+
+@receiver(post_delete, sender=User)
+def invalidate_listings_on_delete(sender, instance, **kwargs):
+    bump_listing_version()
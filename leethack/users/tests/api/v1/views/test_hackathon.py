@@ -592,3 +592,19 @@ class TestUserHostedHackathonListAPIView:
         assert len(response.data["results"]) == 2
         assert "count" in response.data
         assert response.data["count"] == 5
+
+    def test_keyset_pagination_works(
+        self, api_client, user_hosted_hackathon_list, host, hackathon_factory
+    ):
+        hackathons = hackathon_factory.create_batch(5, host=host)
+        hackathon_factory.create_batch(2)
+
+        params = {"pagination": "cursor", "page_size": 2}
+        response = api_client.get(user_hosted_hackathon_list, params)
+        ids = [h["id"] for h in response.data["results"]]
+        while response.data["next"]:
+            response = api_client.get(response.data["next"])
+            ids += [h["id"] for h in response.data["results"]]
+
+        assert "count" not in response.data
+        assert sorted(ids) == sorted(str(h.id) for h in hackathons)
@@ -1,8 +1,12 @@
+from datetime import timedelta
+
 import pytest
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 
 from leethack.conftest import participation_request
+from leethack.hackathons.models import Hackathon
 from leethack.participations.models import ParticipationRequest
 
 
@@ -202,7 +206,7 @@ class TestMyParticipationListAPIView:
         api_client.force_authenticate(user=user)
         response = api_client.get(my_participation_list_url)
         assert response.status_code == status.HTTP_200_OK
-        assert response.data["count"] == 2
+        assert response.json()["count"] == 2
 
     class TestPermissions:
 
@@ -279,3 +283,33 @@ class TestMyParticipationDetailAPIView:
             api_client.force_authenticate(user=participant.user)
             response = getattr(api_client, method)(my_participation_detail_url)
             assert response.status_code == expected_status_code
+
+    class TestConditionalRequests:
+
+        def test_if_modified_since_returns_304(
+            self, api_client, my_participation_detail_url, participant
+        ):
+            api_client.force_authenticate(user=participant.user)
+            last_modified = api_client.get(my_participation_detail_url)["Last-Modified"]
+
+            response = api_client.get(
+                my_participation_detail_url, HTTP_IF_MODIFIED_SINCE=last_modified
+            )
+            assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        def test_hackathon_change_invalidates_validators(
+            self, api_client, my_participation_detail_url, participant
+        ):
+            api_client.force_authenticate(user=participant.user)
+            response = api_client.get(my_participation_detail_url)
+
+            Hackathon.objects.filter(pk=participant.hackathon_id).update(
+                updated_at=timezone.now() + timedelta(seconds=5)
+            )
+
+            response = api_client.get(
+                my_participation_detail_url,
+                HTTP_IF_NONE_MATCH=response["ETag"],
+                HTTP_IF_MODIFIED_SINCE=response["Last-Modified"],
+            )
+            assert response.status_code == status.HTTP_200_OK
@@ -1,4 +1,5 @@
 import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.urls import reverse
 from rest_framework import status
 
@@ -49,3 +50,41 @@ class TestMeDetailAPIView:
             api_client.force_authenticate(user=user)
             response = getattr(api_client, method)(me_detail_url)
             assert response.status_code == expected_status_code
+
+    class TestConditionalRequests:
+
+        def test_if_none_match_returns_304(self, api_client, me_detail_url, user):
+            api_client.force_authenticate(user=user)
+            response = api_client.get(me_detail_url)
+            assert "Last-Modified" not in response
+
+            response = api_client.get(
+                me_detail_url, HTTP_IF_NONE_MATCH=response["ETag"]
+            )
+            assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        def test_profile_change_changes_etag(self, api_client, me_detail_url, user):
+            api_client.force_authenticate(user=user)
+            etag = api_client.get(me_detail_url)["ETag"]
+
+            response = api_client.patch(
+                me_detail_url, data={"first_name": "Changed"}, HTTP_IF_MATCH=etag
+            )
+            assert response.status_code == status.HTTP_200_OK
+
+            response = api_client.patch(
+                me_detail_url, data={"first_name": "Again"}, HTTP_IF_MATCH=etag
+            )
+            assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+
+    def test_too_large_profile_picture_returns_413(
+        self, api_client, me_detail_url, user
+    ):
+        api_client.force_authenticate(user=user)
+        picture = SimpleUploadedFile(
+            "large.jpg", b"0" * (3 * 1024 * 1024), content_type="image/jpeg"
+        )
+
+        response = api_client.patch(me_detail_url, data={"profile_picture": picture})
+        assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        assert "profile_picture" in response.data